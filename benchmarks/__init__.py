@@ -0,0 +1 @@
+"""Benchmarks for the flake8-mock-spec checker."""
@@ -0,0 +1,7 @@
+"""Run the benchmarks, see benchmarks.run."""
+
+import sys
+
+from benchmarks.run import main
+
+sys.exit(main())
@@ -0,0 +1,193 @@
+"""Generators for the synthetic modules the benchmarks are run against."""
+
+from __future__ import annotations
+
+import random
+from typing import Callable, Iterator, NamedTuple
+
+MOCK_CONSTRUCTORS = ("Mock", "MagicMock", "NonCallableMock", "AsyncMock")
+PATCH_FUNCTIONS = ("patch", "patch.object", "patch.multiple")
+MAX_NESTING_DEPTH = 90
+
+
+class Corpus(NamedTuple):
+    """A named collection of generated modules.
+
+    Attrs:
+        name: The name of the corpus.
+        sources: The source code of each of the modules in the corpus.
+    """
+
+    name: str
+    sources: tuple[str, ...]
+
+
+def mock_heavy_module(rng: random.Random, tests: int) -> str:
+    """Generate a pytest module that constructs many mocks.
+
+    Args:
+        rng: The source of randomness.
+        tests: The number of test functions to generate.
+
+    Returns:
+        The source code of the module.
+    """
+    lines = [
+        '"""Generated tests."""',
+        "",
+        "from unittest import mock",
+        "from unittest.mock import MagicMock, patch",
+        "",
+        "import pytest",
+        "",
+        "",
+        "@pytest.fixture",
+        "def client():",
+        "    return mock.MagicMock(spec=object)",
+        "",
+    ]
+    for index in range(tests):
+        patch_function = rng.choice(PATCH_FUNCTIONS)
+        patch_arg = rng.choice(("", ", autospec=True"))
+        lines.append("")
+        lines.append(f'@mock.{patch_function}("pkg.module_{index}.Thing"{patch_arg})')
+        lines.append(f"def test_{index}(patched, client):")
+        for statement in range(rng.randint(2, 8)):
+            constructor = rng.choice(MOCK_CONSTRUCTORS)
+            spec_arg = rng.choice(("", "spec=object", "spec_set=object"))
+            lines.append(f"    value_{statement} = mock.{constructor}({spec_arg})")
+            lines.append(f"    value_{statement}.method.return_value = {statement}")
+            lines.append(f"    client.call(value_{statement}, key={statement!r})")
+        lines.append("    with patch.object(client, 'attr', new=1):")
+        lines.append("        assert client.attr == 1")
+        lines.append("    assert MagicMock(spec=list).append(1) is not None")
+    return "\n".join(lines) + "\n"
+
+
+def no_mocks_module(rng: random.Random, functions: int) -> str:
+    """Generate a production style module that does not use mocks.
+
+    Args:
+        rng: The source of randomness.
+        functions: The number of functions to generate.
+
+    Returns:
+        The source code of the module.
+    """
+    lines = ['"""Generated module."""', "", "import os", "import typing", ""]
+    for index in range(functions):
+        lines.append("")
+        lines.append(f"def function_{index}(value: int, *, items: typing.List[str]) -> int:")
+        lines.append(f'    """Function {index}."""')
+        lines.append("    total = 0")
+        for statement in range(rng.randint(2, 6)):
+            lines.append(f"    for item in items[{statement}:]:")
+            lines.append(f"        if len(item) > {statement} and os.path.exists(item):")
+            lines.append(f"            total += value * {statement} + int(str(len(item)))")
+        lines.append("    return max(total, sum(range(value)), key=abs)")
+    return "\n".join(lines) + "\n"
+
+
+def deeply_nested_module(depth: int) -> str:
+    """Generate a module with deeply nested calls and attribute chains.
+
+    Args:
+        depth: The nesting depth, capped so that the parser accepts the module.
+
+    Returns:
+        The source code of the module.
+    """
+    depth = min(depth, MAX_NESTING_DEPTH)
+    nested_calls = "call(" * depth + ")" * depth
+    nested_mocks = "Mock(" * depth + ")" * depth
+    attribute_chain = "mock." + ".".join(f"attr_{index}" for index in range(depth * 10)) + "()"
+    return "\n".join(
+        (
+            "from unittest.mock import Mock",
+            "from unittest import mock",
+            f"value_1 = {nested_calls}",
+            f"value_2 = {nested_mocks}",
+            f"value_3 = {attribute_chain}",
+        )
+    )
+
+
+def rule_module(rule: str, calls: int) -> str:
+    """Generate a module where every call triggers one rule.
+
+    Args:
+        rule: The constructor or patch function that is called without a spec.
+        calls: The number of calls to generate.
+
+    Returns:
+        The source code of the module.
+    """
+    lines = ["from unittest import mock", ""]
+    lines.extend(f"value_{index} = mock.{rule}()" for index in range(calls))
+    return "\n".join(lines) + "\n"
+
+
+def generate_small_files(scale: float = 1.0, seed: int = 0) -> Corpus:
+    """Generate the corpus of many small files the pools of workers are compared on.
+
+    Args:
+        scale: Multiplier on the number of files.
+        seed: Seed for the source of randomness.
+
+    Returns:
+        The corpus.
+    """
+    rng = random.Random(seed)
+    return Corpus(
+        name="small_files",
+        sources=tuple(
+            mock_heavy_module(rng, rng.randint(1, 3)) for _ in range(max(1, int(2000 * scale)))
+        ),
+    )
+
+
+def generate(scale: float = 1.0, seed: int = 0) -> Iterator[Corpus]:
+    """Generate all the corpora the benchmarks run against.
+
+    Args:
+        scale: Multiplier on the size of the corpora.
+        seed: Seed for the source of randomness.
+
+    Yields:
+        Each of the corpora.
+    """
+    rng = random.Random(seed)
+
+    def sized(value: int) -> int:
+        """Scale a size.
+
+        Args:
+            value: The size at a scale of 1.
+
+        Returns:
+            The scaled size, at least 1.
+        """
+        return max(1, int(value * scale))
+
+    factories: tuple[tuple[str, Callable[[], str], int], ...] = (
+        ("mock_heavy", lambda: mock_heavy_module(rng, sized(20)), sized(40)),
+        ("no_mocks", lambda: no_mocks_module(rng, sized(20)), sized(40)),
+        ("huge", lambda: mock_heavy_module(rng, sized(2000)), 1),
+        ("deeply_nested", lambda: deeply_nested_module(MAX_NESTING_DEPTH), sized(20)),
+    )
+    for name, factory, files in factories:
+        yield Corpus(name=name, sources=tuple(factory() for _ in range(files)))
+
+
+def generate_rules(scale: float = 1.0) -> Iterator[Corpus]:
+    """Generate a corpus per rule where every call triggers that rule.
+
+    Args:
+        scale: Multiplier on the size of the corpora.
+
+    Yields:
+        A corpus per rule named after the called function.
+    """
+    calls = max(1, int(200 * scale))
+    for rule in (*MOCK_CONSTRUCTORS, *PATCH_FUNCTIONS):
+        yield Corpus(name=rule, sources=(rule_module(rule, calls),) * 10)
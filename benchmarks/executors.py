@@ -0,0 +1,134 @@
+"""Compare checking many small files using a pool of processes against a pool of threads.
+
+Starting the worker processes and sending the results back is a large part of the cost when the
+files are small. Threads avoid both but only check files in parallel on free-threaded builds of
+Python.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Sequence
+
+from benchmarks import corpus
+from flake8_mock_spec.cli import FileResult, check_files
+
+EXECUTOR_SERIAL = "serial"
+EXECUTOR_PROCESSES = "processes"
+EXECUTOR_THREADS = "threads"
+EXECUTORS = (EXECUTOR_SERIAL, EXECUTOR_PROCESSES, EXECUTOR_THREADS)
+
+
+class Result(NamedTuple):
+    """The measurements for an executor.
+
+    Attrs:
+        executor: One of EXECUTORS.
+        jobs: The number of workers.
+        files: The number of files checked.
+        seconds: The best time to check all the files including starting the workers.
+        results: The problems found in each file.
+        files_per_second: The number of files checked per second.
+    """
+
+    executor: str
+    jobs: int
+    files: int
+    seconds: float
+    results: list[FileResult]
+
+    @property
+    def files_per_second(self) -> float:
+        """The number of files checked per second."""
+        return self.files / self.seconds
+
+
+def write_files(sources: Sequence[str], directory: Path) -> list[str]:
+    """Write the sources to files.
+
+    Args:
+        sources: The source code of each file.
+        directory: The directory to write the files to.
+
+    Returns:
+        The paths to the files.
+    """
+    paths = []
+    for index, source in enumerate(sources):
+        (path := directory / f"test_{index}.py").write_text(source, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def measure(executor: str, paths: Sequence[str], jobs: int, repeat: int) -> Result:
+    """Time checking the files using an executor, the cache is not used.
+
+    Args:
+        executor: One of EXECUTORS.
+        paths: The paths to the files to check.
+        jobs: The number of workers, ignored for EXECUTOR_SERIAL.
+        repeat: The number of times to repeat the timing.
+
+    Returns:
+        The measurements.
+    """
+    jobs = 1 if executor == EXECUTOR_SERIAL else jobs
+    best = float("inf")
+    results: list[FileResult] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = list(check_files(paths, jobs, threads=executor == EXECUTOR_THREADS))
+        best = min(best, time.perf_counter() - start)
+    return Result(executor=executor, jobs=jobs, files=len(paths), seconds=best, results=results)
+
+
+def gil_enabled() -> bool:
+    """Check whether the GIL is enabled.
+
+    Returns:
+        False only on free-threaded builds of Python running without the GIL.
+    """
+    # The function was added in Python 3.13, the GIL is always enabled before
+    is_gil_enabled: Callable[[], bool] = getattr(sys, "_is_gil_enabled", lambda: True)
+    return is_gil_enabled()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Compare the executors on the corpus of small files.
+
+    Args:
+        argv: The command line arguments.
+
+    Returns:
+        The exit code, non-zero if the executors found different problems.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.executors", description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of the file count")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per executor")
+    parser.add_argument("--jobs", type=int, default=4, help="number of workers of the pools")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(corpus.generate_small_files(scale=args.scale).sources, Path(directory))
+        results = [measure(executor, paths, args.jobs, args.repeat) for executor in EXECUTORS]
+
+    print(f"GIL enabled: {gil_enabled()}")
+    print(f"{'executor':<10} {'jobs':>4} {'files':>6} {'ms':>9} {'files/s':>10}")
+    for result in results:
+        print(
+            f"{result.executor:<10} {result.jobs:>4} {result.files:>6} "
+            f"{result.seconds * 1000:>9.1f} {result.files_per_second:>10.0f}"
+        )
+
+    mismatches = [result for result in results if result.results != results[0].results]
+    for mismatch in mismatches:
+        print(f"MISMATCH {mismatch.executor} found different problems", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
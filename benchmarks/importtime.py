@@ -0,0 +1,127 @@
+"""Measure the cost of importing the plugin using python -X importtime."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+PACKAGE = "flake8_mock_spec"
+BASELINE_KEY = f"import/{PACKAGE}"
+# Imported by unittest.mock, every flake8 worker process would pay for them on startup
+FORBIDDEN_MODULES = ("unittest.mock", "asyncio", "inspect")
+_ROOT = Path(__file__).parent.parent
+_PREFIX = "import time:"
+
+
+class ImportResult(NamedTuple):
+    """The cost of importing the package in a fresh interpreter.
+
+    Attrs:
+        seconds: The best cumulative time to import the package including its dependencies.
+        modules: The modules imported by the package that were not already imported on startup,
+            including the package itself.
+    """
+
+    seconds: float
+    modules: tuple[str, ...]
+
+
+def parse(output: str, package: str = PACKAGE) -> ImportResult:
+    """Parse the output of python -X importtime.
+
+    Each line contains the self and cumulative time in microseconds and the name of the module
+    indented by 2 spaces per level of nesting, the dependencies of a module are listed before it.
+
+    Args:
+        output: The standard error of the interpreter.
+        package: The name of the package to get the cost of.
+
+    Returns:
+        The cost of importing the package.
+
+    Raises:
+        ValueError: If the package was not imported.
+    """
+    entries: list[tuple[int, int, str]] = []
+    for line in output.splitlines():
+        if not line.startswith(_PREFIX) or line.rstrip().endswith("imported package"):
+            continue
+        _, cumulative_field, name_field = line[len(_PREFIX) :].split("|")
+        stripped = name_field.lstrip()
+        entries.append((len(name_field) - len(stripped), int(cumulative_field), stripped.strip()))
+
+    for position, (level, cumulative_us, name) in enumerate(entries):
+        if name != package:
+            continue
+        modules = [name]
+        for nested_level, _, nested_name in reversed(entries[:position]):
+            if nested_level <= level:
+                break
+            modules.append(nested_name)
+        return ImportResult(seconds=cumulative_us / 1_000_000, modules=tuple(reversed(modules)))
+    raise ValueError(f"{package} was not imported")
+
+
+def measure(repeat: int) -> ImportResult:
+    """Import the package in fresh interpreters.
+
+    Args:
+        repeat: The number of interpreters to start.
+
+    Returns:
+        The modules imported by the package and the fastest import time.
+    """
+    results = [
+        parse(
+            subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"],
+                cwd=_ROOT,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stderr
+        )
+        for _ in range(repeat)
+    ]
+    return min(results, key=lambda result: result.seconds)
+
+
+def _forbidden(modules: Iterable[str]) -> list[str]:
+    """Find the forbidden modules and their submodules.
+
+    Args:
+        modules: The imported modules.
+
+    Returns:
+        The imported modules that are forbidden.
+    """
+    return [
+        module
+        for module in modules
+        if any(module == name or module.startswith(f"{name}.") for name in FORBIDDEN_MODULES)
+    ]
+
+
+def compare(result: ImportResult, baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Compare the import cost against the baseline.
+
+    The time is not compared since it depends on the machine, the number of imported modules is
+    used instead.
+
+    Args:
+        result: The import cost.
+        baseline: The number of modules in the baseline.
+        tolerance: The fraction by which the number of modules may exceed the baseline.
+
+    Returns:
+        A description of each regression.
+    """
+    regressions = [f"{BASELINE_KEY}: imports {module}" for module in _forbidden(result.modules)]
+    if len(result.modules) > int(baseline["modules"] * (1 + tolerance)):
+        regressions.append(
+            f"{BASELINE_KEY}: imports {len(result.modules)} modules which exceeds baseline "
+            f"{int(baseline['modules'])}"
+        )
+    return regressions
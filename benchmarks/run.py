@@ -0,0 +1,282 @@
+"""Measure the cost of the checker and compare it against the stored baseline."""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Sequence
+
+from benchmarks import corpus, importtime
+from flake8_mock_spec import Plugin
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.15
+# Measurements of cheap corpora are noisy, growth below these is never a regression
+MEMORY_SLACK_BYTES = 64 * 1024
+# The relative cost of no_mocks is below 0.01 and varied by 60% over repeated runs of unchanged
+# code, which the tolerance alone can't absorb
+RELATIVE_COST_SLACK = 0.01
+
+
+class Result(NamedTuple):
+    """The measurements for a corpus.
+
+    Attrs:
+        name: The name of the corpus.
+        files: The number of files in the corpus.
+        nodes: The number of AST nodes in the corpus.
+        problems: The number of problems the checker reported.
+        seconds: The best time to check all the files in the corpus.
+        relative_cost: The check time divided by the time to walk the same trees with ast.walk,
+            which is used to compare against the baseline independent of the machine speed.
+        peak_memory: The peak memory allocated while checking the corpus in bytes.
+        files_per_second: The number of files checked per second.
+        nodes_per_second: The number of AST nodes checked per second.
+    """
+
+    name: str
+    files: int
+    nodes: int
+    problems: int
+    seconds: float
+    relative_cost: float
+    peak_memory: int
+
+    @property
+    def files_per_second(self) -> float:
+        """The number of files checked per second."""
+        return self.files / self.seconds
+
+    @property
+    def nodes_per_second(self) -> float:
+        """The number of AST nodes checked per second."""
+        return self.nodes / self.seconds
+
+
+class ParsedFile(NamedTuple):
+    """A file as flake8 passes it to the plugin.
+
+    Attrs:
+        tree: The AST of the file.
+        lines: The lines of the file.
+    """
+
+    tree: ast.AST
+    lines: list[str]
+
+
+def _check(files: Sequence[ParsedFile]) -> int:
+    """Run the checker over the files.
+
+    Args:
+        files: The files to check.
+
+    Returns:
+        The number of problems found.
+    """
+    return sum(sum(1 for _ in Plugin(file.tree, file.lines).run()) for file in files)
+
+
+def _walk(files: Sequence[ParsedFile]) -> int:
+    """Walk the trees of the files as the reference workload.
+
+    Args:
+        files: The files to walk.
+
+    Returns:
+        The number of nodes in the trees.
+    """
+    return sum(sum(1 for _ in ast.walk(file.tree)) for file in files)
+
+
+def _best_times(
+    functions: Sequence[Callable[[Sequence[ParsedFile]], int]],
+    files: Sequence[ParsedFile],
+    repeat: int,
+) -> list[float]:
+    """Time functions over the files and return the fastest run of each.
+
+    The functions are run interleaved so that drift in the speed of the machine affects each of
+    them equally.
+
+    Args:
+        functions: The functions to time.
+        files: The files to pass to the functions.
+        repeat: The number of times to run each function.
+
+    Returns:
+        The fastest time in seconds of each function.
+    """
+    best = [float("inf")] * len(functions)
+    for _ in range(repeat):
+        for index, function in enumerate(functions):
+            start = time.perf_counter()
+            function(files)
+            best[index] = min(best[index], time.perf_counter() - start)
+    return best
+
+
+def measure(corpus_: corpus.Corpus, repeat: int) -> Result:
+    """Measure the checker against a corpus.
+
+    Args:
+        corpus_: The corpus to measure.
+        repeat: The number of times to repeat the timing.
+
+    Returns:
+        The measurements.
+    """
+    files = tuple(
+        ParsedFile(tree=ast.parse(source), lines=source.splitlines(keepends=True))
+        for source in corpus_.sources
+    )
+
+    tracemalloc.start()
+    problems = _check(files)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    seconds, walk_seconds = _best_times((_check, _walk), files, repeat)
+    return Result(
+        name=corpus_.name,
+        files=len(files),
+        nodes=_walk(files),
+        problems=problems,
+        seconds=seconds,
+        relative_cost=seconds / walk_seconds,
+        peak_memory=peak_memory,
+    )
+
+
+def run(scale: float, repeat: int) -> list[Result]:
+    """Measure the checker against all the corpora.
+
+    Args:
+        scale: Multiplier on the size of the corpora.
+        repeat: The number of times to repeat the timing.
+
+    Returns:
+        The measurements for each corpus, per rule corpora are prefixed with rule/.
+    """
+    results = [measure(corpus_, repeat) for corpus_ in corpus.generate(scale=scale)]
+    results.extend(
+        measure(corpus.Corpus(name=f"rule/{rule.name}", sources=rule.sources), repeat)
+        for rule in corpus.generate_rules(scale=scale)
+    )
+    return results
+
+
+def compare(
+    results: Iterable[Result], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """Compare the results against the baseline.
+
+    Args:
+        results: The measurements.
+        baseline: The relative cost and peak memory by corpus name.
+        tolerance: The fraction by which a measurement may exceed the baseline.
+
+    Returns:
+        A description of each regression.
+    """
+    regressions = []
+    for result in results:
+        if (expected := baseline.get(result.name)) is None:
+            continue
+        cost_limit = expected["relative_cost"] * (1 + tolerance) + RELATIVE_COST_SLACK
+        if result.relative_cost > cost_limit:
+            regressions.append(
+                f"{result.name}: relative cost {result.relative_cost:.2f} exceeds baseline "
+                f"{expected['relative_cost']:.2f}"
+            )
+        memory_limit = expected["peak_memory"] * (1 + tolerance) + MEMORY_SLACK_BYTES
+        if result.peak_memory > memory_limit:
+            regressions.append(
+                f"{result.name}: peak memory {result.peak_memory} exceeds baseline "
+                f"{int(expected['peak_memory'])}"
+            )
+    return regressions
+
+
+def format_table(results: Iterable[Result]) -> str:
+    """Format the results for display.
+
+    Args:
+        results: The measurements.
+
+    Returns:
+        A table with a row per corpus.
+    """
+    rows = [
+        f"{'corpus':<22} {'files':>6} {'nodes':>9} {'problems':>8} {'files/s':>10} "
+        f"{'nodes/s':>12} {'relative':>8} {'peak KiB':>9}"
+    ]
+    rows.extend(
+        f"{result.name:<22} {result.files:>6} {result.nodes:>9} {result.problems:>8} "
+        f"{result.files_per_second:>10.0f} {result.nodes_per_second:>12.0f} "
+        f"{result.relative_cost:>8.2f} {result.peak_memory / 1024:>9.1f}"
+        for result in results
+    )
+    return "\n".join(rows)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    Args:
+        argv: The command line arguments.
+
+    Returns:
+        The exit code, non-zero if a regression against the baseline was found.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0, help="size multiplier of the corpora")
+    parser.add_argument("--repeat", type=int, default=7, help="timing repetitions per corpus")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="fraction by which a measurement may exceed the baseline",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store the results as the new baseline"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(scale=args.scale, repeat=args.repeat)
+    print(format_table(results))
+    import_result = importtime.measure(repeat=args.repeat)
+    print(
+        f"\nimport {importtime.PACKAGE}: {import_result.seconds * 1000:.1f} ms, "
+        f"{len(import_result.modules)} modules"
+    )
+
+    if args.save_baseline:
+        baseline: dict[str, dict[str, float]] = {
+            result.name: {
+                "relative_cost": round(result.relative_cost, 3),
+                "peak_memory": result.peak_memory,
+            }
+            for result in results
+        }
+        baseline[importtime.BASELINE_KEY] = {"modules": len(import_result.modules)}
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --save-baseline to create one")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.tolerance)
+    if (import_baseline := baseline.get(importtime.BASELINE_KEY)) is not None:
+        regressions.extend(importtime.compare(import_result, import_baseline, args.tolerance))
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,1411 @@
+"""A linter that checks mocks are constructed with the spec argument."""
+
+# The checks share the import index and the registry of the rules
+# pylint: disable=too-many-lines
+
+from __future__ import annotations
+
+import ast
+import itertools
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    import argparse
+
+    from flake8.options.manager import OptionManager
+
+    from .baseline import Baseline
+    from .stats import FileStats
+
+# The names are not read from unittest.mock since importing it (and asyncio and inspect along
+# with it) is a large part of the startup time of every flake8 worker process
+MOCK_CLASS = "Mock"
+MAGIC_MOCK_CLASS = "MagicMock"
+NON_CALLABLE_MOCK_CLASS = "NonCallableMock"
+ASYNC_MOCK_CLASS = "AsyncMock"
+SPEC_ARGS = frozenset(("spec", "spec_set"))
+
+ERROR_CODE_PREFIX = "TMS"
+MORE_INFO_BASE = "more information: https://github.com/jdkandersson/flake8-mock-spec"
+MOCK_SPEC_MSG_BASE = (
+    "%s unittest.mock.%s instances should be constructed with the "
+    f"{' or '.join(sorted(SPEC_ARGS))} argument, {MORE_INFO_BASE}#fix-%s"
+)
+MOCK_SPEC_CODE = f"{ERROR_CODE_PREFIX}010"
+MOCK_SPEC_MSG = MOCK_SPEC_MSG_BASE % (MOCK_SPEC_CODE, MOCK_CLASS, MOCK_SPEC_CODE.lower())
+MAGIC_MOCK_SPEC_CODE = f"{ERROR_CODE_PREFIX}011"
+MAGIC_MOCK_SPEC_MSG = MOCK_SPEC_MSG_BASE % (
+    MAGIC_MOCK_SPEC_CODE,
+    MAGIC_MOCK_CLASS,
+    MAGIC_MOCK_SPEC_CODE.lower(),
+)
+NON_CALLABLE_MOCK_SPEC_CODE = f"{ERROR_CODE_PREFIX}012"
+NON_CALLABLE_MOCK_SPEC_MSG = MOCK_SPEC_MSG_BASE % (
+    NON_CALLABLE_MOCK_SPEC_CODE,
+    NON_CALLABLE_MOCK_CLASS,
+    NON_CALLABLE_MOCK_SPEC_CODE.lower(),
+)
+ASYNC_MOCK_SPEC_CODE = f"{ERROR_CODE_PREFIX}013"
+ASYNC_MOCK_SPEC_MSG = MOCK_SPEC_MSG_BASE % (
+    ASYNC_MOCK_SPEC_CODE,
+    ASYNC_MOCK_CLASS,
+    ASYNC_MOCK_SPEC_CODE.lower(),
+)
+MOCK_MSG_LOOKUP = {
+    MOCK_CLASS: MOCK_SPEC_MSG,
+    MAGIC_MOCK_CLASS: MAGIC_MOCK_SPEC_MSG,
+    NON_CALLABLE_MOCK_CLASS: NON_CALLABLE_MOCK_SPEC_MSG,
+    ASYNC_MOCK_CLASS: ASYNC_MOCK_SPEC_MSG,
+}
+
+PATCH_FUNCTION = "patch"
+PATCH_MULTIPLE_ARGS = frozenset(("spec", "spec_set", "autospec", "new_callable"))
+PATCH_ARGS = frozenset(("new", *PATCH_MULTIPLE_ARGS))
+PATCH_MSG_BASE = (
+    "%s unittest.mock.%s should be called with any of the "
+    f"{', '.join(sorted(PATCH_ARGS))} arguments, {MORE_INFO_BASE}#fix-%s"
+)
+PATCH_CODE = f"{ERROR_CODE_PREFIX}020"
+PATCH_MSG = PATCH_MSG_BASE % (PATCH_CODE, PATCH_FUNCTION, PATCH_CODE.lower())
+PATCH_OBJECT_CODE = f"{ERROR_CODE_PREFIX}021"
+PATCH_OBJECT_FUNCTION = (PATCH_FUNCTION, "object")
+PATCH_OBJECT_MSG = PATCH_MSG_BASE % (
+    PATCH_OBJECT_CODE,
+    ".".join(PATCH_OBJECT_FUNCTION),
+    PATCH_OBJECT_CODE.lower(),
+)
+PATCH_MULTIPLE_FUNCTION = (PATCH_FUNCTION, "multiple")
+PATCH_MULTIPLE_CODE = f"{ERROR_CODE_PREFIX}022"
+PATCH_MULTIPLE_MSG = PATCH_MSG_BASE % (
+    PATCH_MULTIPLE_CODE,
+    ".".join(PATCH_MULTIPLE_FUNCTION),
+    PATCH_MULTIPLE_CODE.lower(),
+)
+PATCH_ARGS_LOOKUP: dict[str | tuple[str, ...], frozenset[str]] = {
+    PATCH_FUNCTION: PATCH_ARGS,
+    PATCH_OBJECT_FUNCTION: PATCH_ARGS,
+    PATCH_MULTIPLE_FUNCTION: PATCH_MULTIPLE_ARGS,
+}
+PATCH_MSG_LOOKUP: dict[str | tuple[str, ...], str] = {
+    PATCH_FUNCTION: PATCH_MSG,
+    PATCH_OBJECT_FUNCTION: PATCH_OBJECT_MSG,
+    PATCH_MULTIPLE_FUNCTION: PATCH_MULTIPLE_MSG,
+}
+
+FACTORY_CODE = f"{ERROR_CODE_PREFIX}030"
+FACTORY_MSG_BASE = (
+    f"{FACTORY_CODE} %s should be called with any of the %s arguments, "
+    f"{MORE_INFO_BASE}#fix-{FACTORY_CODE.lower()}"
+)
+TARGET_CODE = f"{ERROR_CODE_PREFIX}040"
+TARGET_MSG_BASE = (
+    f"{TARGET_CODE} %s does not exist in the project, check the spelling of the spec or patch "
+    f"target, {MORE_INFO_BASE}#fix-{TARGET_CODE.lower()}"
+)
+BUDGET_CODE = f"{ERROR_CODE_PREFIX}050"
+BUDGET_MSG_BASE = (
+    f"{BUDGET_CODE} the file was only partially checked, the check stopped here after %s, "
+    f"the problems after this point are not reported, {MORE_INFO_BASE}#fix-"
+    f"{BUDGET_CODE.lower()}"
+)
+# Separates the name of a registered factory from its arguments and the arguments from each other,
+# e.g., tests.fakes.make_fake_client:spec|spec_set, an argument that is a number is the index of a
+# positional argument, e.g., unittest.mock.create_autospec:spec|0
+FACTORY_ARGS_SEPARATOR = ":"
+FACTORY_ARG_SEPARATOR = "|"
+
+# Enables the statistics of the cost of checking each file when set to the path of the output file
+STATS_ENV_VAR = "FLAKE8_MOCK_SPEC_STATS"
+
+# The fixture of pytest-mock which provides the mock classes and patch as attributes
+MOCKER_FIXTURE = "mocker"
+_MOCKER_QUALIFIED_NAME = ("pytest_mock", "MockerFixture")
+# Modules and objects that provide the mock classes and patch
+MOCK_PROVIDERS = (("unittest", "mock"), ("mock", "mock"), _MOCKER_QUALIFIED_NAME, ("mock",))
+
+
+class Rule(NamedTuple):
+    """The arguments a call of a factory must include.
+
+    Attrs:
+        args: The names of the keyword arguments, any one of which must be passed.
+        msg: The message of the problem if none of the arguments are passed.
+        positions: The indexes of the positional arguments, any one of which must be passed as an
+            alternative to the keyword arguments.
+    """
+
+    args: frozenset[str]
+    msg: str
+    positions: frozenset[int] = frozenset()
+
+
+class Registry(NamedTuple):
+    """The factories that problems are reported for compiled into lookup tables.
+
+    Every lookup is a hash lookup so the cost of checking a call doesn't depend on the number of
+    registered factories.
+
+    Attrs:
+        rules: The rule of each factory by its fully qualified name, e.g.,
+            ("unittest", "mock", "patch", "object"), for every provider of the factory.
+        providers: The modules and objects that provide factories.
+        provider_parents: The providers and the names that are a parent of a provider.
+        leaf_names: The last element of the name of every factory.
+        needles: Names one of which appears in the source of every module with a problem, names
+            that contain another name (e.g., MagicMock contains Mock) are redundant.
+    """
+
+    rules: dict[tuple[str, ...], Rule]
+    providers: frozenset[tuple[str, ...]]
+    provider_parents: frozenset[tuple[str, ...]]
+    leaf_names: frozenset[str]
+    needles: frozenset[str]
+
+
+def _split_name(key: str | tuple[str, ...]) -> tuple[str, ...]:
+    """Convert a key of the message lookups to a name.
+
+    Args:
+        key: The key, e.g., patch or ("patch", "object").
+
+    Returns:
+        The elements of the name.
+    """
+    return (key,) if isinstance(key, str) else key
+
+
+def parse_factory(definition: str) -> tuple[tuple[str, ...], frozenset[str], frozenset[int]]:
+    """Parse the definition of a factory that problems should be reported for.
+
+    Args:
+        definition: The fully qualified name of the factory optionally followed by the arguments,
+            any one of which must be passed, e.g., tests.fakes.make_fake_client:spec|spec_set.
+            An argument that is a number is the index of a positional argument, e.g.,
+            unittest.mock.create_autospec:spec|0. The arguments default to spec and spec_set and
+            a name starting with mocker refers to the fixture of pytest-mock.
+
+    Returns:
+        The fully qualified name of the factory, the names of the keyword arguments and the
+        indexes of the positional arguments.
+
+    Raises:
+        ValueError: If the definition is not valid.
+    """
+    name, separator, args_definition = definition.strip().partition(FACTORY_ARGS_SEPARATOR)
+    qualified_name = tuple(name.split("."))
+    all_args = args_definition.split(FACTORY_ARG_SEPARATOR) if separator else SPEC_ARGS
+    args = frozenset(arg for arg in all_args if not arg.isdecimal())
+    positions = frozenset(int(arg) for arg in all_args if arg.isdecimal())
+    if len(qualified_name) < 2 or not all(
+        element.isidentifier() for element in (*qualified_name, *args)
+    ):
+        raise ValueError(
+            f"invalid mock factory {definition!r}, expected the fully qualified name of the "
+            "factory including its module optionally followed by the arguments, e.g., "
+            f"tests.fakes.make_fake_client{FACTORY_ARGS_SEPARATOR}spec{FACTORY_ARG_SEPARATOR}"
+            "spec_set, or the index of a positional argument"
+        )
+    if qualified_name[0] == MOCKER_FIXTURE:
+        qualified_name = (*_MOCKER_QUALIFIED_NAME, *qualified_name[1:])
+    return qualified_name, args, positions
+
+
+def compile_registry(factories: Iterable[str] = ()) -> Registry:
+    """Compile the built in and registered factories into lookup tables.
+
+    Args:
+        factories: The definitions of the additional factories as accepted by parse_factory.
+
+    Returns:
+        The registry of the factories.
+    """
+    rules: dict[tuple[str, ...], Rule] = {}
+    for provider in MOCK_PROVIDERS:
+        for class_name, msg in MOCK_MSG_LOOKUP.items():
+            rules[(*provider, class_name)] = Rule(SPEC_ARGS, msg)
+        for function_name, msg in PATCH_MSG_LOOKUP.items():
+            rules[(*provider, *_split_name(function_name))] = Rule(
+                PATCH_ARGS_LOOKUP[function_name], msg
+            )
+    # Every call that can have a problem includes the name of a mock class or the patch function in
+    # the source, directly or in the import of a local alias
+    needle_names = {*MOCK_MSG_LOOKUP, *(_split_name(key)[0] for key in PATCH_MSG_LOOKUP)}
+    providers = set(MOCK_PROVIDERS)
+
+    for definition in factories:
+        qualified_name, args, positions = parse_factory(definition)
+        arg_names = (*sorted(args), *(f"positional {position}" for position in sorted(positions)))
+        msg = FACTORY_MSG_BASE % (".".join(qualified_name), ", ".join(arg_names))
+        rules[qualified_name] = Rule(args, msg, positions)
+        providers.add(qualified_name[:-1])
+        # An aliased factory includes its name in the import
+        needle_names.add(qualified_name[-1])
+
+    return Registry(
+        rules=rules,
+        providers=frozenset(providers),
+        provider_parents=frozenset(
+            provider[:length] for provider in providers for length in range(1, len(provider) + 1)
+        ),
+        leaf_names=frozenset(qualified_name[-1] for qualified_name in rules),
+        needles=frozenset(
+            name
+            for name in needle_names
+            if not any(other != name and other in name for other in needle_names)
+        ),
+    )
+
+
+DEFAULT_REGISTRY = compile_registry()
+PREFILTER_NEEDLES = DEFAULT_REGISTRY.needles
+
+
+class ImportIndex(NamedTuple):
+    """The names in a module that refer to the providers of the mock classes and patch.
+
+    Attrs:
+        aliases: The fully qualified names of the local names bound by imports and the mocker
+            fixture.
+        star_provider: The provider whose names were all imported using a star import, if any.
+        leaf_names: The last element of the name of every call that can have a problem in the
+            module, including local aliases.
+        resolved: Cache of the rules by the name as it appears in the module, the same names tend
+            to be used many times in a module.
+        registry: The factories that problems are reported for.
+        has_providers: Whether any names in the module can refer to a provider.
+    """
+
+    aliases: dict[str, tuple[str, ...]]
+    star_provider: tuple[str, ...] | None
+    leaf_names: frozenset[str]
+    resolved: dict[tuple[str, ...], Rule | None]
+    registry: Registry = DEFAULT_REGISTRY
+
+    @property
+    def has_providers(self) -> bool:
+        """Whether any names in the module can refer to a provider."""
+        return self.star_provider is not None or bool(self.aliases)
+
+
+class Problem(NamedTuple):
+    """Represents a problem found in the code.
+
+    Attrs:
+        lineno: The line number on which the problem was found.
+        col_offset: The column on which the problem was found.
+        msg: The message describing the problem.
+    """
+
+    lineno: int
+    col_offset: int
+    msg: str
+
+
+# Fields that never contain nodes that can contain calls
+_NON_CALL_FIELDS = frozenset(
+    (
+        "arg",
+        "attr",
+        "conversion",
+        "ctx",
+        "id",
+        "is_async",
+        "kind",
+        "level",
+        "module",
+        "name",
+        "names",
+        "op",
+        "ops",
+        "type_comment",
+        "type_ignores",
+    )
+)
+# Nodes that can't contain calls, they are not traversed
+_LEAF_NODE_TYPES = frozenset(
+    (
+        ast.Break,
+        ast.Constant,
+        ast.Continue,
+        ast.Global,
+        ast.Import,
+        ast.ImportFrom,
+        ast.Name,
+        ast.Nonlocal,
+        ast.Pass,
+    )
+)
+# The only mutable state shared between checks, threads that race store the same fields
+_CALL_FIELDS_CACHE: dict[type[ast.AST], tuple[str, ...]] = {}
+
+
+def _get_call_fields(node_type: type[ast.AST]) -> tuple[str, ...]:
+    """Retrieve the fields of a node type that can contain calls in reverse order.
+
+    Args:
+        node_type: The type of the node.
+
+    Returns:
+        The names of the fields in reverse order so that they can be pushed onto a stack.
+    """
+    fields = _CALL_FIELDS_CACHE.get(node_type)
+    if fields is None:
+        fields = tuple(
+            field for field in reversed(node_type._fields) if field not in _NON_CALL_FIELDS
+        )
+        _CALL_FIELDS_CACHE[node_type] = fields
+    return fields
+
+
+def _iter_calls(
+    tree: ast.AST, stats: FileStats | None = None, meter: _Meter | None = None
+) -> Iterator[ast.Call]:
+    """Find all the calls in a tree without recursion.
+
+    The calls are yielded in the same order as ast.NodeVisitor would visit them.
+
+    Args:
+        tree: The tree to search.
+        stats: Records the number of nodes visited, if any.
+        meter: Stops the search once the budget is exceeded, if any.
+
+    Yields:
+        All the call nodes in the tree.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if meter is not None and not meter.spend(node):
+            return
+        if stats is not None:
+            stats.nodes += 1
+        if isinstance(node, ast.Call):
+            yield node
+        for field in _get_call_fields(type(node)):
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                stack.extend(
+                    item
+                    for item in reversed(value)
+                    if isinstance(item, ast.AST) and type(item) not in _LEAF_NODE_TYPES
+                )
+            elif isinstance(value, ast.AST) and type(value) not in _LEAF_NODE_TYPES:
+                stack.append(value)
+
+
+def _get_fully_qualified_name(node: ast.expr) -> tuple[str, ...]:
+    """Retrieve the fully qualified name of a call func node.
+
+    Args:
+        node: The node to get the name of.
+
+    Returns:
+        Tuple containing all the elements of the fully qualified name of the node.
+    """
+    names = []
+    while isinstance(node, ast.Attribute):
+        names.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return ()
+    names.append(node.id)
+    return tuple(reversed(names))
+
+
+def _is_provider_related(qualified_name: tuple[str, ...], registry: Registry) -> bool:
+    """Check whether a name is a provider, within a provider or a parent of a provider.
+
+    Args:
+        qualified_name: The fully qualified name.
+        registry: The factories that problems are reported for.
+
+    Returns:
+        Whether the name can be used to refer to the factories.
+    """
+    return qualified_name in registry.provider_parents or any(
+        qualified_name[:length] in registry.providers for length in range(1, len(qualified_name))
+    )
+
+
+# Statement fields that contain further statements
+# In the order they appear in the source
+_STATEMENT_FIELDS = ("cases", "body", "handlers", "orelse", "finalbody")
+# Simple statements other than imports are not traversed when building the import index
+_INDEXED_NODE_TYPES = frozenset(
+    getattr(ast, name)
+    for name in (
+        "AsyncFor",
+        "AsyncFunctionDef",
+        "AsyncWith",
+        "ClassDef",
+        "ExceptHandler",
+        "For",
+        "FunctionDef",
+        "If",
+        "Import",
+        "ImportFrom",
+        "Match",
+        "Try",
+        "TryStar",
+        "While",
+        "With",
+        "match_case",
+    )
+    # Match and TryStar were added in later Python versions
+    if hasattr(ast, name)
+)
+
+
+def _index_import(
+    aliases: dict[str, tuple[str, ...]], name: str, asname: str | None, registry: Registry
+) -> None:
+    """Record the name bound by an import statement if it can refer to a provider.
+
+    Args:
+        aliases: The fully qualified names of the local names to add to.
+        name: The imported module, e.g., unittest.mock.
+        asname: The name the module is imported as, if any.
+        registry: The factories that problems are reported for.
+    """
+    module = tuple(name.split("."))
+    # import a.b binds a, import a.b as c binds c to a.b
+    local, qualified_name = (module[0], module[:1]) if asname is None else (asname, module)
+    if _is_provider_related(module, registry):
+        aliases[local] = qualified_name
+
+
+def _index_import_from(
+    aliases: dict[str, tuple[str, ...]],
+    module_name: str,
+    name: str,
+    asname: str | None,
+    registry: Registry,
+) -> tuple[str, ...] | None:
+    """Record the name bound by an absolute from import statement if it can refer to a provider.
+
+    Args:
+        aliases: The fully qualified names of the local names to add to.
+        module_name: The module the name is imported from, e.g., unittest.
+        name: The imported name or * for a star import.
+        asname: The name it is imported as, if any.
+        registry: The factories that problems are reported for.
+
+    Returns:
+        The provider if all of its names were imported using a star import.
+    """
+    module = tuple(module_name.split("."))
+    if name == "*":
+        return module if module in registry.providers else None
+    qualified_name = (*module, name)
+    if _is_provider_related(qualified_name, registry):
+        aliases[asname or name] = qualified_name
+    return None
+
+
+def _make_import_index(
+    aliases: dict[str, tuple[str, ...]],
+    star_provider: tuple[str, ...] | None,
+    registry: Registry = DEFAULT_REGISTRY,
+) -> ImportIndex:
+    """Create the index of the names that refer to providers.
+
+    Args:
+        aliases: The fully qualified names of the local names bound by imports and the mocker
+            fixture.
+        star_provider: The provider whose names were all imported using a star import, if any.
+        registry: The factories that problems are reported for.
+
+    Returns:
+        The index.
+    """
+    return ImportIndex(
+        aliases=aliases,
+        star_provider=star_provider,
+        leaf_names=registry.leaf_names.union(aliases),
+        resolved={},
+        registry=registry,
+    )
+
+
+def build_import_index(tree: ast.AST, registry: Registry = DEFAULT_REGISTRY) -> ImportIndex:
+    """Find the names that refer to the providers of the mock classes and patch.
+
+    Only statements are traversed, expressions can't contain imports or fixture arguments. The
+    statements are indexed in source order so that a later import of a name replaces an earlier
+    one.
+
+    Args:
+        tree: The tree of the module.
+        registry: The factories that problems are reported for.
+
+    Returns:
+        The index of the names.
+    """
+    aliases: dict[str, tuple[str, ...]] = {}
+    star_provider: tuple[str, ...] | None = None
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                _index_import(aliases, alias.name, alias.asname, registry)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level or node.module is None:
+                continue
+            for alias in node.names:
+                star_provider = (
+                    _index_import_from(aliases, node.module, alias.name, alias.asname, registry)
+                    or star_provider
+                )
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            arguments = node.args
+            if any(
+                argument.arg == MOCKER_FIXTURE
+                for argument in (*arguments.posonlyargs, *arguments.args, *arguments.kwonlyargs)
+            ):
+                aliases[MOCKER_FIXTURE] = _MOCKER_QUALIFIED_NAME
+        # Reversed so that the statements are indexed in source order and later imports win
+        stack.extend(
+            reversed(
+                [
+                    child
+                    for field in _STATEMENT_FIELDS
+                    for child in getattr(node, field, ())
+                    if type(child) in _INDEXED_NODE_TYPES
+                ]
+            )
+        )
+
+    return _make_import_index(aliases, star_provider, registry)
+
+
+def _resolve_rule(fully_qualified_name: tuple[str, ...], index: ImportIndex) -> Rule | None:
+    """Resolve a name to the rule of the factory it refers to.
+
+    Args:
+        fully_qualified_name: The name as it appears in the module.
+        index: The names in the module that refer to providers.
+
+    Returns:
+        The rule of the factory or None if the name does not refer to a factory.
+    """
+    root, *rest = fully_qualified_name
+    if (aliased := index.aliases.get(root)) is not None:
+        resolved = (*aliased, *rest)
+    elif index.star_provider is not None:
+        resolved = (*index.star_provider, *fully_qualified_name)
+    else:
+        return None
+    return index.registry.rules.get(resolved)
+
+
+def _may_have_problems(lines: Sequence[str], needles: frozenset[str] = PREFILTER_NEEDLES) -> bool:
+    """Check whether the source could contain any problems without parsing it.
+
+    Args:
+        lines: The lines of the source code.
+        needles: Names one of which appears in the source of every module with a problem.
+
+    Returns:
+        Whether any of the names that problems are reported for appear in the source.
+    """
+    # The lines are searched one at a time rather than joined so that the file isn't copied, one
+    # needle at a time since a C level search of each line is cheaper than switching needles
+    return any(needle in line for needle in needles for line in lines)
+
+
+def _call_rule(node: ast.Call, index: ImportIndex) -> Rule | None:
+    """Find the rule of the factory that is called.
+
+    Args:
+        node: The call.
+        index: The names in the module that refer to providers of the mock classes and patch.
+
+    Returns:
+        The rule or None if the call is not a call of a factory.
+    """
+    # Reject calls without allocating based on the last element of the name
+    func = node.func
+    if isinstance(func, ast.Name):
+        leaf_name = func.id
+    elif isinstance(func, ast.Attribute):
+        leaf_name = func.attr
+    else:
+        return None
+    if leaf_name not in index.leaf_names:
+        return None
+
+    fully_qualified_name = _get_fully_qualified_name(node=func)
+    if not fully_qualified_name:
+        return None
+    return _resolve_cached(fully_qualified_name, index)
+
+
+def _check_call(node: ast.Call, index: ImportIndex) -> Problem | None:
+    """Check a call for a problem.
+
+    Args:
+        node: The call to check.
+        index: The names in the module that refer to providers of the mock classes and patch.
+
+    Returns:
+        The problem with the call, if any.
+    """
+    rule = _call_rule(node, index)
+    if rule is None:
+        return None
+    return _call_problem(node, rule)
+
+
+def _call_problem(node: ast.Call, rule: Rule) -> Problem | None:
+    """Check the arguments of a call of a factory.
+
+    Args:
+        node: The call.
+        rule: The rule of the factory that is called.
+
+    Returns:
+        The problem with the call, if any.
+    """
+    # A starred argument counts as one argument since it might pass the positional argument
+    if rule.positions and len(node.args) > min(rule.positions):
+        return None
+    # The names are checked lazily, calls can have thousands of keywords
+    msg = _problem_msg(rule, (keyword.arg for keyword in node.keywords))
+    if msg is None:
+        return None
+    return Problem(lineno=node.lineno, col_offset=node.col_offset, msg=msg)
+
+
+def _relative_rules(registry: Registry) -> dict[tuple[str, ...], Rule]:
+    """Find the rules of the factories by their names relative to their providers.
+
+    Args:
+        registry: The factories that problems are reported for.
+
+    Returns:
+        The rules by the name relative to the longest provider of the factory, e.g.,
+        ("patch", "object") for ("unittest", "mock", "patch", "object").
+    """
+    relative: dict[tuple[str, ...], Rule] = {}
+    for qualified_name, rule in registry.rules.items():
+        provider_length = max(
+            len(provider)
+            for provider in registry.providers
+            if qualified_name[: len(provider)] == provider
+        )
+        relative[qualified_name[provider_length:]] = rule
+    return relative
+
+
+def _check_unresolved_call(
+    node: ast.Call, relative_rules: dict[tuple[str, ...], Rule]
+) -> Problem | None:
+    """Check a call for a problem without the imports of the module.
+
+    The name of the call is matched on its last elements regardless of what it was imported from,
+    e.g., both mock.patch.object and other.patch.object match patch.object.
+
+    Args:
+        node: The call to check.
+        relative_rules: The rules by the name of the factory relative to its provider.
+
+    Returns:
+        The problem with the call, if any.
+    """
+    fully_qualified_name = _get_fully_qualified_name(node=node.func)
+    if not fully_qualified_name:
+        return None
+    rule = relative_rules.get(fully_qualified_name[-2:]) or relative_rules.get(
+        fully_qualified_name[-1:]
+    )
+    if rule is None:
+        return None
+    return _call_problem(node, rule)
+
+
+def _resolve_cached(fully_qualified_name: tuple[str, ...], index: ImportIndex) -> Rule | None:
+    """Resolve a name to the rule of the factory using the cache of the index.
+
+    Args:
+        fully_qualified_name: The name as it appears in the module.
+        index: The names in the module that refer to providers.
+
+    Returns:
+        The rule of the factory or None if the name does not refer to a factory.
+    """
+    try:
+        return index.resolved[fully_qualified_name]
+    except KeyError:
+        rule = index.resolved[fully_qualified_name] = _resolve_rule(fully_qualified_name, index)
+        return rule
+
+
+def _problem_msg(rule: Rule, keyword_names: Iterable[str | None]) -> str | None:
+    """Check the keyword arguments of a call of a factory.
+
+    Args:
+        rule: The rule of the factory.
+        keyword_names: The names of the keyword arguments, None for ** arguments, only consumed
+            until one of the arguments of the rule is found.
+
+    Returns:
+        The message of the problem with the call, if any.
+    """
+    return None if any(name in rule.args for name in keyword_names) else rule.msg
+
+
+class Budget(NamedTuple):
+    """The maximum work spent checking a single file.
+
+    Once either limit is exceeded the traversal stops and a single problem reports where, the
+    problems found until then are still reported.
+
+    Attrs:
+        max_nodes: The maximum number of nodes to visit, None doesn't limit the nodes.
+        max_seconds: The maximum wall time of the traversal, None doesn't limit the time.
+    """
+
+    max_nodes: int | None = None
+    max_seconds: float | None = None
+
+
+# The clock is only read every this many nodes since reading it costs more than visiting a node
+_CLOCK_INTERVAL = 1024
+
+
+class _Meter:
+    """Tracks the work spent on a traversal against a budget.
+
+    Attrs:
+        problem: The problem reporting that the budget was exceeded, None while it hasn't been.
+    """
+
+    # The meter is only advanced by the traversal
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("_nodes", "_max_nodes", "_max_seconds", "_deadline", "_lineno", "problem")
+
+    def __init__(self, budget: Budget) -> None:
+        """Construct and start the clock.
+
+        Args:
+            budget: The limits of the traversal.
+        """
+        self._nodes = 0
+        self._max_nodes = budget.max_nodes
+        self._max_seconds = budget.max_seconds
+        self._deadline = (
+            None if budget.max_seconds is None else time.perf_counter() + budget.max_seconds
+        )
+        self._lineno = 1
+        self.problem: Problem | None = None
+
+    def spend(self, node: ast.AST) -> bool:
+        """Account for visiting a node.
+
+        Args:
+            node: The node that is about to be visited.
+
+        Returns:
+            Whether the node is within the budget and should be visited.
+        """
+        self._nodes += 1
+        # Not all nodes have a position, the problem is reported on the last known line
+        self._lineno = getattr(node, "lineno", self._lineno)
+        if self._max_nodes is not None and self._nodes > self._max_nodes:
+            return self._stop(f"{self._max_nodes} nodes")
+        if (
+            self._deadline is not None
+            and not self._nodes % _CLOCK_INTERVAL
+            and time.perf_counter() > self._deadline
+        ):
+            return self._stop(f"{self._max_seconds} seconds")
+        return True
+
+    def _stop(self, limit: str) -> bool:
+        """Record that the budget was exceeded.
+
+        Args:
+            limit: The description of the limit that was exceeded.
+
+        Returns:
+            False so that the node isn't visited.
+        """
+        self.problem = Problem(self._lineno, 0, BUDGET_MSG_BASE % limit)
+        return False
+
+
+# Checks a node and returns the problems with it, if any
+Hook = Callable[[Any], Optional[Iterable[Problem]]]
+_VISIT_PREFIX = "visit_"
+
+
+class Check:
+    """Base class of the checks that share a single traversal of a tree, see traverse.
+
+    Like ast.NodeVisitor, a method called visit_ followed by the name of a node type, e.g.,
+    visit_Call, is called with each node of exactly that type. The method returns the problems
+    with the node, if any. Unlike ast.NodeVisitor, the children of the node are always visited by
+    the traversal and must not be visited by the method.
+    """
+
+    # The node types and names of the visit methods, collected once when the class is defined
+    _visit_methods: tuple[tuple[type[ast.AST], str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect the visit methods of a check.
+
+        Args:
+            kwargs: Passed on to the parent class.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._visit_methods = tuple(
+            (node_type, name)
+            for name in dir(cls)
+            if name.startswith(_VISIT_PREFIX)
+            and isinstance(node_type := getattr(ast, name[len(_VISIT_PREFIX) :], None), type)
+            and issubclass(node_type, ast.AST)
+        )
+
+    def start(self, tree: ast.AST) -> bool:  # pylint: disable=unused-argument
+        """Prepare to check a tree before any of its nodes are visited.
+
+        Args:
+            tree: The root of the tree that is about to be traversed.
+
+        Returns:
+            Whether the nodes of the tree should be passed to the check.
+        """
+        return True
+
+    def hooks(self) -> dict[type[ast.AST], Hook]:
+        """Retrieve the functions that check the nodes of each type.
+
+        Override to register functions other than the visit methods.
+
+        Returns:
+            The function that checks the nodes by node type.
+        """
+        return {node_type: getattr(self, name) for node_type, name in self._visit_methods}
+
+    def finish(self) -> Iterable[Problem]:
+        """Report any problems that are only known once all the nodes have been visited.
+
+        Returns:
+            The problems.
+        """
+        return ()
+
+
+class MockSpecCheck(Check):
+    """Checks that the calls of the mock factories are passed any of the arguments of their rule.
+
+    Attrs:
+        index: The names in the module that refer to providers of the mock classes and patch,
+            built when a traversal starts unless it was passed on construction.
+    """
+
+    index: ImportIndex
+
+    def __init__(
+        self, registry: Registry = DEFAULT_REGISTRY, index: ImportIndex | None = None
+    ) -> None:
+        """Construct.
+
+        Args:
+            registry: The factories that problems are reported for.
+            index: The index of the module when only parts of it are traversed, the index is
+                built from the traversed tree if it is None.
+        """
+        self._registry = registry
+        self._build_index = index is None
+        self.index = _make_import_index({}, None, registry) if index is None else index
+
+    def start(self, tree: ast.AST) -> bool:
+        """Build the import index of a module.
+
+        Args:
+            tree: The root of the tree that is about to be traversed.
+
+        Returns:
+            Whether the module imports any providers of the mock classes and patch.
+        """
+        if self._build_index:
+            self.index = build_import_index(tree, self._registry)
+        return self.index.has_providers
+
+    # The method must be called the same as the name of the node
+    def visit_Call(self, node: ast.Call) -> tuple[Problem, ...]:  # pylint: disable=invalid-name
+        """Check a call of a factory.
+
+        Args:
+            node: The call.
+
+        Returns:
+            The problem with the call, if any.
+        """
+        problem = _check_call(node, self.index)
+        return () if problem is None else (problem,)
+
+
+def _iter_nodes(
+    tree: ast.AST, stats: FileStats | None = None, meter: _Meter | None = None
+) -> Iterator[ast.AST]:
+    """Find all the nodes in a tree without recursion.
+
+    The nodes are yielded in the same order as ast.NodeVisitor would visit them.
+
+    Args:
+        tree: The tree to search.
+        stats: Records the number of nodes visited, if any.
+        meter: Stops the search once the budget is exceeded, if any.
+
+    Yields:
+        All the nodes in the tree.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if meter is not None and not meter.spend(node):
+            return
+        if stats is not None:
+            stats.nodes += 1
+        yield node
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+
+def _count_problems(problems: Iterable[Problem], stats: FileStats) -> Iterator[Problem]:
+    """Count problems as they are yielded.
+
+    Args:
+        problems: The problems.
+        stats: Records the number of problems.
+
+    Yields:
+        The problems.
+    """
+    for problem in problems:
+        stats.problems += 1
+        yield problem
+
+
+def traverse(
+    tree: ast.AST,
+    checks: Iterable[Check],
+    stats: FileStats | None = None,
+    budget: Budget | None = None,
+) -> Iterator[Problem]:
+    """Check a tree using several checks in a single traversal without recursion.
+
+    The nodes are visited in the same order as ast.NodeVisitor visits them. If the checks only
+    have hooks for calls, the nodes that can't contain calls are skipped.
+
+    Args:
+        tree: The root of the tree to check.
+        checks: The checks, the nodes are only passed to the checks whose start returns True.
+        stats: Records the number of nodes visited, calls examined and problems found, if any.
+        budget: The limits of the traversal, the whole tree is traversed if it is None.
+
+    Yields:
+        The problems in the order they are found, the problems with a node in the order of the
+        checks, followed by the problems reported when the checks finish. If the budget is
+        exceeded, the checks don't finish and a BUDGET_CODE problem is yielded last instead.
+    """
+    # Started before the checks since they may do work of their own when they start
+    meter = None if budget is None else _Meter(budget)
+    active = [check for check in checks if check.start(tree)]
+    table: dict[type[ast.AST], list[Hook]] = {}
+    for check in active:
+        for node_type, hook in check.hooks().items():
+            table.setdefault(node_type, []).append(hook)
+    problems = _iter_checks_problems(tree, active, table, stats, meter)
+    yield from problems if stats is None else _count_problems(problems, stats)
+
+
+def _iter_checks_problems(
+    tree: ast.AST,
+    active: Sequence[Check],
+    table: dict[type[ast.AST], list[Hook]],
+    stats: FileStats | None,
+    meter: _Meter | None,
+) -> Iterator[Problem]:
+    """Traverse a tree and finish the checks unless the budget is exceeded.
+
+    Args:
+        tree: The root of the tree to check.
+        active: The checks whose start returned True.
+        table: The hooks of the checks by node type.
+        stats: Records the number of nodes visited and calls examined, if any.
+        meter: Stops the traversal once the budget is exceeded, if any.
+
+    Yields:
+        The problems of the traversal followed by those of the checks finishing or of the budget.
+    """
+    yield from _iter_traversal_problems(tree, table, stats, meter)
+    if meter is not None and meter.problem is not None:
+        # The problems reported when finishing may depend on the nodes that weren't visited
+        yield meter.problem
+        return
+    for check in active:
+        yield from check.finish()
+
+
+def _iter_traversal_problems(
+    tree: ast.AST,
+    table: dict[type[ast.AST], list[Hook]],
+    stats: FileStats | None,
+    meter: _Meter | None = None,
+) -> Iterator[Problem]:
+    """Pass the nodes of a tree to the hooks registered for their type.
+
+    Args:
+        tree: The root of the tree to check.
+        table: The hooks by node type.
+        stats: Records the number of nodes visited and calls examined, if any.
+        meter: Stops the traversal once the budget is exceeded, if any.
+
+    Yields:
+        The problems returned by the hooks.
+    """
+    if not table:
+        return
+    if table.keys() == {ast.Call}:
+        # The common case skips looking up the hooks of each node
+        call_hooks = table[ast.Call]
+        for call in _iter_calls(tree, stats, meter):
+            if stats is not None:
+                stats.calls += 1
+            for hook in call_hooks:
+                problems = hook(call)
+                if problems:
+                    yield from problems
+        return
+    for node in _iter_nodes(tree, stats, meter):
+        node_type = type(node)
+        hooks = table.get(node_type)
+        if hooks is None:
+            continue
+        if stats is not None and node_type is ast.Call:
+            stats.calls += 1
+        for hook in hooks:
+            problems = hook(node)
+            if problems:
+                yield from problems
+
+
+def _iter_index_problems(
+    tree: ast.AST, index: ImportIndex, stats: FileStats | None = None
+) -> Iterator[Problem]:
+    """Check the calls in a tree as they are found.
+
+    Args:
+        tree: The root of the tree to check.
+        index: The names in the module that refer to providers of the mock classes and patch.
+        stats: Records the work done, if any.
+
+    Returns:
+        The problems in the order the calls are found.
+    """
+    return traverse(tree, (MockSpecCheck(index.registry, index),), stats)
+
+
+def iter_problems(
+    tree: ast.AST,
+    max_problems: int | None = None,
+    stats: FileStats | None = None,
+    registry: Registry = DEFAULT_REGISTRY,
+    budget: Budget | None = None,
+) -> Iterator[Problem]:
+    """Find the problems in a tree, yielding each one as soon as it is found.
+
+    The traversal stops once the maximum number of problems has been yielded or when the consumer
+    stops iterating.
+
+    Args:
+        tree: The root of the tree to check.
+        max_problems: The maximum number of problems to yield, all the problems are yielded if it
+            is None.
+        stats: Records the number of nodes visited, calls examined and problems found, if any.
+        registry: The factories that problems are reported for.
+        budget: The limits of the traversal, see traverse.
+
+    Yields:
+        The problems in the order the calls are found.
+    """
+    problems = traverse(tree, (MockSpecCheck(registry),), stats, budget)
+    if max_problems is None:
+        yield from problems
+    else:
+        yield from itertools.islice(problems, max_problems)
+
+
+class Visitor(ast.NodeVisitor):
+    """Visits AST nodes and checks use of mock objects and patch calls.
+
+    Compatibility wrapper around MockSpecCheck, the tree is not traversed recursively.
+
+    Attrs:
+        problems: A list of all the problems encountered while visiting the AST nodes.
+        index: The names in the module that refer to providers of the mock classes and patch, built
+            when a tree is visited. None if no tree was visited, the calls passed to visit_Call are
+            then matched on their names since the imports aren't known.
+    """
+
+    problems: list[Problem]
+    index: ImportIndex | None
+
+    def __init__(self, registry: Registry = DEFAULT_REGISTRY) -> None:
+        """Construct.
+
+        Args:
+            registry: The factories that problems are reported for.
+        """
+        self.problems = []
+        self._registry = registry
+        self.index = None
+        self._relative_rules: dict[tuple[str, ...], Rule] | None = None
+
+    def visit(self, node: ast.AST) -> None:
+        """Check all the calls in a tree.
+
+        The calls are not checked if the module doesn't import any providers of the mock classes
+        and patch.
+
+        Args:
+            node: The root of the tree to check.
+        """
+        check = MockSpecCheck(self._registry)
+        self.problems.extend(traverse(node, (check,)))
+        self.index = check.index
+
+    # The function must be called the same as the name of the node
+    def visit_Call(self, node: ast.Call) -> None:  # pylint: disable=invalid-name
+        """Check a single Call node, nested calls are not checked.
+
+        Args:
+            node: The Call node being visited.
+        """
+        if self.index is not None:
+            problem = _check_call(node, self.index)
+        else:
+            if self._relative_rules is None:
+                self._relative_rules = _relative_rules(self._registry)
+            problem = _check_unresolved_call(node, self._relative_rules)
+        if problem is not None:
+            self.problems.append(problem)
+
+
+class Plugin:
+    """Checks that construction of mocks and calling of patch.
+
+    The options are set on the class when flake8 parses them since they are shared by every file.
+
+    Attrs:
+        name: The name of the plugin.
+        max_problems: The maximum number of problems reported per file, None checks all the calls
+            in a file.
+        stats_path: The file the statistics of every checked file are appended to, None doesn't
+            record statistics.
+        registry: The factories that problems are reported for, compiled from the options.
+        target_roots: The directories of the modules that spec and patch targets are resolved in,
+            the targets are only checked if there are roots.
+        target_cache_dir: The directory of the cache of the target index, None uses the default
+            cache directory.
+        baseline: The accepted problems read from the baseline file, None reports all the
+            problems.
+        budget: The maximum work spent checking a single file, None checks the whole of every
+            file.
+    """
+
+    # flake8 requires this class to exist
+    # pylint: disable=too-few-public-methods
+
+    name = __name__
+    max_problems: int | None = None
+    stats_path: str | None = None
+    registry: Registry = DEFAULT_REGISTRY
+    target_roots: tuple[str, ...] = ()
+    target_cache_dir: str | None = None
+    baseline: Baseline | None = None
+    budget: Budget | None = None
+
+    @staticmethod
+    def add_options(option_manager: OptionManager) -> None:
+        """Register the options of the plugin with flake8.
+
+        Args:
+            option_manager: The flake8 option manager.
+        """
+        option_manager.add_option(
+            "--mock-spec-max-problems",
+            type=int,
+            default=None,
+            parse_from_config=True,
+            help="stop checking a file after this many mock spec problems (default: no limit)",
+        )
+        option_manager.add_option(
+            "--mock-spec-stats",
+            default=os.environ.get(STATS_ENV_VAR),
+            help=(
+                "write the time, nodes, calls and problems of each file as JSON lines followed by "
+                f"a summary to this file (default: ${STATS_ENV_VAR})"
+            ),
+        )
+        option_manager.add_option(
+            "--mock-spec-factories",
+            default="",
+            comma_separated_list=True,
+            parse_from_config=True,
+            help=(
+                "additional mock factories to check, as the fully qualified name optionally "
+                f"followed by {FACTORY_ARGS_SEPARATOR} and the arguments any of which must be "
+                f"passed separated by {FACTORY_ARG_SEPARATOR}, a number is the index of a "
+                "positional argument, e.g., "
+                f"tests.fakes.make_fake_client{FACTORY_ARGS_SEPARATOR}spec"
+                f"{FACTORY_ARG_SEPARATOR}0 (default: spec and spec_set)"
+            ),
+        )
+        option_manager.add_option(
+            "--mock-spec-target-roots",
+            default="",
+            comma_separated_list=True,
+            parse_from_config=True,
+            help=(
+                "check that spec and patch targets exist in the modules found in these "
+                "directories without importing them (default: not checked)"
+            ),
+        )
+        option_manager.add_option(
+            "--mock-spec-target-cache-dir",
+            default=None,
+            parse_from_config=True,
+            help=(
+                "the directory the names defined by the modules are cached in "
+                "(default: .flake8_mock_spec_cache)"
+            ),
+        )
+        option_manager.add_option(
+            "--mock-spec-baseline",
+            default=None,
+            parse_from_config=True,
+            help=(
+                "don't report the problems accepted in this baseline file, written using "
+                "flake8-mock-spec --write-baseline (default: all problems are reported)"
+            ),
+        )
+        option_manager.add_option(
+            "--mock-spec-max-nodes",
+            type=int,
+            default=None,
+            parse_from_config=True,
+            help=(
+                f"stop checking a file after visiting this many nodes and report {BUDGET_CODE} "
+                "(default: no limit)"
+            ),
+        )
+        option_manager.add_option(
+            "--mock-spec-max-seconds",
+            type=float,
+            default=None,
+            parse_from_config=True,
+            help=(
+                f"stop checking a file after this many seconds and report {BUDGET_CODE}, the "
+                "time the file takes to parse is not included (default: no limit)"
+            ),
+        )
+
+    @classmethod
+    def parse_options(cls, options: argparse.Namespace) -> None:
+        """Read the options of the plugin.
+
+        Args:
+            options: The parsed flake8 options.
+        """
+        cls.max_problems = options.mock_spec_max_problems
+        cls.stats_path = options.mock_spec_stats or None
+        cls.registry = compile_registry(options.mock_spec_factories or ())
+        cls.target_roots = tuple(options.mock_spec_target_roots or ())
+        cls.target_cache_dir = options.mock_spec_target_cache_dir
+        cls.budget = None
+        if options.mock_spec_max_nodes is not None or options.mock_spec_max_seconds is not None:
+            cls.budget = Budget(options.mock_spec_max_nodes, options.mock_spec_max_seconds)
+        cls.baseline = None
+        if options.mock_spec_baseline:
+            # Only imported when enabled since it isn't needed by most runs
+            from . import baseline  # pylint: disable=import-outside-toplevel
+
+            # Read before the worker processes are started so that they share it
+            cls.baseline = baseline.get_baseline(options.mock_spec_baseline)
+        if cls.stats_path is not None:
+            # Only imported when enabled since it isn't needed by most runs
+            from . import stats  # pylint: disable=import-outside-toplevel
+
+            stats.start_run(cls.stats_path)
+        if cls.target_roots:
+            # Only imported when enabled since it isn't needed by most runs
+            from . import targets  # pylint: disable=import-outside-toplevel
+
+            targets.start_run(cls.target_cache_dir)
+
+    def __init__(
+        self, tree: ast.AST, lines: Sequence[str] | None = None, filename: str | None = None
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+            tree: The AST syntax tree for the file to be linted.
+            lines: The lines of the file to be linted, used to skip the traversal of the AST if
+                none of the names that problems are reported for appear in the file.
+            filename: The name of the file to be linted, used in the statistics.
+        """
+        self._tree = tree
+        self._lines = lines
+        self._filename = filename
+
+    def run(self) -> Iterator[tuple[int, int, str, type["Plugin"]]]:
+        """Lint a file and yield any issues found.
+
+        Yields:
+            A tuple containing the line number, column and error message of the issues found.
+        """
+        if self.stats_path is None:
+            problems = self._problems(None)
+        else:
+            from . import stats  # pylint: disable=import-outside-toplevel
+
+            problems = stats.profile(self._filename or "stdin", self._problems, self.stats_path)
+        for problem in problems:
+            yield (problem.lineno, problem.col_offset, problem.msg, type(self))
+
+    def _problems(self, stats: FileStats | None) -> Iterator[Problem]:
+        """Find the problems in the file.
+
+        Args:
+            stats: Records the work done, if any.
+
+        Yields:
+            The problems in the file.
+        """
+        if self._lines is not None and not _may_have_problems(self._lines, self.registry.needles):
+            return
+        checks: list[Check] = [MockSpecCheck(self.registry)]
+        if self.target_roots and isinstance(self._tree, ast.Module):
+            # Only imported when enabled since it isn't needed by most runs
+            from . import targets  # pylint: disable=import-outside-toplevel
+
+            index = targets.get_index(self.target_roots, self.target_cache_dir)
+            checks.append(targets.TargetCheck(index, self._filename, self.registry))
+        # The checks share a single traversal of the tree
+        problems = traverse(self._tree, checks, stats, self.budget)
+        # The text of the calls is read from the lines, which flake8 always passes
+        if self.baseline is not None and self._lines is not None:
+            problems = self.baseline.suppress(
+                self._tree, self._lines, self._filename or "stdin", problems
+            )
+        if self.max_problems is None:
+            yield from problems
+        else:
+            yield from itertools.islice(problems, self.max_problems)
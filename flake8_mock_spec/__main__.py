@@ -0,0 +1,7 @@
+"""Run the standalone command line interface, see flake8_mock_spec.cli."""
+
+import sys
+
+from flake8_mock_spec.cli import main
+
+sys.exit(main())
@@ -0,0 +1,148 @@
+"""Library interface that checks files or sources in parallel and returns structured results."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Sequence, Tuple, Union
+
+from .cli import DEFAULT_EXCLUDE, FileResult, check_files, check_source, discover
+from .shared import parallel_map
+
+ORDER_INPUT = "input"
+ORDER_COMPLETED = "completed"
+ORDERS = (ORDER_INPUT, ORDER_COMPLETED)
+
+# The path used in the results and the content of the file
+Source = Tuple[str, Union[str, bytes]]
+
+
+class Result(NamedTuple):
+    """A problem found in a file.
+
+    Attrs:
+        path: The path to the file.
+        lineno: The line number of the problem.
+        col_offset: The column of the problem, 0 based.
+        code: The code of the rule, e.g., TMS010, or E999 if the file can't be parsed.
+        message: The description of the problem without the code.
+    """
+
+    path: str
+    lineno: int
+    col_offset: int
+    code: str
+    message: str
+
+
+def _to_results(file_result: FileResult) -> Iterator[Result]:
+    """Convert the problems of a file to results ordered by their position.
+
+    Args:
+        file_result: The problems found in the file.
+
+    Yields:
+        The results.
+    """
+    for problem in sorted(file_result.problems):
+        code, message = problem.msg.split(maxsplit=1)
+        yield Result(file_result.path, problem.lineno, problem.col_offset, code, message)
+
+
+def _check_named_source(source: Source) -> FileResult:
+    """Check the content of a file.
+
+    Args:
+        source: The path and content of the file, text is encoded as UTF-8.
+
+    Returns:
+        The problems found in the file.
+    """
+    path, content = source
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return FileResult(path=path, problems=check_source(content))
+
+
+def _options(workers: int | None, order: str) -> tuple[int, bool]:
+    """Validate the common options.
+
+    Args:
+        workers: The number of workers, None uses the number of CPUs.
+        order: One of ORDERS.
+
+    Returns:
+        The number of workers and whether the results are ordered.
+
+    Raises:
+        ValueError: If the order isn't one of ORDERS.
+    """
+    if order not in ORDERS:
+        raise ValueError(f"order must be one of {', '.join(ORDERS)}, got {order!r}")
+    return (os.cpu_count() or 1) if workers is None else workers, order == ORDER_INPUT
+
+
+def check_paths(  # pylint: disable=too-many-arguments
+    paths: Iterable[str],
+    workers: int | None = None,
+    threads: bool = False,
+    order: str = ORDER_INPUT,
+    exclude: Sequence[str] = DEFAULT_EXCLUDE,
+    cache_directory: Path | None = None,
+) -> Iterator[Result]:
+    """Find the Python files in the paths and check them in parallel.
+
+    Problems suppressed using noqa comments are not included.
+
+    Args:
+        paths: The files and directories to check, directories are searched recursively.
+        workers: The number of workers, None uses the number of CPUs.
+        threads: Whether to use a pool of threads rather than processes.
+        order: ORDER_INPUT yields the files in sorted order of their path, ORDER_COMPLETED yields
+            each file as soon as it has been checked. The results of a file are always ordered by
+            their position.
+        exclude: Glob patterns of the file and directory names and paths to skip.
+        cache_directory: The directory of the cache of the standalone command, the cache is not
+            used if it is None.
+
+    Yields:
+        The problems found in the files.
+    """
+    jobs, ordered = _options(workers, order)
+    for file_result in check_files(
+        discover(paths, exclude),
+        jobs=jobs,
+        cache_directory=cache_directory,
+        threads=threads,
+        ordered=ordered,
+    ):
+        yield from _to_results(file_result)
+
+
+def check_sources(
+    sources: Iterable[Source],
+    workers: int | None = None,
+    threads: bool = False,
+    order: str = ORDER_INPUT,
+) -> Iterator[Result]:
+    """Check the contents of files in parallel.
+
+    Problems suppressed using noqa comments are not included.
+
+    Args:
+        sources: The path to use in the results and the content of each file, text is encoded as
+            UTF-8.
+        workers: The number of workers, None uses the number of CPUs.
+        threads: Whether to use a pool of threads rather than processes.
+        order: ORDER_INPUT yields the files in the same order as the sources, ORDER_COMPLETED
+            yields each file as soon as it has been checked. The results of a file are always
+            ordered by their position.
+
+    Yields:
+        The problems found in the files.
+    """
+    jobs, ordered = _options(workers, order)
+    for file_result in parallel_map(
+        _check_named_source, list(sources), jobs, threads=threads, ordered=ordered
+    ):
+        yield from _to_results(file_result)
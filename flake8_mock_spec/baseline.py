@@ -0,0 +1,315 @@
+"""Baseline of accepted problems that are not reported, identified by hashed fingerprints.
+
+A fingerprint doesn't contain the position of a problem so that it survives unrelated edits of
+the file. It is the hash of the code of the rule, the path to the file, the text of the call with
+the whitespace removed and the definitions the call is within. The baseline file contains a
+fingerprint per accepted problem in sorted order, identical problems repeat their fingerprint.
+
+Only imported when a baseline is used so that the startup time of the plugin is not affected.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import io
+import os
+import threading
+import tokenize
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from . import BUDGET_CODE, Problem
+
+HEADER = "# flake8-mock-spec baseline, a fingerprint per accepted problem\n"
+FINGERPRINT_BYTES = 8
+# Only problems that are attached to a node are accepted
+EXCLUDED_CODES = frozenset(("E999", BUDGET_CODE))
+
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_BASELINES: dict[str, Baseline] = {}
+_BASELINES_LOCK = threading.Lock()
+
+
+def fingerprint(code: str, path: str, text: str, scope: str) -> str:
+    """Calculate the fingerprint of a problem.
+
+    Args:
+        code: The code of the rule, e.g., TMS010.
+        path: The path to the file relative to the current directory with / as the separator.
+        text: The text of the node of the problem with the whitespace removed.
+        scope: The dotted names of the definitions the node is within, empty at module level.
+
+    Returns:
+        The hash as hexadecimal.
+    """
+    data = "\0".join((code, path, text, scope)).encode()
+    return hashlib.blake2b(data, digest_size=FINGERPRINT_BYTES).hexdigest()
+
+
+def _normalize_path(path: str) -> str:
+    """Normalize a path so that the same file has the same path however it is passed.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        The path relative to the current directory with / as the separator.
+    """
+    return Path(os.path.relpath(path)).as_posix()
+
+
+def _locate(tree: ast.AST) -> dict[tuple[int, int], tuple[ast.AST, str]]:
+    """Find the outermost expression at each position and the definitions it is within.
+
+    Decorators and default arguments are counted as within the definition they belong to.
+
+    Args:
+        tree: The tree of the module.
+
+    Returns:
+        The expression and the dotted names of the definitions by line and column.
+    """
+    located: dict[tuple[int, int], tuple[ast.AST, str]] = {}
+    stack: list[tuple[ast.AST, str]] = [(tree, "")]
+    while stack:
+        node, scope = stack.pop()
+        if isinstance(node, ast.expr):
+            located.setdefault((node.lineno, node.col_offset), (node, scope))
+        if isinstance(node, _DEFINITION_TYPES):
+            scope = f"{scope}.{node.name}" if scope else node.name
+        stack.extend((child, scope) for child in reversed(list(ast.iter_child_nodes(node))))
+    return located
+
+
+def _segment(lines: Sequence[str], node: ast.AST) -> str:
+    """Retrieve the text of a node without splitting the source each time.
+
+    Args:
+        lines: The lines of the module.
+        node: The node.
+
+    Returns:
+        The text of the node, empty if its position is not known.
+    """
+    end_lineno = getattr(node, "end_lineno", None)
+    end_col_offset = getattr(node, "end_col_offset", None)
+    if end_lineno is None or end_col_offset is None or end_lineno > len(lines):
+        return ""
+    # The columns are offsets in the UTF-8 encoding of the lines
+    first, last = node.lineno - 1, end_lineno - 1  # type: ignore[attr-defined]
+    col_offset = node.col_offset  # type: ignore[attr-defined]
+    if first == last:
+        return lines[first].encode()[col_offset:end_col_offset].decode()
+    return "".join(
+        (
+            lines[first].encode()[col_offset:].decode(),
+            *lines[first + 1 : last],
+            lines[last].encode()[:end_col_offset].decode(),
+        )
+    )
+
+
+class _Fingerprinter:
+    """Calculates the fingerprints of the problems in a module."""
+
+    # The located nodes are shared by the fingerprints of all the problems in the module
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, tree: ast.AST, lines: Sequence[str], path: str) -> None:
+        """Construct.
+
+        Args:
+            tree: The tree of the module.
+            lines: The lines of the module.
+            path: The path to the file of the module.
+        """
+        self._located = _locate(tree)
+        self._lines = lines
+        self._path = _normalize_path(path)
+
+    def __call__(self, problem: Problem) -> str:
+        """Calculate the fingerprint of a problem.
+
+        Args:
+            problem: The problem.
+
+        Returns:
+            The fingerprint.
+        """
+        code = problem.msg.split(maxsplit=1)[0]
+        if (located := self._located.get((problem.lineno, problem.col_offset))) is None:
+            return fingerprint(code, self._path, "", "")
+        node, scope = located
+        text = "".join(_segment(self._lines, node).split())
+        return fingerprint(code, self._path, text, scope)
+
+
+def fingerprints(
+    tree: ast.AST, lines: Sequence[str], path: str, problems: Iterable[Problem]
+) -> list[str]:
+    """Calculate the fingerprints of the problems in a module that can be accepted.
+
+    Args:
+        tree: The tree of the module.
+        lines: The lines of the module.
+        path: The path to the file of the module.
+        problems: The problems found in the module.
+
+    Returns:
+        The fingerprint of each problem that isn't excluded.
+    """
+    problems = [
+        problem for problem in problems if problem.msg.split(maxsplit=1)[0] not in EXCLUDED_CODES
+    ]
+    if not problems:
+        return []
+    fingerprinter = _Fingerprinter(tree, lines, path)
+    return [fingerprinter(problem) for problem in problems]
+
+
+def _parse(source: bytes) -> tuple[ast.AST, list[str]] | None:
+    """Parse the content of a file.
+
+    Args:
+        source: The content of the file.
+
+    Returns:
+        The tree and the lines of the file or None if it can't be parsed.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError, RecursionError):
+        return None
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+    # Split the same way as the tokenizer, str.splitlines also splits on characters such as \x0c
+    return tree, [line.decode(encoding) for line in source.splitlines(keepends=True)]
+
+
+def source_fingerprints(source: bytes, path: str, problems: Iterable[Problem]) -> list[str]:
+    """Calculate the fingerprints of the problems in the content of a file.
+
+    Args:
+        source: The content of the file.
+        path: The path to the file.
+        problems: The problems found in the file.
+
+    Returns:
+        The fingerprint of each problem that isn't excluded, none if the file can't be parsed.
+    """
+    problems = list(problems)
+    if not problems or (parsed := _parse(source)) is None:
+        return []
+    tree, lines = parsed
+    return fingerprints(tree, lines, path, problems)
+
+
+class Baseline:
+    """The accepted problems.
+
+    Attrs:
+        counts: The number of accepted problems by fingerprint.
+    """
+
+    counts: Counter[str]
+
+    def __init__(self, counts: Counter[str]) -> None:
+        """Construct.
+
+        Args:
+            counts: The number of accepted problems by fingerprint.
+        """
+        self.counts = counts
+
+    @classmethod
+    def load(cls, path: str | Path) -> Baseline:
+        """Read a baseline file.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            The baseline.
+        """
+        with open(path, encoding="utf-8") as file:
+            return cls(Counter(line.strip() for line in file if line.strip()[:1] not in ("", "#")))
+
+    def suppress(
+        self, tree: ast.AST, lines: Sequence[str], path: str, problems: Iterable[Problem]
+    ) -> Iterator[Problem]:
+        """Remove the accepted problems of a module.
+
+        If a problem occurs more often than it was accepted, the later occurrences are reported.
+
+        Args:
+            tree: The tree of the module.
+            lines: The lines of the module.
+            path: The path to the file of the module.
+            problems: The problems found in the module.
+
+        Yields:
+            The problems that were not accepted.
+        """
+        fingerprinter: _Fingerprinter | None = None
+        seen: dict[str, int] = {}
+        for problem in problems:
+            if problem.msg.split(maxsplit=1)[0] in EXCLUDED_CODES:
+                yield problem
+                continue
+            # The tree is only searched once a module has any problems
+            if fingerprinter is None:
+                fingerprinter = _Fingerprinter(tree, lines, path)
+            key = fingerprinter(problem)
+            occurrence = seen[key] = seen.get(key, 0) + 1
+            if occurrence > self.counts[key]:
+                yield problem
+
+    def suppress_source(self, source: bytes, path: str, problems: list[Problem]) -> list[Problem]:
+        """Remove the accepted problems of the content of a file.
+
+        Args:
+            source: The content of the file.
+            path: The path to the file.
+            problems: The problems found in the file.
+
+        Returns:
+            The problems that were not accepted, all of them if the file can't be parsed.
+        """
+        if not problems or (parsed := _parse(source)) is None:
+            return problems
+        tree, lines = parsed
+        return list(self.suppress(tree, lines, path, problems))
+
+
+def write(path: str | Path, fingerprints_: Iterable[str]) -> int:
+    """Write a baseline file.
+
+    Args:
+        path: The path to the file.
+        fingerprints_: The fingerprint of each accepted problem.
+
+    Returns:
+        The number of accepted problems.
+    """
+    lines = sorted(fingerprints_)
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        file.write(HEADER)
+        file.writelines(f"{line}\n" for line in lines)
+    return len(lines)
+
+
+def get_baseline(path: str | Path) -> Baseline:
+    """Retrieve a baseline, read once and shared within the current process.
+
+    Args:
+        path: The path to the baseline file.
+
+    Returns:
+        The baseline.
+    """
+    lookup_key = os.path.abspath(path)
+    with _BASELINES_LOCK:
+        if (baseline := _BASELINES.get(lookup_key)) is None:
+            baseline = _BASELINES[lookup_key] = Baseline.load(path)
+    return baseline
@@ -0,0 +1,235 @@
+"""Persistent cache of the problems found in files keyed by the hash of their content.
+
+Other results derived from the content of files, e.g., the names a module defines, are stored
+in the same database under their own namespace.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Iterable
+
+from . import MOCK_MSG_LOOKUP, PATCH_MSG_LOOKUP, Problem
+
+DEFAULT_DIRECTORY = Path(".flake8_mock_spec_cache")
+DEFAULT_MAX_ENTRIES = 100_000
+DATABASE_NAME = "cache.sqlite3"
+DEFAULT_RULES = tuple(
+    sorted(
+        msg.split(maxsplit=1)[0] for msg in (*MOCK_MSG_LOOKUP.values(), *PATCH_MSG_LOOKUP.values())
+    )
+)
+# Recording every hit would turn each read into a write, entries used more recently than this
+# are already safe from eviction in practice
+TOUCH_INTERVAL_SECONDS = 60 * 60
+# Other processes may hold the write lock while they store their results
+LOCK_TIMEOUT_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    problems TEXT NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+_CACHES: dict[tuple[int, str], Cache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def _version() -> str:
+    """Retrieve the version of the plugin.
+
+    Returns:
+        The installed version of the package or unknown if it isn't installed.
+    """
+    try:
+        return metadata.version("flake8-mock-spec")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class Cache:
+    """Stores the problems found in files in a SQLite database.
+
+    The database can be used concurrently by several processes and threads, each thread uses its
+    own connection since SQLite connections can't be shared between threads. Once there are more
+    than the maximum number of entries, the least recently used entries are evicted.
+
+    Attrs:
+        path: The path to the database.
+        max_entries: The number of entries to keep when evicting.
+    """
+
+    path: Path
+    max_entries: int
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        rules: Iterable[str] = DEFAULT_RULES,
+    ) -> None:
+        """Open the database, creating it if it doesn't exist.
+
+        Args:
+            path: The path to the database.
+            max_entries: The number of entries to keep when evicting.
+            rules: The codes of the active rules, results for different rules are not shared.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._prefix = f"{_version()}\0{','.join(sorted(rules))}\0".encode()
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection:
+            self._connection.execute(_SCHEMA)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """The connection of the current thread, opened on first use."""
+        if (connection := getattr(self._local, "connection", None)) is None:
+            # Only used by this thread, close is allowed to close it from another thread
+            connection = sqlite3.connect(
+                self.path, timeout=LOCK_TIMEOUT_SECONDS, check_same_thread=False
+            )
+            # Readers don't block the writer and the other way around
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def key(self, source: bytes, namespace: str = "") -> str:
+        """Calculate the key for the content of a file.
+
+        Args:
+            source: The content of the file.
+            namespace: Separates results that may differ for the same content, e.g., the symbols
+                of a module and the problems in the same file.
+
+        Returns:
+            The hash of the plugin version, active rules, namespace and content.
+        """
+        prefix = self._prefix + f"{namespace}\0".encode() if namespace else self._prefix
+        return hashlib.sha256(prefix + source).hexdigest()
+
+    def load_problems(self, key: str) -> list[Problem] | None:
+        """Retrieve the problems stored for a key.
+
+        Args:
+            key: The key calculated for the content of the file.
+
+        Returns:
+            The problems or None if the key is not in the cache.
+        """
+        problems = self.load(key)
+        if problems is None:
+            return None
+        return [Problem(*problem) for problem in problems]
+
+    def store_problems(self, key: str, problems: Iterable[Problem]) -> None:
+        """Store the problems for a key.
+
+        Args:
+            key: The key calculated for the content of the file.
+            problems: The problems found in the file.
+        """
+        self.store(key, [tuple(problem) for problem in problems])
+
+    def load(self, key: str) -> Any:
+        """Retrieve the value stored for a key.
+
+        Args:
+            key: The key calculated for the content of the file.
+
+        Returns:
+            The value decoded from JSON or None if the key is not in the cache.
+        """
+        row = self._connection.execute(
+            "SELECT problems, last_used FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        problems, last_used = row
+        if (now := time.time()) - last_used > TOUCH_INTERVAL_SECONDS:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE results SET last_used = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(problems)
+
+    def store(self, key: str, value: Any) -> None:
+        """Store a value for a key.
+
+        Args:
+            key: The key calculated for the content of the file.
+            value: The value, it must be possible to encode it as JSON.
+        """
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, problems, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+
+    def __len__(self) -> int:
+        """Count the entries.
+
+        Returns:
+            The number of entries in the cache.
+        """
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def evict(self) -> int:
+        """Remove the least recently used entries beyond the maximum number of entries.
+
+        Returns:
+            The number of entries that were removed.
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the connections of all the threads, no thread may use the cache afterwards."""
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+
+def get_cache(directory: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> Cache:
+    """Retrieve the cache in a directory, shared within the current process.
+
+    Worker processes each open their own connection to the database, threads share the cache.
+
+    Args:
+        directory: The directory of the cache.
+        max_entries: The number of entries to keep when evicting, replaces the value of a cache
+            that was already opened.
+
+    Returns:
+        The cache.
+    """
+    lookup_key = (os.getpid(), str(directory))
+    with _CACHES_LOCK:
+        if (cache := _CACHES.get(lookup_key)) is None:
+            cache = Cache(directory / DATABASE_NAME, max_entries=max_entries)
+            # Keep the cache out of version control the same way as pytest does
+            if not (gitignore := directory / ".gitignore").exists():
+                gitignore.write_text("*\n", encoding="utf-8")
+            _CACHES[lookup_key] = cache
+    cache.max_entries = max_entries
+    return cache
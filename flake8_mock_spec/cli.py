@@ -0,0 +1,674 @@
+"""Standalone command line interface that checks files without the flake8 machinery."""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import fnmatch
+import io
+import itertools
+import os
+import sys
+import threading
+import tokenize
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Sequence, TextIO
+
+from . import (
+    BUDGET_CODE,
+    DEFAULT_REGISTRY,
+    Budget,
+    Check,
+    MockSpecCheck,
+    Problem,
+    Registry,
+    compile_registry,
+    traverse,
+)
+from .baseline import get_baseline, source_fingerprints
+from .baseline import write as write_baseline
+from .cache import DEFAULT_DIRECTORY, DEFAULT_MAX_ENTRIES, get_cache
+from .diff import ChangedLines, GitError, changed_lines, in_ranges
+from .fix import fix_files
+from .problems import ProblemTable
+from .report import FORMAT_DEFAULT, FORMATS, REPORTS
+from .shared import is_suppressed, may_have_problems, parallel_map
+
+DEFAULT_EXCLUDE = (".svn", "CVS", ".bzr", ".hg", ".git", "__pycache__", ".tox", ".nox", ".eggs")
+SYNTAX_ERROR_CODE = "E999"
+
+
+class CheckOptions(NamedTuple):
+    """The options of the checks that are also options of the flake8 plugin.
+
+    Attrs:
+        factories: The definitions of the additional factories as accepted by parse_factory.
+        target_roots: The directories of the modules that the spec and patch targets must exist
+            in, the targets are not checked if it is empty.
+        target_cache_dir: The directory the names defined by the modules are cached in, the
+            default cache directory if it is None.
+    """
+
+    factories: tuple[str, ...] = ()
+    target_roots: tuple[str, ...] = ()
+    target_cache_dir: str | None = None
+
+
+DEFAULT_CHECK_OPTIONS = CheckOptions()
+# The registry and its encoded needles of each set of factories, compiled once per process
+_REGISTRIES: dict[tuple[str, ...], tuple[Registry, tuple[bytes, ...]]] = {
+    (): (DEFAULT_REGISTRY, tuple(needle.encode() for needle in DEFAULT_REGISTRY.needles))
+}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+class FileResult(NamedTuple):
+    """The problems found in a file.
+
+    Attrs:
+        path: The path to the file.
+        problems: The problems found in the file.
+    """
+
+    path: str
+    problems: list[Problem]
+
+
+def _is_excluded(path: str, exclude: Sequence[str]) -> bool:
+    """Check whether a path matches any of the exclude patterns.
+
+    Args:
+        path: The path to check.
+        exclude: Glob patterns of the file and directory names and paths to skip.
+
+    Returns:
+        Whether the path is excluded.
+    """
+    name = os.path.basename(path)
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern) for pattern in exclude
+    )
+
+
+def discover(paths: Iterable[str], exclude: Sequence[str] = DEFAULT_EXCLUDE) -> list[str]:
+    """Find the Python files to check.
+
+    Files that are passed explicitly are always included, directories are searched recursively
+    for Python files.
+
+    Args:
+        paths: The files and directories to check.
+        exclude: Glob patterns of the file and directory names and paths to skip.
+
+    Returns:
+        The sorted paths of the files to check.
+    """
+    files = set()
+    for path in paths:
+        if not os.path.isdir(path):
+            files.add(path)
+            continue
+        for directory, directories, names in os.walk(path):
+            directories[:] = [
+                name
+                for name in directories
+                if not _is_excluded(os.path.join(directory, name), exclude)
+            ]
+            files.update(
+                file
+                for name in names
+                if name.endswith(".py")
+                and not _is_excluded(file := os.path.join(directory, name), exclude)
+            )
+    return sorted(files)
+
+
+def discover_changed(
+    changed: ChangedLines, paths: Iterable[str], exclude: Sequence[str] = DEFAULT_EXCLUDE
+) -> list[str]:
+    """Find the changed Python files within the paths.
+
+    Args:
+        changed: The changed lines by path relative to the current directory.
+        paths: The files and directories to check.
+        exclude: Glob patterns of the file and directory names and paths to skip.
+
+    Returns:
+        The sorted paths of the changed files to check.
+    """
+    roots = [os.path.normpath(path) for path in paths]
+    return sorted(
+        path
+        for path in changed
+        if any(
+            root == os.curdir or path == root or path.startswith(root + os.sep) for root in roots
+        )
+        and not any(_is_excluded(part, exclude) for part in Path(path).parts)
+        and not _is_excluded(path, exclude)
+        and os.path.isfile(path)
+    )
+
+
+def _registry(factories: tuple[str, ...]) -> tuple[Registry, tuple[bytes, ...]]:
+    """Compile the registry of the factories, only once per process.
+
+    Args:
+        factories: The definitions of the additional factories as accepted by parse_factory.
+
+    Returns:
+        The registry and its needles encoded as UTF-8.
+    """
+    with _REGISTRIES_LOCK:
+        if (compiled := _REGISTRIES.get(factories)) is None:
+            registry = compile_registry(factories)
+            compiled = _REGISTRIES[factories] = (
+                registry,
+                tuple(needle.encode() for needle in registry.needles),
+            )
+    return compiled
+
+
+def _checks(options: CheckOptions, registry: Registry, path: str | None) -> list[Check]:
+    """Create the checks that the options enable.
+
+    Args:
+        options: The options of the checks.
+        registry: The registry of the factories of the options.
+        path: The path to the file, used to resolve relative imports, if known.
+
+    Returns:
+        The checks.
+    """
+    checks: list[Check] = [MockSpecCheck(registry)]
+    if options.target_roots:
+        # Only imported when enabled since it isn't needed by most runs
+        from . import targets  # pylint: disable=import-outside-toplevel
+
+        index = targets.get_index(options.target_roots, options.target_cache_dir)
+        checks.append(targets.TargetCheck(index, path, registry))
+    return checks
+
+
+def check_source(
+    source: bytes,
+    budget: Budget | None = None,
+    options: CheckOptions = DEFAULT_CHECK_OPTIONS,
+    path: str | None = None,
+) -> list[Problem]:
+    """Check the source of a file.
+
+    Args:
+        source: The content of the file.
+        budget: The limits of the traversal of the tree, the whole tree is traversed if it is
+            None.
+        options: The options of the checks, the same as the flake8 options of the plugin.
+        path: The path to the file, used to resolve the relative imports of targets, if known.
+
+    Returns:
+        The problems found in the file that are not suppressed using a noqa comment.
+    """
+    registry, needles = _registry(options.factories)
+    if not may_have_problems(source, needles):
+        return []
+
+    try:
+        tree = ast.parse(source)
+        problems = list(traverse(tree, _checks(options, registry, path), budget=budget))
+    # Generated code can be nested too deeply for the parser
+    except (SyntaxError, ValueError, RecursionError) as exc:
+        lineno = getattr(exc, "lineno", None) or 1
+        col_offset = max((getattr(exc, "offset", None) or 1) - 1, 0)
+        return [Problem(lineno, col_offset, f"{SYNTAX_ERROR_CODE} {type(exc).__name__}: {exc}")]
+    if not problems:
+        return []
+
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+    # Split the same way as the tokenizer, str.splitlines also splits on characters such as \x0c
+    lines = source.splitlines()
+    return [
+        problem
+        for problem in problems
+        if not is_suppressed(lines[problem.lineno - 1].decode(encoding), problem)
+    ]
+
+
+def _file_problems(
+    source: bytes,
+    cache_directory: Path | None,
+    budget: Budget | None = None,
+    options: CheckOptions = DEFAULT_CHECK_OPTIONS,
+    path: str | None = None,
+) -> list[Problem]:
+    """Check the content of a file, consulting the cache first.
+
+    The cache is not used when the targets are checked since the problems then also depend on
+    the other modules of the project.
+
+    Args:
+        source: The content of the file.
+        cache_directory: The directory of the cache, the cache is not used if it is None.
+        budget: The limits of the check, see check_source.
+        options: The options of the checks, see check_source.
+        path: The path to the file, see check_source.
+
+    Returns:
+        The problems found in the file.
+    """
+    if cache_directory is None or options.target_roots:
+        return check_source(source, budget, options, path)
+    if not may_have_problems(source, _registry(options.factories)[1]):
+        return []
+
+    cache = get_cache(cache_directory)
+    # The results with additional factories are separated from the results without them
+    key = cache.key(source, namespace="\0".join(options.factories))
+    if (problems := cache.load_problems(key)) is None:
+        problems = check_source(source, budget, options, path)
+        # Only complete results are cached, they are valid whatever the budget
+        if not any(problem.msg.startswith(BUDGET_CODE) for problem in problems):
+            cache.store_problems(key, problems)
+    return problems
+
+
+def check_file(
+    path: str,
+    cache_directory: Path | None = None,
+    baseline_path: Path | None = None,
+    budget: Budget | None = None,
+    options: CheckOptions = DEFAULT_CHECK_OPTIONS,
+) -> FileResult:
+    """Check a file.
+
+    Args:
+        path: The path to the file.
+        cache_directory: The directory of the cache that is consulted before checking the file,
+            the cache is not used if it is None.
+        baseline_path: The baseline file of the accepted problems, which are not included, all
+            problems are included if it is None.
+        budget: The limits of the check, see check_source.
+        options: The options of the checks, see check_source.
+
+    Returns:
+        The problems found in the file.
+    """
+    source = Path(path).read_bytes()
+    problems = _file_problems(source, cache_directory, budget, options, path)
+    # The cache holds all the problems since the baseline changes independently of the files
+    if baseline_path is not None and problems:
+        problems = get_baseline(baseline_path).suppress_source(source, path, problems)
+    return FileResult(path=path, problems=problems)
+
+
+def file_fingerprints(path: str, options: CheckOptions = DEFAULT_CHECK_OPTIONS) -> list[str]:
+    """Calculate the fingerprints of the problems in a file for a baseline.
+
+    Args:
+        path: The path to the file.
+        options: The options of the checks, see check_source.
+
+    Returns:
+        The fingerprint of each problem.
+    """
+    source = Path(path).read_bytes()
+    return source_fingerprints(source, path, check_source(source, options=options, path=path))
+
+
+def check_files(  # pylint: disable=too-many-arguments
+    paths: Sequence[str],
+    jobs: int,
+    cache_directory: Path | None = None,
+    threads: bool = False,
+    ordered: bool = True,
+    baseline_path: Path | None = None,
+    budget: Budget | None = None,
+    options: CheckOptions = DEFAULT_CHECK_OPTIONS,
+) -> Iterator[FileResult]:
+    """Check files, in parallel if more than one job is requested.
+
+    Args:
+        paths: The paths to the files to check.
+        jobs: The number of workers.
+        cache_directory: The directory of the cache, the cache is not used if it is None.
+        threads: Whether to use a pool of threads rather than processes.
+        ordered: Whether to yield the results in the same order as the paths rather than as soon
+            as they are ready.
+        baseline_path: The baseline file of the accepted problems, which are not included, all
+            problems are included if it is None.
+        budget: The limits of the check of each file, see check_source.
+        options: The options of the checks, see check_source.
+
+    Yields:
+        The problems found in each file.
+    """
+    check = partial(
+        check_file,
+        cache_directory=cache_directory,
+        baseline_path=baseline_path,
+        budget=budget,
+        options=options,
+    )
+    yield from parallel_map(check, paths, jobs, threads=threads, ordered=ordered)
+
+
+def format_problem(path: str, problem: Problem) -> str:
+    """Format a problem the same way as the default flake8 formatter.
+
+    Args:
+        path: The path to the file the problem was found in.
+        problem: The problem.
+
+    Returns:
+        The problem formatted as path:row:col: message with a 1 based column.
+    """
+    return f"{path}:{problem.lineno}:{problem.col_offset + 1}: {problem.msg}"
+
+
+def _comma_separated(value: str) -> tuple[str, ...]:
+    """Parse an argument that is a comma separated list.
+
+    Args:
+        value: The value of the argument.
+
+    Returns:
+        The items, without surrounding whitespace and empty items.
+    """
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _jobs(value: str) -> int:
+    """Parse the jobs argument.
+
+    Args:
+        value: The value of the argument, auto or a number.
+
+    Returns:
+        The number of jobs.
+    """
+    return (os.cpu_count() or 1) if value == "auto" else int(value)
+
+
+def _write_problems(
+    results: Iterable[FileResult], changed: ChangedLines | None, format_: str, output: TextIO
+) -> ProblemTable:
+    """Write the problems of each file as soon as it has been checked.
+
+    Args:
+        results: The problems found in each file.
+        changed: The changed lines of each file, only problems on them are included, all problems
+            are included if it is None.
+        format_: One of FORMATS.
+        output: The stream to write the problems to.
+
+    Returns:
+        The problems that were written.
+    """
+    report = REPORTS[format_](output) if format_ in REPORTS else None
+    if report is not None:
+        report.start()
+    table = ProblemTable()
+    for result in results:
+        problems = [
+            problem
+            for problem in result.problems
+            if changed is None or in_ranges(problem.lineno, changed[result.path])
+        ]
+        if report is None:
+            for problem in problems:
+                output.write(format_problem(result.path, problem) + "\n")
+        else:
+            report.write(result.path, problems)
+        table.extend(result.path, problems)
+    if report is not None:
+        report.finish(table)
+    return table
+
+
+def _fix(paths: Sequence[str], jobs: int, write: bool, threads: bool) -> int:
+    """Fix the patch calls in files.
+
+    Args:
+        paths: The paths to the files to fix.
+        jobs: The number of workers.
+        write: Whether to write the fixed files rather than printing the diffs.
+        threads: Whether to use a pool of threads rather than processes.
+
+    Returns:
+        The exit code, 1 if the diffs were printed and any call could be fixed.
+    """
+    fixes = files = 0
+    for file_fix in fix_files(paths, jobs, write=write, threads=threads):
+        if file_fix.fixes:
+            fixes += file_fix.fixes
+            files += 1
+            sys.stdout.write(file_fix.diff)
+    action = "fixed" if write else "would fix"
+    print(f"{action} {fixes} calls in {files} files", file=sys.stderr)
+    return 0 if write or not fixes else 1
+
+
+def _write_baseline(
+    paths: Sequence[str], jobs: int, threads: bool, baseline_path: Path, options: CheckOptions
+) -> int:
+    """Accept the problems in files by writing their fingerprints to a baseline file.
+
+    Args:
+        paths: The paths to the files to check.
+        jobs: The number of workers.
+        threads: Whether to use a pool of threads rather than processes.
+        baseline_path: The baseline file to write.
+        options: The options of the checks, see check_source.
+
+    Returns:
+        The exit code, always 0.
+    """
+    check = partial(file_fingerprints, options=options)
+    fingerprints = parallel_map(check, paths, jobs, threads=threads)
+    count = write_baseline(baseline_path, itertools.chain.from_iterable(fingerprints))
+    print(f"accepted {count} problems in {baseline_path}", file=sys.stderr)
+    return 0
+
+
+def _print_counts(table: ProblemTable, statistics: bool, count: bool) -> None:
+    """Print the counts of the problems after the problems.
+
+    Args:
+        table: All the problems that were found.
+        statistics: Whether to print the number of problems of each message.
+        count: Whether to print the total number of problems.
+    """
+    if statistics:
+        for message, message_count in sorted(table.count_by_message().items()):
+            print(f"{message_count:<5} {message}")
+    if count:
+        print(len(table))
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Create the parser of the command line arguments.
+
+    Returns:
+        The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="flake8-mock-spec",
+        description="Check that mocks are constructed with the spec argument.",
+    )
+    parser.add_argument("paths", nargs="*", default=["."], help="files and directories to check")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_jobs,
+        default="auto",
+        help="number of workers, auto uses the number of CPUs",
+    )
+    parser.add_argument(
+        "--threads",
+        action="store_true",
+        help="use a pool of threads rather than processes, which avoids starting the processes "
+        "and is faster on free-threaded builds of Python",
+    )
+    parser.add_argument(
+        "--exclude",
+        type=lambda value: tuple(pattern.strip() for pattern in value.split(",")),
+        default=DEFAULT_EXCLUDE,
+        help=f"comma separated glob patterns to exclude (default: {','.join(DEFAULT_EXCLUDE)})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_DIRECTORY,
+        help=f"directory of the result cache (default: {DEFAULT_DIRECTORY})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="don't use the result cache")
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="number of least recently used files to keep in the cache",
+    )
+    parser.add_argument(
+        "--diff-base",
+        metavar="REF",
+        help="only check lines changed since the merge base with the git ref, e.g., origin/main, "
+        "including uncommitted changes and untracked files",
+    )
+    parser.add_argument(
+        "--statistics", action="store_true", help="print the number of problems of each code"
+    )
+    parser.add_argument("--count", action="store_true", help="print the total number of problems")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=FORMAT_DEFAULT,
+        help="default prints the problems in the flake8 format, jsonl writes a JSON object per "
+        "problem and sarif writes a SARIF log, both followed by the counts by code, directory and "
+        f"file (default: {FORMAT_DEFAULT})",
+    )
+    parser.add_argument(
+        "--output-file", type=Path, help="write the problems to a file rather than stdout"
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        type=Path,
+        help="don't report the problems accepted in the baseline file",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        metavar="FILE",
+        type=Path,
+        help="accept all the current problems by writing them to a baseline file, the problems "
+        "are identified by their code, file, call text and enclosing definitions rather than "
+        "their line",
+    )
+    parser.add_argument(
+        "--factories",
+        type=_comma_separated,
+        default=(),
+        help="comma separated additional mock factories to check, the same as the "
+        "--mock-spec-factories option of the flake8 plugin",
+    )
+    parser.add_argument(
+        "--target-roots",
+        type=_comma_separated,
+        default=(),
+        help="comma separated directories of the modules that spec and patch targets must exist "
+        "in, the same as the --mock-spec-target-roots option of the flake8 plugin, the result "
+        "cache is not used when the targets are checked (default: not checked)",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        help=f"stop checking a file after visiting this many nodes and report {BUDGET_CODE}",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        help=f"stop checking a file after this many seconds and report {BUDGET_CODE}, the time "
+        "the file takes to parse is not included",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="add autospec=True to the patch and patch.object calls without a spec argument",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="with --fix, print the fixes as a unified diff rather than writing the files",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the checker on files.
+
+    Args:
+        argv: The command line arguments.
+
+    Returns:
+        The exit code, 1 if any problems were found.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.diff and not args.fix:
+        parser.error("--diff requires --fix")
+    if args.write_baseline is not None and (args.fix or args.diff_base is not None):
+        parser.error("--write-baseline can't be combined with --fix or --diff-base")
+    cache_directory = None if args.no_cache else args.cache_dir
+    try:
+        _registry(args.factories)
+    except ValueError as exc:
+        parser.error(str(exc))
+    options = CheckOptions(
+        factories=args.factories,
+        target_roots=args.target_roots,
+        target_cache_dir=str(args.cache_dir),
+    )
+    budget = (
+        None
+        if args.max_nodes is None and args.max_seconds is None
+        else Budget(args.max_nodes, args.max_seconds)
+    )
+
+    changed: ChangedLines | None = None
+    if args.diff_base is None:
+        paths = discover(args.paths, args.exclude)
+    else:
+        try:
+            changed = changed_lines(args.diff_base)
+        except GitError as exc:
+            parser.error(str(exc))
+        paths = discover_changed(changed, args.paths, args.exclude)
+    if args.fix:
+        return _fix(paths, args.jobs, write=not args.diff, threads=args.threads)
+    if args.write_baseline is not None:
+        return _write_baseline(
+            paths, args.jobs, args.threads, baseline_path=args.write_baseline, options=options
+        )
+
+    output = (
+        sys.stdout
+        if args.output_file is None
+        else args.output_file.open("w", encoding="utf-8", newline="\n")
+    )
+    results = check_files(
+        paths,
+        jobs=args.jobs,
+        cache_directory=cache_directory,
+        threads=args.threads,
+        baseline_path=args.baseline,
+        budget=budget,
+        options=options,
+    )
+    try:
+        table = _write_problems(results, changed, args.format, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    _print_counts(table, statistics=args.statistics, count=args.count)
+    if cache_directory is not None:
+        get_cache(cache_directory, max_entries=args.cache_max_entries).evict()
+    return 1 if table else 0
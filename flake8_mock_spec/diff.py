@@ -0,0 +1,122 @@
+"""Find the lines changed relative to a git ref so that only those are checked."""
+
+from __future__ import annotations
+
+import bisect
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# A range of changed lines, first and last line inclusive
+LineRange = Tuple[int, int]
+ChangedLines = Dict[str, List[LineRange]]
+# The range of an untracked file, all of its lines are new
+ALL_LINES: LineRange = (1, sys.maxsize)
+
+_FILE_PATTERN = re.compile(r"^\+\+\+ (?:b/(?P<path>.*)|/dev/null)$")
+_HUNK_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(?P<start>\d+)(?:,(?P<count>\d+))? @@")
+
+
+class GitError(Exception):
+    """Raised when git fails."""
+
+
+def _git(*args: str, cwd: Path | None = None) -> str:
+    """Run a git command.
+
+    Args:
+        args: The arguments to git.
+        cwd: The directory to run the command in.
+
+    Returns:
+        The output of the command.
+
+    Raises:
+        GitError: if git is not installed or the command failed.
+    """
+    try:
+        process = subprocess.run(
+            ("git", "-c", "core.quotePath=false", *args),
+            cwd=cwd,
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+    except FileNotFoundError as exc:
+        raise GitError("git is not installed") from exc
+    if process.returncode != 0:
+        raise GitError(f"git {' '.join(args)} failed: {process.stderr.strip()}")
+    return process.stdout
+
+
+def parse_diff(diff: str) -> ChangedLines:
+    """Parse the changed lines from the output of git diff with no context lines.
+
+    Args:
+        diff: The output of git diff --unified=0.
+
+    Returns:
+        The ranges of added or modified lines by path, deleted files and files with only deleted
+        lines are not included.
+    """
+    changed: ChangedLines = {}
+    ranges: list[LineRange] | None = None
+    for line in diff.splitlines():
+        if (file_match := _FILE_PATTERN.match(line)) is not None:
+            path = file_match.group("path")
+            ranges = None if path is None else changed.setdefault(path, [])
+            continue
+        if ranges is None or (hunk_match := _HUNK_PATTERN.match(line)) is None:
+            continue
+        start = int(hunk_match.group("start"))
+        count = int(hunk_match.group("count") or 1)
+        if count:
+            ranges.append((start, start + count - 1))
+    return {path: sorted(ranges) for path, ranges in changed.items() if ranges}
+
+
+def changed_lines(base: str, cwd: Path | None = None) -> ChangedLines:
+    """Find the lines of Python files that changed since the merge base with a ref.
+
+    Both committed and uncommitted changes in the working tree are included. Untracked files
+    that are not ignored are included with all of their lines.
+
+    Args:
+        base: The ref to compare against, e.g., origin/main.
+        cwd: The directory within the repository, paths are relative to it.
+
+    Returns:
+        The ranges of added or modified lines by path.
+    """
+    merge_base = _git("merge-base", base, "HEAD", cwd=cwd).strip()
+    diff = _git(
+        "diff",
+        "--unified=0",
+        "--no-color",
+        "--no-ext-diff",
+        "--relative",
+        merge_base,
+        "--",
+        "*.py",
+        cwd=cwd,
+    )
+    changed = parse_diff(diff)
+    untracked = _git("ls-files", "--others", "--exclude-standard", "--", "*.py", cwd=cwd)
+    changed.update((path, [ALL_LINES]) for path in untracked.splitlines() if path)
+    return changed
+
+
+def in_ranges(lineno: int, ranges: list[LineRange]) -> bool:
+    """Check whether a line is in any of the sorted ranges.
+
+    Args:
+        lineno: The line number.
+        ranges: The sorted ranges.
+
+    Returns:
+        Whether the line is in a range.
+    """
+    index = bisect.bisect_right(ranges, (lineno, float("inf"))) - 1
+    return index >= 0 and ranges[index][0] <= lineno <= ranges[index][1]
@@ -0,0 +1,266 @@
+"""Adds autospec=True to the patch and patch.object calls that are missing a spec argument.
+
+The fixes are inserted at the byte offsets of the calls found in the AST, the rest of the file is
+left exactly as it was.
+"""
+
+from __future__ import annotations
+
+import ast
+import difflib
+import io
+import tokenize
+from functools import partial
+from pathlib import Path
+from typing import Iterator, NamedTuple, Sequence
+
+from . import (
+    PATCH_FUNCTION,
+    PATCH_MSG,
+    PATCH_OBJECT_MSG,
+    _check_call,
+    _iter_calls,
+    build_import_index,
+)
+from .shared import is_suppressed, may_have_problems, parallel_map
+
+FIX_ARGUMENT = "autospec=True"
+# The number of positional arguments before the new argument of each fixable call, autospec
+# can't be combined with new
+_TARGET_ARGS = {PATCH_MSG: 1, PATCH_OBJECT_MSG: 2}
+# Keywords that autospec can't be combined with, patch raises TypeError for autospec with create
+_CONFLICTING_KEYWORDS = frozenset(("create",))
+_UTF_8 = "utf-8"
+
+
+class Insertion(NamedTuple):
+    """Text to insert into a file.
+
+    Attrs:
+        offset: The byte offset in the UTF-8 source to insert at.
+        text: The text to insert.
+    """
+
+    offset: int
+    text: bytes
+
+
+class FileFix(NamedTuple):
+    """The fixes made to a file.
+
+    Attrs:
+        path: The path to the file.
+        fixes: The number of calls that were fixed.
+        diff: The unified diff of the fixes, empty if the file was written or nothing was fixed.
+    """
+
+    path: str
+    fixes: int
+    diff: str
+
+
+def _line_offsets(source: bytes) -> list[int]:
+    """Calculate the byte offset of the start of each line.
+
+    Args:
+        source: The source, split into lines the same way as the parser does.
+
+    Returns:
+        The offset of each line, the first line is at index 1 to match ast line numbers.
+    """
+    offsets = [0, 0]
+    for line in source.splitlines(keepends=True):
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def _skip_closing_parentheses(source: bytes, offset: int) -> int:
+    """Skip the parentheses that close a parenthesized argument, e.g., the ) after ("a".
+
+    Args:
+        source: The source.
+        offset: The offset of the end of the argument.
+
+    Returns:
+        The offset after the last closing parenthesis of the argument.
+    """
+    end = offset
+    position = offset
+    while position < len(source):
+        character = source[position : position + 1]
+        if character == b"#":
+            while position < len(source) and source[position : position + 1] not in b"\r\n":
+                position += 1
+        elif character == b")":
+            position += 1
+            end = position
+        elif character.isspace() or character == b"\\":
+            position += 1
+        else:
+            break
+    return end
+
+
+def _insertion(call: ast.Call, source: bytes, offsets: Sequence[int]) -> Insertion:
+    """Calculate where to add the argument to a call.
+
+    The argument is added after the last argument so that trailing commas and the layout of
+    multi-line calls are kept, fixable calls always have at least the target argument.
+
+    Args:
+        call: The call.
+        source: The UTF-8 source.
+        offsets: The byte offset of the start of each line.
+
+    Returns:
+        The insertion.
+    """
+    # Keywords end with their value, the value also has a position before Python 3.9
+    arguments = [*call.args, *(keyword.value for keyword in call.keywords)]
+    last = max(
+        arguments,
+        key=lambda argument: (
+            argument.end_lineno or argument.lineno,
+            argument.end_col_offset or 0,
+        ),
+    )
+    offset = offsets[last.end_lineno or last.lineno] + (last.end_col_offset or 0)
+    call_end = offsets[call.end_lineno or call.lineno] + (call.end_col_offset or 0)
+    # The closing parenthesis of the call itself is never skipped
+    offset = min(_skip_closing_parentheses(source, offset), call_end - 1)
+    return Insertion(offset, f", {FIX_ARGUMENT}".encode())
+
+
+def find_insertions(source: bytes, tree: ast.AST) -> list[Insertion]:
+    """Find the fixable calls in a module.
+
+    Calls whose problem is suppressed by a noqa comment, that pass the new argument positionally,
+    that pass create, which can't be combined with autospec, or that pass ** arguments, which
+    might include autospec, are not fixed.
+
+    Args:
+        source: The UTF-8 source of the module.
+        tree: The tree of the module.
+
+    Returns:
+        The insertions ordered by their offset.
+    """
+    index = build_import_index(tree)
+    if not index.has_providers:
+        return []
+    offsets = _line_offsets(source)
+    lines = source.splitlines()
+    insertions = []
+    for call in _iter_calls(tree):
+        problem = _check_call(call, index)
+        if problem is None or (target_args := _TARGET_ARGS.get(problem.msg)) is None:
+            continue
+        if len(call.args) != target_args or any(
+            isinstance(argument, ast.Starred) for argument in call.args
+        ):
+            continue
+        if any(
+            keyword.arg is None or keyword.arg in _CONFLICTING_KEYWORDS
+            for keyword in call.keywords
+        ):
+            continue
+        if is_suppressed(lines[problem.lineno - 1].decode(_UTF_8), problem):
+            continue
+        insertions.append(_insertion(call, source, offsets))
+    return sorted(insertions)
+
+
+def apply_insertions(source: bytes, insertions: Sequence[Insertion]) -> bytes:
+    """Insert text into the source.
+
+    Args:
+        source: The source.
+        insertions: The insertions ordered by their offset.
+
+    Returns:
+        The source with the text inserted.
+    """
+    parts = []
+    start = 0
+    for insertion in insertions:
+        parts.append(source[start : insertion.offset])
+        parts.append(insertion.text)
+        start = insertion.offset
+    parts.append(source[start:])
+    return b"".join(parts)
+
+
+def fix_source(source: bytes) -> tuple[bytes, int]:
+    """Add autospec=True to the patch and patch.object calls without a spec argument.
+
+    Args:
+        source: The content of the file.
+
+    Returns:
+        The fixed content and the number of calls that were fixed, the content is unchanged if it
+        can't be parsed.
+    """
+    if not may_have_problems(source) or PATCH_FUNCTION.encode() not in source:
+        return source, 0
+
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+        # The AST offsets are in UTF-8 bytes, other encodings are converted and back
+        utf_8_source = source if encoding == _UTF_8 else source.decode(encoding).encode(_UTF_8)
+        tree = ast.parse(utf_8_source.decode(_UTF_8))
+    except (SyntaxError, ValueError, RecursionError):
+        return source, 0
+
+    if not (insertions := find_insertions(utf_8_source, tree)):
+        return source, 0
+    fixed = apply_insertions(utf_8_source, insertions)
+    if encoding != _UTF_8:
+        fixed = fixed.decode(_UTF_8).encode(encoding)
+    return fixed, len(insertions)
+
+
+def fix_file(path: str, write: bool = True) -> FileFix:
+    """Fix a file.
+
+    Args:
+        path: The path to the file.
+        write: Whether to write the fixed file rather than calculating the diff.
+
+    Returns:
+        The fixes made to the file.
+    """
+    file = Path(path)
+    source = file.read_bytes()
+    fixed, fixes = fix_source(source)
+    if not fixes:
+        return FileFix(path=path, fixes=0, diff="")
+    if write:
+        file.write_bytes(fixed)
+        return FileFix(path=path, fixes=fixes, diff="")
+
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+    # The bytes are split since str.splitlines also breaks lines on characters like form feeds
+    diff = difflib.unified_diff(
+        [line.decode(encoding) for line in source.splitlines(keepends=True)],
+        [line.decode(encoding) for line in fixed.splitlines(keepends=True)],
+        fromfile=path,
+        tofile=path,
+    )
+    return FileFix(path=path, fixes=fixes, diff="".join(diff))
+
+
+def fix_files(
+    paths: Sequence[str], jobs: int, write: bool = True, threads: bool = False
+) -> Iterator[FileFix]:
+    """Fix files, in parallel if more than one job is requested.
+
+    Args:
+        paths: The paths to the files to fix.
+        jobs: The number of workers.
+        write: Whether to write the fixed files rather than calculating the diffs.
+        threads: Whether to use a pool of threads rather than processes.
+
+    Yields:
+        The fixes made to each file in the same order as the paths.
+    """
+    yield from parallel_map(partial(fix_file, write=write), paths, jobs, threads=threads)
@@ -0,0 +1,382 @@
+"""Language server that publishes the problems of open documents as diagnostics.
+
+Only the top level statements (e.g., functions and classes) whose source changed are checked
+again when a document changes, the problems of the other statements are reused.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import re
+import sys
+from typing import Any, BinaryIO, Callable, Dict, List, NamedTuple, Tuple
+
+from . import ImportIndex, Problem, _iter_index_problems, build_import_index
+from .shared import is_suppressed
+
+SOURCE = "flake8-mock-spec"
+# The LSP constants used by the server
+TEXT_DOCUMENT_SYNC_FULL = 1
+SEVERITY_WARNING = 2
+METHOD_NOT_FOUND = -32601
+_HEADER_LENGTH = b"content-length"
+# The line breaks of the tokenizer, str.splitlines also splits on characters such as \x0c
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+# The source of a statement and its first and last column, identical statements have the same
+# problems relative to their first line
+SegmentKey = Tuple[str, int, int]
+# The problems of a statement with the line numbers relative to its first line
+SegmentProblems = List[Problem]
+Message = Dict[str, Any]
+
+
+class _Segment(NamedTuple):
+    """A top level statement of a module.
+
+    Attrs:
+        key: Identifies the source of the statement.
+        first_lineno: The first line of the statement, including any decorators.
+        node: The statement.
+    """
+
+    key: SegmentKey
+    first_lineno: int
+    node: ast.stmt
+
+
+def _segments(tree: ast.Module, lines: list[str]) -> list[_Segment]:
+    """Split a module into its top level statements.
+
+    Args:
+        tree: The tree of the module.
+        lines: The lines of the module.
+
+    Returns:
+        The statements with the source that identifies them.
+    """
+    segments = []
+    for node in tree.body:
+        decorators = getattr(node, "decorator_list", ())
+        first_lineno = min((node.lineno, *(decorator.lineno for decorator in decorators)))
+        end_lineno = node.end_lineno or node.lineno
+        source = "\n".join(lines[first_lineno - 1 : end_lineno])
+        key = (source, node.col_offset, node.end_col_offset or 0)
+        segments.append(_Segment(key=key, first_lineno=first_lineno, node=node))
+    return segments
+
+
+class Document:
+    """An open document and the problems of its top level statements.
+
+    Attrs:
+        source: The source of the document.
+        lines: The lines of the source of the document.
+        problems: The problems found in the document, suppressed problems are not included.
+        checked: The number of top level statements that were checked by the last update.
+    """
+
+    # The state of the document is only changed through update
+    # pylint: disable=too-few-public-methods
+
+    source: str
+    lines: list[str]
+    problems: list[Problem]
+    checked: int
+
+    def __init__(self) -> None:
+        """Construct."""
+        self.source = ""
+        self.lines = []
+        self.problems = []
+        self.checked = 0
+        self._index: ImportIndex | None = None
+        self._segments: dict[SegmentKey, SegmentProblems] = {}
+
+    def update(self, source: str) -> bool:
+        """Check the new source of the document, reusing the problems of unchanged statements.
+
+        All the statements are checked again if the imports of the mock providers changed.
+
+        Args:
+            source: The new source of the document.
+
+        Returns:
+            Whether the problems were updated, they are not if the source can't be parsed.
+        """
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError, RecursionError):
+            return False
+
+        index = build_import_index(tree)
+        if self._index is None or (index.aliases, index.star_provider) != (
+            self._index.aliases,
+            self._index.star_provider,
+        ):
+            self._index = index
+            self._segments = {}
+
+        lines = _split_lines(source)
+        segments: dict[SegmentKey, SegmentProblems] = {}
+        problems: list[Problem] = []
+        self.checked = 0
+        for segment in _segments(tree, lines):
+            if (relative := segments.get(segment.key, self._segments.get(segment.key))) is None:
+                self.checked += 1
+                relative = [
+                    problem._replace(lineno=problem.lineno - segment.first_lineno)
+                    for problem in _iter_index_problems(segment.node, self._index)
+                ]
+            segments[segment.key] = relative
+            problems.extend(
+                problem._replace(lineno=problem.lineno + segment.first_lineno)
+                for problem in relative
+            )
+
+        self.source = source
+        self.lines = lines
+        self._segments = segments
+        self.problems = [
+            problem
+            for problem in problems
+            if not is_suppressed(lines[problem.lineno - 1], problem)
+        ]
+        return True
+
+
+def _split_lines(source: str) -> list[str]:
+    """Split the source into lines numbered the same way as by ast.
+
+    Args:
+        source: The source of the document.
+
+    Returns:
+        The lines without their line breaks.
+    """
+    lines = _LINE_BREAK.split(source)
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _utf16_column(line: str, col_offset: int) -> int:
+    """Convert a column in UTF-8 bytes to UTF-16 code units as used by LSP.
+
+    Args:
+        line: The line the column is on.
+        col_offset: The UTF-8 byte offset reported by ast.
+
+    Returns:
+        The UTF-16 offset.
+    """
+    prefix = line.encode("utf-8")[:col_offset].decode("utf-8", errors="ignore")
+    return len(prefix.encode("utf-16-le")) // 2
+
+
+def to_diagnostic(problem: Problem, lines: list[str]) -> Message:
+    """Convert a problem to an LSP diagnostic that covers the rest of the line.
+
+    Args:
+        problem: The problem.
+        lines: The lines of the document.
+
+    Returns:
+        The diagnostic.
+    """
+    line = lines[problem.lineno - 1]
+    code, message = problem.msg.split(maxsplit=1)
+    return {
+        "range": {
+            "start": {
+                "line": problem.lineno - 1,
+                "character": _utf16_column(line, problem.col_offset),
+            },
+            "end": {"line": problem.lineno - 1, "character": len(line.encode("utf-16-le")) // 2},
+        },
+        "severity": SEVERITY_WARNING,
+        "code": code,
+        "source": SOURCE,
+        "message": message,
+    }
+
+
+def read_message(stream: BinaryIO) -> Message | None:
+    """Read a message framed with a Content-Length header.
+
+    Args:
+        stream: The stream to read from.
+
+    Returns:
+        The message or None if the stream ended.
+    """
+    length = None
+    while (line := stream.readline()) not in (b"\r\n", b"\n"):
+        if not line:
+            return None
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == _HEADER_LENGTH:
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(stream.read(length))
+
+
+def write_message(stream: BinaryIO, message: Message) -> None:
+    """Write a message framed with a Content-Length header.
+
+    Args:
+        stream: The stream to write to.
+        message: The message.
+    """
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+    stream.flush()
+
+
+class Server:
+    """Language server that keeps the state of the open documents.
+
+    Attrs:
+        documents: The open documents by URI.
+    """
+
+    # The messages are handled through serve
+    # pylint: disable=too-few-public-methods
+
+    documents: dict[str, Document]
+
+    def __init__(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        """Construct.
+
+        Args:
+            reader: The stream the client writes messages to.
+            writer: The stream the client reads messages from.
+        """
+        self.documents = {}
+        self._reader = reader
+        self._writer = writer
+        self._shutdown = False
+        self._handlers: dict[str, Callable[[Any], Any]] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown_request,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+        }
+
+    def serve(self) -> int:
+        """Handle messages until the client exits.
+
+        Returns:
+            The exit code, 0 if the client requested a shutdown before exiting.
+        """
+        while (message := read_message(self._reader)) is not None:
+            method = message.get("method")
+            if method == "exit":
+                break
+            handler = self._handlers.get(method or "")
+            if "id" not in message:
+                # Unknown notifications, e.g., initialized, are ignored
+                if handler is not None:
+                    handler(message.get("params"))
+                continue
+            if handler is None:
+                response = {
+                    "error": {"code": METHOD_NOT_FOUND, "message": f"unknown method {method}"}
+                }
+            else:
+                response = {"result": handler(message.get("params"))}
+            write_message(self._writer, {"jsonrpc": "2.0", "id": message["id"], **response})
+        return 0 if self._shutdown else 1
+
+    def _initialize(self, _: Message) -> Message:
+        """Describe the capabilities of the server.
+
+        Returns:
+            The result of the initialize request.
+        """
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": TEXT_DOCUMENT_SYNC_FULL}
+            },
+            "serverInfo": {"name": SOURCE},
+        }
+
+    def _shutdown_request(self, _: Message) -> None:
+        """Record that the client requested a shutdown."""
+        self._shutdown = True
+
+    def _did_open(self, params: Message) -> None:
+        """Check a document that was opened.
+
+        Args:
+            params: The parameters of the notification.
+        """
+        text_document = params["textDocument"]
+        self.documents[text_document["uri"]] = Document()
+        self._update(text_document["uri"], text_document.get("version"), text_document["text"])
+
+    def _did_change(self, params: Message) -> None:
+        """Check a document that was changed.
+
+        Args:
+            params: The parameters of the notification, the last change has the full text.
+        """
+        text_document = params["textDocument"]
+        if text_document["uri"] not in self.documents or not params["contentChanges"]:
+            return
+        text = params["contentChanges"][-1]["text"]
+        self._update(text_document["uri"], text_document.get("version"), text)
+
+    def _did_close(self, params: Message) -> None:
+        """Forget a document that was closed and clear its diagnostics.
+
+        Args:
+            params: The parameters of the notification.
+        """
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self._publish(uri, None, [])
+
+    def _update(self, uri: str, version: int | None, source: str) -> None:
+        """Check the new source of a document and publish the diagnostics if they changed.
+
+        Args:
+            uri: The URI of the document.
+            version: The version of the document.
+            source: The new source of the document.
+        """
+        document = self.documents[uri]
+        if document.update(source):
+            self._publish(
+                uri,
+                version,
+                [to_diagnostic(problem, document.lines) for problem in document.problems],
+            )
+
+    def _publish(self, uri: str, version: int | None, diagnostics: list[Message]) -> None:
+        """Send the diagnostics of a document to the client.
+
+        Args:
+            uri: The URI of the document.
+            version: The version of the document.
+            diagnostics: The diagnostics.
+        """
+        params: Message = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        write_message(
+            self._writer,
+            {"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics", "params": params},
+        )
+
+
+def main() -> int:
+    """Run the language server on the standard input and output.
+
+    Returns:
+        The exit code.
+    """
+    return Server(sys.stdin.buffer, sys.stdout.buffer).serve()
@@ -0,0 +1,173 @@
+"""Compact storage for large numbers of problems across many files."""
+
+from __future__ import annotations
+
+import posixpath
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator, Tuple
+
+from . import MOCK_MSG_LOOKUP, PATCH_MSG_LOOKUP, Problem
+
+# The messages of the rules, the position in the tuple is the id of the rule
+RULE_MESSAGES: Tuple[str, ...] = (*MOCK_MSG_LOOKUP.values(), *PATCH_MSG_LOOKUP.values())
+
+
+def _intern(lookup: dict[str, int], values: list[str], value: str) -> int:
+    """Retrieve the id of a value, adding it if it is new.
+
+    Args:
+        lookup: The ids of the values.
+        values: The values in the order of their id.
+        value: The value to get the id of.
+
+    Returns:
+        The id of the value.
+    """
+    if (value_id := lookup.get(value)) is None:
+        value_id = lookup[value] = len(values)
+        values.append(value)
+    return value_id
+
+
+class ProblemTable:
+    """Stores problems in parallel arrays of the path, line, column and rule.
+
+    Messages are stored once per rule and materialized when the problems are read, messages that
+    are not one of the rules (e.g., syntax errors) are stored once per distinct message.
+
+    Attrs:
+        paths: The distinct paths of the files with problems in the order they were added.
+        messages: The distinct messages, starting with the messages of the rules.
+        path_ids: The index into paths of each problem.
+        linenos: The line of each problem.
+        col_offsets: The column of each problem.
+        message_ids: The index into messages of each problem.
+        nbytes: The number of bytes used by the columns of the table.
+    """
+
+    # Each column is an attribute along with the lookups of the distinct values
+    # pylint: disable=too-many-instance-attributes
+
+    paths: list[str]
+    messages: list[str]
+    path_ids: array[int]
+    linenos: array[int]
+    col_offsets: array[int]
+    message_ids: array[int]
+
+    def __init__(self) -> None:
+        """Construct."""
+        self.paths = []
+        self.messages = list(RULE_MESSAGES)
+        self.path_ids = array("i")
+        self.linenos = array("i")
+        self.col_offsets = array("i")
+        self.message_ids = array("i")
+        self._path_lookup: dict[str, int] = {}
+        self._message_lookup = {message: index for index, message in enumerate(self.messages)}
+
+    def append(self, path: str, problem: Problem) -> None:
+        """Add a problem.
+
+        Args:
+            path: The path to the file the problem was found in.
+            problem: The problem.
+        """
+        self.extend(path, (problem,))
+
+    def extend(self, path: str, problems: Iterable[Problem]) -> None:
+        """Add the problems found in a file.
+
+        Args:
+            path: The path to the file the problems were found in.
+            problems: The problems.
+        """
+        path_id: int | None = None
+        for problem in problems:
+            if path_id is None:
+                path_id = _intern(self._path_lookup, self.paths, path)
+            self.path_ids.append(path_id)
+            self.linenos.append(problem.lineno)
+            self.col_offsets.append(problem.col_offset)
+            self.message_ids.append(_intern(self._message_lookup, self.messages, problem.msg))
+
+    def __len__(self) -> int:
+        """Count the problems.
+
+        Returns:
+            The number of problems.
+        """
+        return len(self.linenos)
+
+    def __iter__(self) -> Iterator[tuple[str, Problem]]:
+        """Read the problems in the order they were added.
+
+        Yields:
+            The path to the file and the problem.
+        """
+        paths, messages = self.paths, self.messages
+        for path_id, lineno, col_offset, message_id in zip(
+            self.path_ids, self.linenos, self.col_offsets, self.message_ids
+        ):
+            yield paths[path_id], Problem(lineno, col_offset, messages[message_id])
+
+    def count_by_message(self) -> Counter[str]:
+        """Count the problems for each distinct message.
+
+        Returns:
+            The number of problems by message.
+        """
+        return Counter(
+            {
+                self.messages[message_id]: count
+                for message_id, count in Counter(self.message_ids).items()
+            }
+        )
+
+    def count_by_code(self) -> Counter[str]:
+        """Count the problems for each code, e.g., TMS010.
+
+        Returns:
+            The number of problems by code.
+        """
+        counts: Counter[str] = Counter()
+        for message, count in self.count_by_message().items():
+            counts[message.split(maxsplit=1)[0]] += count
+        return counts
+
+    def count_by_path(self) -> Counter[str]:
+        """Count the problems for each file.
+
+        Returns:
+            The number of problems by path.
+        """
+        return Counter(
+            {self.paths[path_id]: count for path_id, count in Counter(self.path_ids).items()}
+        )
+
+    def count_by_directory(self) -> Counter[str]:
+        """Count the problems in each directory including the problems in its subdirectories.
+
+        Returns:
+            The number of problems by directory, files without a directory count towards ".".
+        """
+        counts: Counter[str] = Counter()
+        for path, count in self.count_by_path().items():
+            directory = posixpath.dirname(path.replace("\\", "/"))
+            if not directory:
+                counts["."] += count
+            while directory:
+                counts[directory] += count
+                if (parent := posixpath.dirname(directory)) == directory:
+                    break
+                directory = parent
+        return counts
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the columns of the table."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.path_ids, self.linenos, self.col_offsets, self.message_ids)
+        )
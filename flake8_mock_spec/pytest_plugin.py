@@ -0,0 +1,104 @@
+"""pytest plugin that checks the test modules while they are collected.
+
+The plugin is disabled by default, enable it using --mock-spec=warn or --mock-spec=error or the
+mock_spec ini option.
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Any, Generator
+
+import pytest
+
+MODE_OFF = "off"
+MODE_WARN = "warn"
+MODE_ERROR = "error"
+MODES = (MODE_OFF, MODE_WARN, MODE_ERROR)
+
+
+class MockSpecWarning(UserWarning):
+    """A mock or patch call in a test module is missing the spec argument."""
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register the options of the plugin.
+
+    Args:
+        parser: The pytest argument parser.
+    """
+    help_ = (
+        "check test modules for mocks constructed without the spec argument while they are "
+        "collected, warn reports problems as warnings and error fails the collection of the module"
+    )
+    parser.getgroup("mock-spec").addoption(
+        "--mock-spec", choices=MODES, default=None, help=f"{help_} (default: {MODE_OFF})"
+    )
+    parser.addini("mock_spec", help=help_, default=MODE_OFF)
+
+
+def _mode(config: pytest.Config) -> str:
+    """Read the mode of the plugin.
+
+    Args:
+        config: The pytest configuration.
+
+    Returns:
+        One of MODES.
+
+    Raises:
+        UsageError: If the ini option isn't one of MODES.
+    """
+    mode = config.getoption("mock_spec") or config.getini("mock_spec")
+    if mode not in MODES:
+        raise pytest.UsageError(f"mock_spec must be one of {', '.join(MODES)}, got {mode!r}")
+    return mode
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(
+    collector: pytest.Collector,
+) -> Generator[None, Any, None]:
+    """Check a test module once pytest has collected it.
+
+    Control is passed to the other implementations of the hook before the check so that the
+    report can be updated. Files that don't mention any of the mock classes or patch are not
+    parsed. Syntax errors are left for pytest to report.
+
+    Args:
+        collector: The collector being run.
+    """
+    outcome = yield
+    if not isinstance(collector, pytest.Module) or (mode := _mode(collector.config)) == MODE_OFF:
+        return
+    # Only imported when enabled since the command imports modules that most runs don't need
+    from .cli import (  # pylint: disable=import-outside-toplevel
+        SYNTAX_ERROR_CODE,
+        check_source,
+        format_problem,
+    )
+
+    problems = [
+        problem
+        for problem in check_source(collector.path.read_bytes())
+        if not problem.msg.startswith(SYNTAX_ERROR_CODE)
+    ]
+    if not problems:
+        return
+
+    if mode == MODE_ERROR:
+        report = outcome.get_result()
+        if report.passed:
+            report.outcome = "failed"
+            report.longrepr = "\n".join(
+                format_problem(str(collector.path), problem) for problem in problems
+            )
+            report.result = []
+        return
+    for problem in problems:
+        warnings.warn_explicit(
+            MockSpecWarning(problem.msg),
+            category=MockSpecWarning,
+            filename=str(collector.path),
+            lineno=problem.lineno,
+        )
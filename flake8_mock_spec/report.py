@@ -0,0 +1,193 @@
+"""Machine readable reports that are written while the files are checked.
+
+Each problem is written as soon as the problems of its file are known and the aggregated counts
+are written once all the files have been checked, so the problems are never held in memory as
+objects.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+from pathlib import PurePath
+from typing import Any, Dict, Sequence, TextIO, Type
+
+from . import MORE_INFO_BASE, Problem
+from .problems import RULE_MESSAGES, ProblemTable
+
+FORMAT_DEFAULT = "default"
+FORMAT_JSON_LINES = "jsonl"
+FORMAT_SARIF = "sarif"
+FORMATS = (FORMAT_DEFAULT, FORMAT_JSON_LINES, FORMAT_SARIF)
+SUMMARY_KEY = "summary"
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "flake8-mock-spec"
+_MORE_INFO_LABEL, _, INFORMATION_URI = MORE_INFO_BASE.partition(": ")
+
+Record = Dict[str, Any]
+
+
+def summarize(table: ProblemTable) -> Record:
+    """Aggregate the problems.
+
+    Args:
+        table: The problems.
+
+    Returns:
+        The total number of problems and the number of problems by code, by directory including
+        its subdirectories and by file, each sorted by their key.
+    """
+    return {
+        "total": len(table),
+        "by_code": dict(sorted(table.count_by_code().items())),
+        "by_directory": dict(sorted(table.count_by_directory().items())),
+        "by_file": dict(sorted(table.count_by_path().items())),
+    }
+
+
+def _split_msg(msg: str) -> tuple[str, str]:
+    """Split a message into its code and its description.
+
+    Args:
+        msg: The message, e.g., TMS010 unittest.mock.Mock instances should ...
+
+    Returns:
+        The code and the rest of the message.
+    """
+    code, message = msg.split(maxsplit=1)
+    return code, message
+
+
+class Report(abc.ABC):
+    """Writes the problems of each file as they are found followed by the aggregated counts."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Construct.
+
+        Args:
+            stream: The stream to write to.
+        """
+        self._stream = stream
+
+    def start(self) -> None:
+        """Write the start of the report before any problems."""
+
+    @abc.abstractmethod
+    def write(self, path: str, problems: Sequence[Problem]) -> None:
+        """Write the problems found in a file.
+
+        Args:
+            path: The path to the file.
+            problems: The problems.
+        """
+
+    @abc.abstractmethod
+    def finish(self, table: ProblemTable) -> None:
+        """Write the aggregated counts and the end of the report.
+
+        Args:
+            table: All the problems that were written.
+        """
+
+
+class JsonLinesReport(Report):
+    """Writes a JSON object per problem followed by a summary object."""
+
+    def write(self, path: str, problems: Sequence[Problem]) -> None:
+        """Write the problems found in a file.
+
+        Args:
+            path: The path to the file.
+            problems: The problems.
+        """
+        for problem in problems:
+            code, message = _split_msg(problem.msg)
+            record = {
+                "path": path,
+                "lineno": problem.lineno,
+                "col_offset": problem.col_offset,
+                "code": code,
+                "message": message,
+            }
+            self._stream.write(json.dumps(record) + "\n")
+
+    def finish(self, table: ProblemTable) -> None:
+        """Write the summary.
+
+        Args:
+            table: All the problems that were written.
+        """
+        self._stream.write(json.dumps({SUMMARY_KEY: summarize(table)}) + "\n")
+
+
+class SarifReport(Report):
+    """Writes a SARIF log with a single run whose results are written as they are found.
+
+    The aggregated counts are stored in the properties of the run.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Construct.
+
+        Args:
+            stream: The stream to write to.
+        """
+        super().__init__(stream)
+        self._separator = ""
+
+    def start(self) -> None:
+        """Write the log up to the start of the results."""
+        rules = []
+        for msg in RULE_MESSAGES:
+            code, message = _split_msg(msg)
+            description, _, help_uri = message.partition(f", {_MORE_INFO_LABEL}: ")
+            rules.append(
+                {"id": code, "shortDescription": {"text": description}, "helpUri": help_uri}
+            )
+        driver = {"name": TOOL_NAME, "informationUri": INFORMATION_URI, "rules": rules}
+        header = json.dumps({"$schema": SARIF_SCHEMA, "version": SARIF_VERSION})
+        tool = json.dumps({"driver": driver})
+        self._stream.write(f'{header[:-1]}, "runs": [{{"tool": {tool}, "results": [')
+
+    def write(self, path: str, problems: Sequence[Problem]) -> None:
+        """Write the problems found in a file as results.
+
+        The results locate the line of each problem, the column is only included in the
+        properties since it is counted in UTF-8 bytes rather than the characters SARIF uses.
+
+        Args:
+            path: The path to the file.
+            problems: The problems.
+        """
+        uri = PurePath(path).as_posix()
+        for problem in problems:
+            code, message = _split_msg(problem.msg)
+            result = {
+                "ruleId": code,
+                "level": "warning",
+                "message": {"text": message},
+                "locations": [
+                    {
+                        "physicalLocation": {
+                            "artifactLocation": {"uri": uri},
+                            "region": {"startLine": problem.lineno},
+                        }
+                    }
+                ],
+                "properties": {"col_offset": problem.col_offset},
+            }
+            self._stream.write(self._separator + json.dumps(result))
+            self._separator = ", "
+
+    def finish(self, table: ProblemTable) -> None:
+        """Write the aggregated counts and close the log.
+
+        Args:
+            table: All the problems that were written.
+        """
+        properties = json.dumps({SUMMARY_KEY: summarize(table)})
+        self._stream.write(f'], "properties": {properties}}}]}}\n')
+
+
+REPORTS: Dict[str, Type[Report]] = {FORMAT_JSON_LINES: JsonLinesReport, FORMAT_SARIF: SarifReport}
@@ -0,0 +1,104 @@
+"""Helpers shared by the command line interface and the fixer."""
+
+from __future__ import annotations
+
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, Sequence, TypeVar
+
+from . import PREFILTER_NEEDLES, Problem
+
+# The same format as the flake8 noqa comments
+NOQA_PATTERN = re.compile(
+    r"# noqa(?::[\s]?(?P<codes>[A-Z]+[0-9]+(?:[,\s]+[A-Z]+[0-9]+)*))?", flags=re.IGNORECASE
+)
+_PREFILTER_BYTES = tuple(needle.encode() for needle in PREFILTER_NEEDLES)
+# Workers get several chunks each so that uneven file sizes are balanced out
+_CHUNKS_PER_WORKER = 4
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def is_suppressed(line: str, problem: Problem) -> bool:
+    """Check whether a noqa comment on the line suppresses the problem.
+
+    Args:
+        line: The line the problem was found on.
+        problem: The problem.
+
+    Returns:
+        Whether the problem is suppressed.
+    """
+    if (match := NOQA_PATTERN.search(line)) is None:
+        return False
+    if (codes := match.group("codes")) is None:
+        return True
+    code = problem.msg.split(maxsplit=1)[0]
+    return code.lower() in {noqa_code.lower() for noqa_code in re.split(r"[,\s]+", codes)}
+
+
+def may_have_problems(source: bytes, needles: Sequence[bytes] = _PREFILTER_BYTES) -> bool:
+    """Check whether the source could contain any problems without parsing it.
+
+    Args:
+        source: The content of the file.
+        needles: The encoded needles of the registry of the factories, see Registry.
+
+    Returns:
+        Whether any of the names that problems are reported for appear in the source.
+    """
+    return any(needle in source for needle in needles)
+
+
+def _map_chunk(function: Callable[[_T], _R], chunk: Sequence[_T]) -> list[_R]:
+    """Apply a function to a chunk of items in a worker.
+
+    Args:
+        function: The function to apply.
+        chunk: The items.
+
+    Returns:
+        The results in the same order as the items.
+    """
+    return [function(item) for item in chunk]
+
+
+def parallel_map(
+    function: Callable[[_T], _R],
+    items: Sequence[_T],
+    jobs: int,
+    threads: bool = False,
+    ordered: bool = True,
+) -> Iterator[_R]:
+    """Apply a function to items, in parallel if more than one job is requested.
+
+    Args:
+        function: The function to apply, must be picklable unless threads are used and must be
+            thread-safe if they are.
+        items: The items to apply the function to.
+        jobs: The number of workers.
+        threads: Whether to use a pool of threads rather than processes.
+        ordered: Whether to yield the results in the same order as the items rather than as soon
+            as they are ready.
+
+    Yields:
+        The result for each item.
+    """
+    if jobs <= 1 or len(items) <= 1:
+        yield from map(function, items)
+        return
+
+    jobs = min(jobs, len(items))
+    chunksize = max(1, len(items) // (jobs * _CHUNKS_PER_WORKER))
+    executor_class = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    with executor_class(max_workers=jobs) as executor:
+        if ordered:
+            yield from executor.map(function, items, chunksize=chunksize)
+            return
+        futures = [
+            executor.submit(_map_chunk, function, items[start : start + chunksize])
+            for start in range(0, len(items), chunksize)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
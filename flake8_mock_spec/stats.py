@@ -0,0 +1,143 @@
+"""Per file statistics of the cost of the checker written as JSON lines.
+
+Only imported when the statistics are enabled so that the startup time of the plugin is not
+affected.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import multiprocessing
+import time
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, Iterator, TypeVar
+
+SUMMARY_KEY = "summary"
+SLOWEST_FILES = 10
+
+_T = TypeVar("_T")
+
+
+class FileStats:
+    """The work done to check a file.
+
+    Attrs:
+        path: The path to the file.
+        seconds: The wall time from the start of the check until the last problem was consumed.
+        nodes: The number of AST nodes visited.
+        calls: The number of calls examined.
+        problems: The number of problems found.
+    """
+
+    # Mutable record of the counters, updated while the file is checked
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("path", "seconds", "nodes", "calls", "problems")
+
+    def __init__(self, path: str) -> None:
+        """Construct.
+
+        Args:
+            path: The path to the file.
+        """
+        self.path = path
+        self.seconds = 0.0
+        self.nodes = 0
+        self.calls = 0
+        self.problems = 0
+
+    def as_record(self) -> dict[str, Any]:
+        """Convert to a JSON record.
+
+        Returns:
+            The statistics by name.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def profile(
+    path: str, check: Callable[[FileStats], Iterator[_T]], stats_path: str | Path
+) -> Generator[_T, None, None]:
+    """Time a check of a file and append its statistics once the check is done.
+
+    Args:
+        path: The path to the file being checked.
+        check: Checks the file, recording the work it does on the statistics it is passed.
+        stats_path: The JSON lines file to append the statistics to.
+
+    Yields:
+        The results of the check.
+    """
+    file_stats = FileStats(path)
+    start = time.perf_counter()
+    try:
+        yield from check(file_stats)
+    finally:
+        file_stats.seconds = time.perf_counter() - start
+        # A single write of a line in append mode doesn't interleave with other worker processes
+        with Path(stats_path).open("a", encoding="utf-8") as file:
+            file.write(json.dumps(file_stats.as_record()) + "\n")
+
+
+def read_records(stats_path: Path) -> list[dict[str, Any]]:
+    """Read the statistics of the files.
+
+    Args:
+        stats_path: The JSON lines file with the statistics.
+
+    Returns:
+        The statistics of each file, summaries are skipped.
+    """
+    with stats_path.open(encoding="utf-8") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    return [record for record in records if SUMMARY_KEY not in record]
+
+
+def summarize(records: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate the statistics of the files.
+
+    Args:
+        records: The statistics of each file.
+
+    Returns:
+        The totals and the slowest files.
+    """
+    records = list(records)
+    totals: dict[str, Any] = {"files": len(records)}
+    for name in ("seconds", "nodes", "calls", "problems"):
+        totals[name] = sum(record[name] for record in records)
+    slowest = sorted(records, key=lambda record: record["seconds"], reverse=True)[:SLOWEST_FILES]
+    totals["slowest"] = [
+        {"path": record["path"], "seconds": record["seconds"]} for record in slowest
+    ]
+    return totals
+
+
+def write_summary(stats_path: Path) -> None:
+    """Append the summary of the statistics of the files.
+
+    Args:
+        stats_path: The JSON lines file with the statistics.
+    """
+    if not stats_path.exists():
+        return
+    summary = summarize(read_records(stats_path))
+    with stats_path.open("a", encoding="utf-8") as file:
+        file.write(json.dumps({SUMMARY_KEY: summary}) + "\n")
+
+
+def start_run(stats_path: str | Path) -> None:
+    """Clear the statistics of any previous run and write the summary when the run ends.
+
+    Does nothing in worker processes, the statistics are only cleared and summarized by the main
+    process.
+
+    Args:
+        stats_path: The JSON lines file for the statistics.
+    """
+    if multiprocessing.parent_process() is not None:
+        return
+    stats_path = Path(stats_path)
+    stats_path.write_text("", encoding="utf-8")
+    atexit.register(write_summary, stats_path)
@@ -0,0 +1,890 @@
+"""Checks that spec and patch targets exist using a static index of the modules of the project.
+
+Nothing is imported, the modules are parsed and the names they define are cached keyed by the hash
+of their content, so only the modules that changed since the last run are parsed again. Targets
+are only reported if they certainly don't exist, anything that can't be decided statically (e.g.,
+attributes of modules that aren't part of the project, modules with a __getattr__ function or
+attributes inherited from classes outside of the project) is assumed to exist.
+"""
+
+from __future__ import annotations
+
+import ast
+import atexit
+import multiprocessing
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, Sequence
+
+from . import (
+    DEFAULT_REGISTRY,
+    PATCH_MSG,
+    PATCH_MULTIPLE_MSG,
+    PATCH_OBJECT_MSG,
+    SPEC_ARGS,
+    TARGET_MSG_BASE,
+    Check,
+    Problem,
+    Registry,
+    Rule,
+    _call_rule,
+    _get_fully_qualified_name,
+    _make_import_index,
+    build_import_index,
+    traverse,
+)
+from .cache import DEFAULT_DIRECTORY, Cache, get_cache
+
+SYMBOLS_NAMESPACE = "symbols"
+# Limits following imports and base classes, which may be circular
+MAX_DEPTH = 32
+BUILTINS_MODULE = "builtins"
+# Bases that don't add any attributes other than special ones
+_ATTRIBUTE_FREE_BASES = frozenset(
+    (
+        f"{BUILTINS_MODULE}.object",
+        "abc.ABC",
+        "typing.Generic",
+        "typing.Protocol",
+        "typing_extensions.Protocol",
+    )
+)
+_DYNAMIC_ATTRIBUTE_HOOKS = frozenset(("__getattr__", "__getattribute__"))
+# The suffixes of compiled extension modules, e.g., module.cpython-311-x86_64-linux-gnu.so
+_EXTENSION_SUFFIXES = frozenset((".so", ".pyd"))
+_STATEMENT_FIELDS = frozenset(("body", "orelse", "finalbody", "handlers", "cases"))
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+# Patterns that bind a name, match statements were added in Python 3.10
+_MATCH_NAME_TYPES = tuple(
+    getattr(ast, name) for name in ("MatchAs", "MatchStar") if hasattr(ast, name)
+)
+_MATCH_REST_TYPES = tuple(getattr(ast, name) for name in ("MatchMapping",) if hasattr(ast, name))
+# The arguments of patch.multiple that are not the name of an attribute to patch
+_PATCH_MULTIPLE_OPTIONS = frozenset(
+    ("target", "spec", "spec_set", "create", "autospec", "new_callable")
+)
+_INDEXES: dict[tuple[int, tuple[str, ...], str | None], SymbolIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+class ClassSymbols(NamedTuple):
+    """The names a class defines.
+
+    Attrs:
+        attributes: The names bound in the body of the class, assigned to the attributes of the
+            first argument of its methods and assigned to attributes of the class at the top
+            level of the module.
+        bases: The fully qualified names of the bases, empty for bases that can't be resolved.
+        dynamic: Whether the attributes can't be known statically, e.g., the class has a
+            __getattr__ method or a metaclass or its attributes are assigned using setattr.
+    """
+
+    attributes: frozenset[str]
+    bases: tuple[str, ...]
+    dynamic: bool
+
+
+class ModuleSymbols(NamedTuple):
+    """The top level names a module defines.
+
+    Names that are bound more than once are only recorded in names since it isn't known which of
+    the bindings is used.
+
+    Attrs:
+        names: Every name bound at the top level of the module, including the names functions
+            declare global.
+        imports: The fully qualified names of the names bound by imports.
+        classes: The classes by their name.
+        dynamic: Whether the names can't be known statically, i.e., the module has a star import
+            or a __getattr__ function.
+    """
+
+    names: frozenset[str]
+    imports: dict[str, str]
+    classes: dict[str, ClassSymbols]
+    dynamic: bool
+
+
+def _is_special(name: str) -> bool:
+    """Check whether a name is a special name, e.g., __init__.
+
+    Args:
+        name: The name.
+
+    Returns:
+        Whether the name starts and ends with double underscores.
+    """
+    return name.startswith("__") and name.endswith("__")
+
+
+class _Collector:
+    """Collects the names bound by statements."""
+
+    # Each kind of binding is recorded separately
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, module: str, package: str) -> None:
+        """Construct.
+
+        Args:
+            module: The fully qualified name of the module.
+            package: The package relative imports are resolved in, empty if not known.
+        """
+        self.module = module
+        self.package = package
+        self.names: set[str] = set()
+        self.rebound: set[str] = set()
+        self.imports: dict[str, str] = {}
+        self.classes: dict[str, ast.ClassDef] = {}
+        # The attributes assigned to names, e.g., Model.kind = 1, and the names passed to setattr
+        self.attribute_stores: dict[str, set[str]] = {}
+        self.setattr_names: set[str] = set()
+        self.dynamic = False
+
+    def bind(self, name: str, qualified_name: str | None = None) -> None:
+        """Record a name that is bound.
+
+        Args:
+            name: The name.
+            qualified_name: The fully qualified name of the imported name, if it is bound by an
+                import, importing the same name again doesn't rebind it.
+        """
+        if name in self.names and (
+            qualified_name is None or self.imports.get(name) != qualified_name
+        ):
+            self.rebound.add(name)
+        self.names.add(name)
+        if qualified_name is not None:
+            self.imports[name] = qualified_name
+
+    def import_from_module(self, node: ast.ImportFrom) -> str | None:
+        """Resolve the module of a from import.
+
+        Args:
+            node: The import.
+
+        Returns:
+            The fully qualified name of the module or None if a relative import can't be resolved.
+        """
+        if not node.level:
+            return node.module
+        parts = self.package.split(".") if self.package else []
+        if node.level - 1 >= len(parts):
+            return None
+        parts = parts[: len(parts) - node.level + 1]
+        return ".".join([*parts, node.module] if node.module else parts)
+
+    def statements(  # pylint: disable=too-many-branches
+        self, statements: Sequence[ast.AST]
+    ) -> None:
+        """Record the names bound by statements, including nested blocks but not functions.
+
+        Args:
+            statements: The statements.
+        """
+        for node in statements:
+            if isinstance(node, _DEFINITION_TYPES):
+                self.bind(node.name)
+                if isinstance(node, ast.ClassDef):
+                    self.classes[node.name] = node
+                elif node.name in _DYNAMIC_ATTRIBUTE_HOOKS:
+                    self.dynamic = True
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    local = alias.asname or alias.name.split(".")[0]
+                    self.bind(local, alias.name if alias.asname else local)
+            elif isinstance(node, ast.ImportFrom):
+                module = self.import_from_module(node)
+                for alias in node.names:
+                    if alias.name == "*":
+                        self.dynamic = True
+                        continue
+                    self.bind(
+                        alias.asname or alias.name,
+                        None if module is None else f"{module}.{alias.name}",
+                    )
+            else:
+                if isinstance(node, ast.ExceptHandler) and node.name:
+                    self.bind(node.name)
+                for field, value in ast.iter_fields(node):
+                    if field in _STATEMENT_FIELDS:
+                        self.statements(value)
+                    elif isinstance(value, (ast.AST, list)):
+                        self.targets(value)
+
+    def targets(self, value: ast.AST | list[Any]) -> None:
+        """Record the names bound within an expression or pattern.
+
+        Args:
+            value: The expression, pattern or list of them.
+        """
+        for item in value if isinstance(value, list) else [value]:
+            if not isinstance(item, ast.AST):
+                continue
+            for node in ast.walk(item):
+                if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                    self.bind(node.id)
+                # The pattern types are read dynamically so they don't narrow the type of the node
+                elif isinstance(node, _MATCH_NAME_TYPES) and (name := getattr(node, "name")):
+                    self.bind(name)
+                elif isinstance(node, _MATCH_REST_TYPES) and (rest := getattr(node, "rest")):
+                    self.bind(rest)
+                elif (
+                    isinstance(node, ast.Attribute)
+                    and isinstance(node.ctx, ast.Store)
+                    and isinstance(node.value, ast.Name)
+                ):
+                    self.attribute_stores.setdefault(node.value.id, set()).add(node.attr)
+                elif (name := _setattr_name(node)) is not None:
+                    self.setattr_names.add(name)
+
+    def qualified_name(self, node: ast.expr) -> str:
+        """Resolve an expression that refers to a class, e.g., the base of a class.
+
+        Args:
+            node: The expression.
+
+        Returns:
+            The fully qualified name or an empty string if it can't be resolved.
+        """
+        if isinstance(node, ast.Subscript):
+            node = node.value
+        names = _get_fully_qualified_name(node)
+        if not names:
+            return ""
+        root, *rest = names
+        if root in self.rebound:
+            return ""
+        if root in self.imports:
+            return ".".join((self.imports[root], *rest))
+        if root in self.names:
+            return ".".join((self.module, *names))
+        return ".".join((BUILTINS_MODULE, *names))
+
+    def class_symbols(self, node: ast.ClassDef) -> ClassSymbols:
+        """Collect the names defined by a class.
+
+        Args:
+            node: The class.
+
+        Returns:
+            The names.
+        """
+        collector = _Collector(self.module, self.package)
+        collector.statements(node.body)
+        attributes = {*collector.names, *self.attribute_stores.get(node.name, ())}
+        dynamic = (
+            collector.dynamic
+            or node.name in self.setattr_names
+            or any(keyword.arg == "metaclass" for keyword in node.keywords)
+        )
+        for statement in node.body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                instance_attributes, sets_dynamically = _instance_attributes(statement)
+                attributes.update(instance_attributes)
+                dynamic = dynamic or sets_dynamically
+            elif isinstance(statement, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == "__slots__"
+                for target in statement.targets
+            ):
+                attributes.update(_slots(statement.value))
+        return ClassSymbols(
+            attributes=frozenset(attributes),
+            bases=tuple(self.qualified_name(base) for base in node.bases),
+            dynamic=dynamic,
+        )
+
+
+def _setattr_name(node: ast.AST) -> str | None:
+    """Find the name whose attributes a call of setattr assigns, e.g., self in setattr(self, a, 1).
+
+    Args:
+        node: The node.
+
+    Returns:
+        The name or None if the node isn't a call of setattr with a name as its first argument.
+    """
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == "setattr"
+        and node.args
+        and isinstance(node.args[0], ast.Name)
+    ):
+        return node.args[0].id
+    return None
+
+
+def _instance_attributes(
+    node: ast.FunctionDef | ast.AsyncFunctionDef,
+) -> tuple[set[str], bool]:
+    """Find the attributes a method assigns to its first argument, e.g., self.value = 1.
+
+    Args:
+        node: The method.
+
+    Returns:
+        The names of the attributes and whether the method also assigns attributes whose names
+        can't be known statically using setattr.
+    """
+    arguments = (*node.args.posonlyargs, *node.args.args)
+    if not arguments:
+        return set(), False
+    first = arguments[0].arg
+    attributes = set()
+    sets_dynamically = False
+    for child in ast.walk(node):
+        if (
+            isinstance(child, ast.Attribute)
+            and isinstance(child.ctx, ast.Store)
+            and isinstance(child.value, ast.Name)
+            and child.value.id == first
+        ):
+            attributes.add(child.attr)
+        elif _setattr_name(child) == first:
+            sets_dynamically = True
+    return attributes, sets_dynamically
+
+
+def _slots(node: ast.expr) -> Iterator[str]:
+    """Find the names in the __slots__ of a class.
+
+    Args:
+        node: The value assigned to __slots__.
+
+    Yields:
+        The names.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        yield node.value
+    elif isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        for element in node.elts:
+            yield from _slots(element)
+
+
+def collect_symbols(tree: ast.Module, module: str, is_package: bool = False) -> ModuleSymbols:
+    """Collect the top level names a module defines.
+
+    Args:
+        tree: The tree of the module.
+        module: The fully qualified name of the module, empty if not known.
+        is_package: Whether the module is the __init__ module of a package.
+
+    Returns:
+        The names.
+    """
+    package = module if is_package else module.rpartition(".")[0]
+    collector = _Collector(module, package)
+    collector.statements(tree.body)
+    # Functions bind top level names that they declare global
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Global):
+            for name in node.names:
+                collector.bind(name)
+    return ModuleSymbols(
+        names=frozenset(collector.names),
+        imports={
+            name: qualified_name
+            for name, qualified_name in collector.imports.items()
+            if name not in collector.rebound
+        },
+        classes={
+            name: collector.class_symbols(node)
+            for name, node in collector.classes.items()
+            if name not in collector.rebound
+        },
+        dynamic=collector.dynamic,
+    )
+
+
+def _symbols_to_json(symbols: ModuleSymbols) -> dict[str, Any]:
+    """Convert the names of a module so they can be stored as JSON.
+
+    Args:
+        symbols: The names.
+
+    Returns:
+        The names as JSON compatible values.
+    """
+    return {
+        "names": sorted(symbols.names),
+        "imports": symbols.imports,
+        "classes": {
+            name: [sorted(class_.attributes), list(class_.bases), class_.dynamic]
+            for name, class_ in symbols.classes.items()
+        },
+        "dynamic": symbols.dynamic,
+    }
+
+
+def _symbols_from_json(value: dict[str, Any]) -> ModuleSymbols:
+    """Convert the stored names of a module back.
+
+    Args:
+        value: The names as JSON compatible values.
+
+    Returns:
+        The names.
+    """
+    return ModuleSymbols(
+        names=frozenset(value["names"]),
+        imports=value["imports"],
+        classes={
+            name: ClassSymbols(frozenset(attributes), tuple(bases), dynamic)
+            for name, (attributes, bases, dynamic) in value["classes"].items()
+        },
+        dynamic=value["dynamic"],
+    )
+
+
+# A directory without an __init__ module, its submodules may also be in directories outside of the
+# project
+_NAMESPACE_PACKAGE = ModuleSymbols(names=frozenset(), imports={}, classes={}, dynamic=True)
+# A module that can't be parsed, any name may exist in it
+_UNKNOWN_MODULE = ModuleSymbols(names=frozenset(), imports={}, classes={}, dynamic=True)
+
+
+def _is_extension_module(path: Path) -> bool:
+    """Check whether a module is a compiled extension module, which can't be parsed.
+
+    Args:
+        path: The path to the module without a suffix.
+
+    Returns:
+        Whether an extension module exists at the path.
+    """
+    if not path.parent.is_dir():
+        return False
+    return any(
+        candidate.suffix in _EXTENSION_SUFFIXES and candidate.name.split(".")[0] == path.name
+        for candidate in path.parent.glob(f"{path.name}.*")
+    )
+
+
+class SymbolIndex:
+    """The names defined by the modules of a project, read as they are needed.
+
+    Attrs:
+        roots: The directories the modules are found in, e.g., the root of the repository or src.
+    """
+
+    roots: tuple[Path, ...]
+
+    def __init__(self, roots: Sequence[str | Path], cache: Cache | None = None) -> None:
+        """Construct.
+
+        Args:
+            roots: The directories the modules are found in.
+            cache: Stores the names defined by modules keyed by the hash of their content, if any.
+        """
+        self.roots = tuple(Path(root).resolve() for root in roots)
+        self._cache = cache
+        self._symbols: dict[str, ModuleSymbols | None] = {}
+
+    def module_name(self, path: str | Path) -> tuple[str, bool] | None:
+        """Calculate the name of the module in a file.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            The fully qualified name of the module and whether it is a package or None if the
+            file is not in any of the roots.
+        """
+        resolved = Path(path).resolve()
+        for root in self.roots:
+            try:
+                parts = resolved.with_suffix("").relative_to(root).parts
+            except ValueError:
+                continue
+            if not parts or not all(part.isidentifier() for part in parts[:-1]):
+                continue
+            if parts[-1] == "__init__":
+                return ".".join(parts[:-1]), True
+            return ".".join(parts), False
+        return None
+
+    def _read(self, module: str) -> ModuleSymbols | None:
+        """Read the names defined by a module from the cache or by parsing it.
+
+        Args:
+            module: The fully qualified name of the module.
+
+        Returns:
+            The names or None if the module is not part of the project.
+        """
+        parts = module.split(".")
+        for root in self.roots:
+            for path, is_package in (
+                (root.joinpath(*parts).with_suffix(".py"), False),
+                (root.joinpath(*parts, "__init__.py"), True),
+            ):
+                if path.is_file():
+                    return self._read_file(path, module, is_package)
+            if _is_extension_module(root.joinpath(*parts)):
+                return _UNKNOWN_MODULE
+        if any(root.joinpath(*parts).is_dir() for root in self.roots):
+            return _NAMESPACE_PACKAGE
+        return None
+
+    def _read_file(self, path: Path, module: str, is_package: bool) -> ModuleSymbols:
+        """Read the names defined by a module in a file.
+
+        Args:
+            path: The path to the file.
+            module: The fully qualified name of the module.
+            is_package: Whether the file is the __init__ module of a package.
+
+        Returns:
+            The names, any name may exist in a file that can't be parsed.
+        """
+        source = path.read_bytes()
+        key = None
+        if self._cache is not None:
+            namespace = f"{SYMBOLS_NAMESPACE}\0{module}\0{is_package}"
+            key = self._cache.key(source, namespace=namespace)
+            if (stored := self._cache.load(key)) is not None:
+                return _symbols_from_json(stored)
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError, RecursionError):
+            return _UNKNOWN_MODULE
+        symbols = collect_symbols(tree, module, is_package)
+        if key is not None and self._cache is not None:
+            self._cache.store(key, _symbols_to_json(symbols))
+        return symbols
+
+    def symbols(self, module: str) -> ModuleSymbols | None:
+        """Retrieve the names defined by a module.
+
+        Args:
+            module: The fully qualified name of the module.
+
+        Returns:
+            The names or None if the module is not part of the project.
+        """
+        try:
+            return self._symbols[module]
+        except KeyError:
+            # Threads that miss at the same time each read the module and store the same names
+            symbols = self._symbols[module] = self._read(module)
+            return symbols
+
+    def resolve(self, name: Sequence[str], depth: int = 0) -> bool | None:
+        """Check whether a name exists.
+
+        Args:
+            name: The fully qualified name, e.g., ("package", "module", "Class", "method").
+            depth: The number of imports and bases followed so far.
+
+        Returns:
+            Whether the name exists or None if that can't be known statically.
+        """
+        if depth > MAX_DEPTH:
+            return None
+        # The longest module wins, e.g., package.module rather than the package
+        for length in range(len(name), 0, -1):
+            module = ".".join(name[:length])
+            if (symbols := self.symbols(module)) is not None:
+                return self._resolve_in_module(symbols, name[length:], depth)
+        return None
+
+    def _resolve_in_module(  # pylint: disable=too-many-return-statements
+        self, symbols: ModuleSymbols, name: Sequence[str], depth: int
+    ) -> bool | None:
+        """Check whether a name exists within a module.
+
+        Args:
+            symbols: The names defined by the module.
+            name: The name within the module.
+            depth: The number of imports and bases followed so far.
+
+        Returns:
+            Whether the name exists or None if that can't be known statically.
+        """
+        if not name:
+            return True
+        root, *attributes = name
+        if root in symbols.imports:
+            if not attributes:
+                return True
+            return self.resolve((*symbols.imports[root].split("."), *attributes), depth + 1)
+        if root in symbols.classes:
+            return self._resolve_attributes(symbols.classes[root], attributes, depth)
+        if root in symbols.names:
+            return True if not attributes else None
+        # Submodules of packages are found by resolve before the package, this is reached for
+        # submodules that don't exist
+        if symbols.dynamic or _is_special(root):
+            return None
+        return False
+
+    def _resolve_attributes(
+        self, class_: ClassSymbols, attributes: Sequence[str], depth: int
+    ) -> bool | None:
+        """Check whether an attribute of a class exists.
+
+        Args:
+            class_: The names defined by the class.
+            attributes: The attribute followed by attributes of the attribute.
+            depth: The number of imports and bases followed so far.
+
+        Returns:
+            Whether the attribute exists or None if that can't be known statically.
+        """
+        if not attributes:
+            return True
+        attribute, *rest = attributes
+        if attribute in class_.attributes:
+            return True if not rest else None
+        if class_.dynamic or _is_special(attribute):
+            return None
+        for base in class_.bases:
+            if base in _ATTRIBUTE_FREE_BASES:
+                continue
+            if not base:
+                return None
+            found = self.resolve((*base.split("."), *attributes), depth + 1)
+            if found is not False:
+                return found
+        return False
+
+
+def get_index(roots: Sequence[str], cache_directory: str | None = None) -> SymbolIndex:
+    """Retrieve the index of the modules in directories, shared within the current process.
+
+    Args:
+        roots: The directories the modules are found in.
+        cache_directory: The directory of the cache, the default cache directory if it is None.
+
+    Returns:
+        The index.
+    """
+    lookup_key = (os.getpid(), tuple(roots), cache_directory)
+    with _INDEXES_LOCK:
+        if (index := _INDEXES.get(lookup_key)) is None:
+            cache = get_cache(
+                DEFAULT_DIRECTORY if cache_directory is None else Path(cache_directory)
+            )
+            index = _INDEXES[lookup_key] = SymbolIndex(roots, cache)
+    return index
+
+
+def _evict(cache_directory: str | None) -> None:
+    """Remove the least recently used entries of the cache.
+
+    Args:
+        cache_directory: The directory of the cache, the default cache directory if it is None.
+    """
+    get_cache(DEFAULT_DIRECTORY if cache_directory is None else Path(cache_directory)).evict()
+
+
+def start_run(cache_directory: str | None = None) -> None:
+    """Evict the least recently used entries of the cache once the run is done.
+
+    Only the main process evicts, once the worker processes have indexed the modules.
+
+    Args:
+        cache_directory: The directory of the cache, the default cache directory if it is None.
+    """
+    if multiprocessing.parent_process() is not None:
+        return
+    # The options may be parsed more than once by the same process
+    atexit.unregister(_evict)
+    atexit.register(_evict, cache_directory)
+
+
+def _dotted_name(node: ast.expr) -> tuple[str, ...] | None:
+    """Read a target string, e.g., "package.module.Class".
+
+    Args:
+        node: The argument.
+
+    Returns:
+        The elements of the name or None if the argument is not a string with a dotted name.
+    """
+    if not isinstance(node, ast.Constant) or not isinstance(node.value, str):
+        return None
+    name = tuple(node.value.split("."))
+    return name if all(element.isidentifier() for element in name) else None
+
+
+def _argument(call: ast.Call, keyword_name: str, position: int) -> ast.expr | None:
+    """Retrieve an argument of a call that can be passed by position or keyword.
+
+    Args:
+        call: The call.
+        keyword_name: The name of the argument.
+        position: The position of the argument.
+
+    Returns:
+        The value of the argument, if it was passed.
+    """
+    for keyword in call.keywords:
+        if keyword.arg == keyword_name:
+            return keyword.value
+    return _positional_argument(call, position)
+
+
+def _positional_argument(call: ast.Call, position: int) -> ast.expr | None:
+    """Retrieve a positional argument of a call.
+
+    Args:
+        call: The call.
+        position: The position of the argument.
+
+    Returns:
+        The value of the argument, if it was passed and isn't behind a starred argument.
+    """
+    if len(call.args) > position and not any(
+        isinstance(argument, ast.Starred) for argument in call.args[: position + 1]
+    ):
+        return call.args[position]
+    return None
+
+
+def _targets(  # pylint: disable=too-many-branches
+    call: ast.Call, rule: Rule, symbols: ModuleSymbols
+) -> Iterator[tuple[tuple[str, ...], ast.expr]]:
+    """Find the targets of a call of a factory.
+
+    Args:
+        call: The call.
+        rule: The rule of the factory.
+        symbols: The names defined by the module of the call.
+
+    Yields:
+        The fully qualified name of each target and the argument it was read from.
+    """
+    keywords = {keyword.arg: keyword.value for keyword in call.keywords}
+    for spec_arg in sorted(SPEC_ARGS):
+        if (value := keywords.get(spec_arg)) is not None and (
+            name := _imported_name(value, symbols)
+        ):
+            yield name, value
+    for position in sorted(rule.positions):
+        if (value := _positional_argument(call, position)) is not None and (
+            name := _imported_name(value, symbols)
+        ):
+            yield name, value
+    # Attributes that are created don't need to exist
+    if "create" in keywords:
+        return
+
+    if (target := _argument(call, "target", 0)) is None:
+        return
+    if rule.msg == PATCH_MSG:
+        if (name := _dotted_name(target)) is not None:
+            yield name, target
+    elif rule.msg == PATCH_OBJECT_MSG:
+        attribute = _argument(call, "attribute", 1)
+        if (
+            attribute is not None
+            and (name := _imported_name(target, symbols)) is not None
+            and (attribute_name := _dotted_name(attribute)) is not None
+            and len(attribute_name) == 1
+        ):
+            yield (*name, *attribute_name), attribute
+    elif rule.msg == PATCH_MULTIPLE_MSG:
+        # The target is the name of a module or class, or the object itself
+        if (name := _dotted_name(target)) is not None:
+            yield name, target
+        elif (name := _imported_name(target, symbols)) is None:
+            return
+        for keyword in call.keywords:
+            if keyword.arg is not None and keyword.arg not in _PATCH_MULTIPLE_OPTIONS:
+                yield (*name, keyword.arg), keyword.value
+
+
+def _imported_name(node: ast.expr, symbols: ModuleSymbols) -> tuple[str, ...] | None:
+    """Resolve an expression that refers to an imported name, e.g., module.Class.
+
+    Args:
+        node: The expression.
+        symbols: The names defined by the module of the expression.
+
+    Returns:
+        The fully qualified name or None if it doesn't refer to an imported name.
+    """
+    names = _get_fully_qualified_name(node)
+    if not names or (qualified_name := symbols.imports.get(names[0])) is None:
+        return None
+    return (*qualified_name.split("."), *names[1:])
+
+
+class TargetCheck(Check):
+    """Checks that the spec and patch targets of the calls of the mock factories exist."""
+
+    def __init__(
+        self, index: SymbolIndex, path: str | None = None, registry: Registry = DEFAULT_REGISTRY
+    ) -> None:
+        """Construct.
+
+        Args:
+            index: The names defined by the modules of the project.
+            path: The path to the file of the module, used to resolve relative imports.
+            registry: The factories whose calls are checked.
+        """
+        self._index = index
+        self._path = path
+        self._registry = registry
+        self._import_index = _make_import_index({}, None, registry)
+        self._symbols = _NAMESPACE_PACKAGE
+
+    def start(self, tree: ast.AST) -> bool:
+        """Collect the names the module imports and defines.
+
+        Args:
+            tree: The tree of the module.
+
+        Returns:
+            Whether the module imports any providers of the mock classes and patch.
+        """
+        self._import_index = build_import_index(tree, self._registry)
+        if not self._import_index.has_providers or not isinstance(tree, ast.Module):
+            return False
+        module, is_package = (self._path is not None and self._index.module_name(self._path)) or (
+            "",
+            False,
+        )
+        self._symbols = collect_symbols(tree, module, is_package)
+        return True
+
+    # The method must be called the same as the name of the node
+    def visit_Call(self, node: ast.Call) -> list[Problem]:  # pylint: disable=invalid-name
+        """Check the targets of a call of a factory.
+
+        Args:
+            node: The call.
+
+        Returns:
+            The problems with the targets that don't exist.
+        """
+        if (rule := _call_rule(node, self._import_index)) is None:
+            return []
+        return [
+            Problem(target.lineno, target.col_offset, TARGET_MSG_BASE % ".".join(name))
+            for name, target in _targets(node, rule, self._symbols)
+            if self._index.resolve(name) is False
+        ]
+
+
+def check_targets(
+    tree: ast.Module,
+    index: SymbolIndex,
+    path: str | None = None,
+    registry: Registry = DEFAULT_REGISTRY,
+) -> Iterator[Problem]:
+    """Find the spec and patch targets of the calls in a module that don't exist.
+
+    Args:
+        tree: The tree of the module.
+        index: The names defined by the modules of the project.
+        path: The path to the file of the module, used to resolve relative imports.
+        registry: The factories whose calls are checked.
+
+    Returns:
+        The problems in the order the calls are found.
+    """
+    return traverse(tree, (TargetCheck(index, path, registry),))
@@ -0,0 +1,56 @@
+"""Fixtures shared by the tests."""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any, Callable
+
+import pytest
+
+from flake8_mock_spec import Plugin
+
+# The flake8 options of the plugin when none are passed
+DEFAULT_OPTIONS: dict[str, Any] = {
+    "mock_spec_max_problems": None,
+    "mock_spec_stats": None,
+    "mock_spec_factories": [],
+    "mock_spec_target_roots": [],
+    "mock_spec_target_cache_dir": None,
+    "mock_spec_baseline": None,
+    "mock_spec_max_nodes": None,
+    "mock_spec_max_seconds": None,
+}
+# The attributes of the plugin that are set from the options
+_OPTION_ATTRIBUTES = (
+    "max_problems",
+    "stats_path",
+    "registry",
+    "target_roots",
+    "target_cache_dir",
+    "baseline",
+    "budget",
+)
+
+
+@pytest.fixture(name="parse_plugin_options")
+def fixture_parse_plugin_options(monkeypatch: pytest.MonkeyPatch) -> Callable[..., None]:
+    """Parse flake8 options for the plugin, the options are restored after the test.
+
+    Args:
+        monkeypatch: Restores the attributes of the plugin.
+
+    Returns:
+        Function that parses the options, the keyword arguments replace the default options.
+    """
+    for attribute in _OPTION_ATTRIBUTES:
+        monkeypatch.setattr(Plugin, attribute, getattr(Plugin, attribute))
+
+    def parse_plugin_options(**options: Any) -> None:
+        """Parse the options.
+
+        Args:
+            options: The options that are not the default, e.g., mock_spec_max_nodes=12.
+        """
+        Plugin.parse_options(argparse.Namespace(**{**DEFAULT_OPTIONS, **options}))
+
+    return parse_plugin_options
@@ -0,0 +1,130 @@
+"""Tests for the library interface."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from flake8_mock_spec import MOCK_SPEC_MSG, PATCH_MSG
+from flake8_mock_spec.api import (
+    ORDER_COMPLETED,
+    ORDER_INPUT,
+    Result,
+    Source,
+    check_paths,
+    check_sources,
+)
+from flake8_mock_spec.cache import get_cache
+from flake8_mock_spec.cli import SYNTAX_ERROR_CODE
+
+IMPORTS_TEXT = "from unittest.mock import *\n"
+MOCK_CODE, MOCK_MESSAGE = MOCK_SPEC_MSG.split(maxsplit=1)
+PATCH_CODE, PATCH_MESSAGE = PATCH_MSG.split(maxsplit=1)
+
+
+@pytest.mark.parametrize(
+    "workers, threads",
+    [
+        pytest.param(1, False, id="serial"),
+        pytest.param(2, False, id="processes"),
+        pytest.param(2, True, id="threads"),
+    ],
+)
+def test_check_paths(workers: int, threads: bool, tmp_path: Path):
+    """
+    given: directory with files with problems in any order
+    when: check_paths is called
+    then: the results are ordered by path and position within each file
+    """
+    (tmp_path / "b.py").write_text(f"{IMPORTS_TEXT}patch()\nMock()\n", encoding="utf-8")
+    (tmp_path / "a.py").write_text(f"{IMPORTS_TEXT}Mock()  # noqa\nx = Mock()\n", encoding="utf-8")
+    (tmp_path / "c.py").write_text("print(1)\n", encoding="utf-8")
+
+    results = list(check_paths([str(tmp_path)], workers=workers, threads=threads))
+
+    assert results == [
+        Result(str(tmp_path / "a.py"), 3, 4, MOCK_CODE, MOCK_MESSAGE),
+        Result(str(tmp_path / "b.py"), 2, 0, PATCH_CODE, PATCH_MESSAGE),
+        Result(str(tmp_path / "b.py"), 3, 0, MOCK_CODE, MOCK_MESSAGE),
+    ]
+
+
+def test_check_paths_cache_threads(tmp_path: Path):
+    """
+    given: directory with files with problems and a cache directory
+    when: check_paths is called twice using threads
+    then: the same results are returned by both calls and the problems are cached
+    """
+    for index in range(8):
+        (tmp_path / f"test_{index}.py").write_text(
+            f"{IMPORTS_TEXT}Mock()\nx = {index}\n", encoding="utf-8"
+        )
+    cache_directory = tmp_path / ".cache"
+
+    first = list(
+        check_paths([str(tmp_path)], workers=4, threads=True, cache_directory=cache_directory)
+    )
+    second = list(
+        check_paths([str(tmp_path)], workers=4, threads=True, cache_directory=cache_directory)
+    )
+
+    assert len(first) == 8
+    assert second == first
+    assert len(get_cache(cache_directory)) == 8
+
+
+@pytest.mark.parametrize(
+    "threads",
+    [pytest.param(False, id="processes"), pytest.param(True, id="threads")],
+)
+def test_check_sources_completed(threads: bool):
+    """
+    given: many sources
+    when: check_sources is called with the completed order
+    then: the results of every source are returned with the results of each source in order
+    """
+    sources = [(f"{index}.py", f"{IMPORTS_TEXT}patch()\nMock()\n".encode()) for index in range(20)]
+
+    results = list(check_sources(sources, workers=2, threads=threads, order=ORDER_COMPLETED))
+
+    assert sorted(results) == sorted(
+        Result(path, lineno, 0, code, message)
+        for path, _ in sources
+        for lineno, code, message in ((2, PATCH_CODE, PATCH_MESSAGE), (3, MOCK_CODE, MOCK_MESSAGE))
+    )
+    for index in range(0, len(results), 2):
+        assert results[index].path == results[index + 1].path
+        assert results[index].lineno < results[index + 1].lineno
+
+
+@pytest.mark.parametrize("workers", [pytest.param(1, id="serial"), pytest.param(2, id="pool")])
+def test_check_sources_input_order(workers: int):
+    """
+    given: text and bytes sources including one that can't be parsed
+    when: check_sources is called
+    then: the results are in the same order as the sources
+    """
+    sources: list[Source] = [
+        ("z.py", f"{IMPORTS_TEXT}Mock()\n"),
+        ("invalid.py", b"Mock(\n"),
+        ("a.py", f"{IMPORTS_TEXT}patch()\n".encode()),
+    ]
+
+    results = list(check_sources(sources, workers=workers, order=ORDER_INPUT))
+
+    assert [(result.path, result.code) for result in results] == [
+        ("z.py", MOCK_CODE),
+        ("invalid.py", SYNTAX_ERROR_CODE),
+        ("a.py", PATCH_CODE),
+    ]
+
+
+def test_check_sources_invalid_order():
+    """
+    given: order that isn't supported
+    when: check_sources is iterated
+    then: ValueError is raised
+    """
+    with pytest.raises(ValueError):
+        list(check_sources([], order="random"))
@@ -0,0 +1,370 @@
+"""Tests for the baseline of accepted problems."""
+
+from __future__ import annotations
+
+import ast
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from flake8_mock_spec import (
+    FACTORY_CODE,
+    MOCK_SPEC_MSG,
+    PATCH_CODE,
+    PATCH_MSG,
+    TARGET_CODE,
+    Plugin,
+    Problem,
+    iter_problems,
+    targets,
+)
+from flake8_mock_spec.baseline import (
+    FINGERPRINT_BYTES,
+    HEADER,
+    Baseline,
+    fingerprint,
+    fingerprints,
+    get_baseline,
+    source_fingerprints,
+    write,
+)
+from flake8_mock_spec.cli import main
+
+SOURCE = """\
+from unittest import mock
+
+
+def test_first():
+    mock.Mock()
+    mock.Mock()
+    mock.patch("pkg.module")
+
+
+class TestSecond:
+    def test_(self):
+        mock.Mock()
+"""
+
+
+def _fingerprints(source: str, path: str = "test_file.py") -> list[str]:
+    """Calculate the fingerprints of the problems in a source.
+
+    Args:
+        source: The source code.
+        path: The path to the file.
+
+    Returns:
+        The fingerprint of each problem.
+    """
+    tree = ast.parse(source)
+    return fingerprints(tree, source.splitlines(keepends=True), path, iter_problems(tree))
+
+
+def _suppress(source: str, baseline: Baseline, path: str = "test_file.py") -> list[int]:
+    """Check a source and remove the accepted problems.
+
+    Args:
+        source: The source code.
+        baseline: The accepted problems.
+        path: The path to the file.
+
+    Returns:
+        The lines of the problems that were not accepted.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    return [
+        problem.lineno for problem in baseline.suppress(tree, lines, path, iter_problems(tree))
+    ]
+
+
+def test_fingerprints():
+    """
+    given: module with problems including identical calls in the same function
+    when: fingerprints is called
+    then: a fixed size fingerprint is returned per problem, identical only for identical calls
+    """
+    result = _fingerprints(SOURCE)
+
+    assert len(result) == 4
+    assert all(len(fingerprint) == FINGERPRINT_BYTES * 2 for fingerprint in result)
+    assert result[0] == result[1]
+    assert len(set(result)) == 3
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param(f"import os\n\n\n{SOURCE}", id="lines inserted above"),
+        pytest.param(SOURCE.replace("mock.Mock()", "mock.Mock(\n    )"), id="reformatted"),
+        pytest.param(SOURCE.replace("import mock\n", "import mock  # comment\n"), id="comment"),
+    ],
+)
+def test_fingerprints_stable(source: str):
+    """
+    given: module with problems that is changed without changing the calls
+    when: fingerprints is called
+    then: the fingerprints are unchanged
+    """
+    assert _fingerprints(source) == _fingerprints(SOURCE)
+
+
+@pytest.mark.parametrize(
+    "source, path",
+    [
+        pytest.param(SOURCE.replace("test_first", "test_other"), "test_file.py", id="function"),
+        pytest.param(SOURCE.replace("mock.Mock()", "mock.Mock(1)"), "test_file.py", id="call"),
+        pytest.param(SOURCE, "test_other.py", id="path"),
+    ],
+)
+def test_fingerprints_changed(source: str, path: str):
+    """
+    given: module with the same problems in other calls, definitions or files
+    when: fingerprints is called
+    then: the fingerprints of the changed problems are different
+    """
+    assert not set(_fingerprints(source, path)) & set(_fingerprints(SOURCE)[:2])
+
+
+def test_fingerprints_non_ascii():
+    """
+    given: problems after non-ASCII characters on the same line
+    when: fingerprints is called
+    then: the fingerprints are the same as for the calls on their own
+    """
+    source = "from unittest import mock\nx = 'é'; mock.Mock()\n"
+
+    assert _fingerprints(source) == _fingerprints("from unittest import mock\nmock.Mock()\n")
+
+
+def test_source_fingerprints_line_breaks():
+    """
+    given: content of a file with characters that str.splitlines breaks lines on above problems
+    when: source_fingerprints is called
+    then: the fingerprints are the same as without the characters
+    """
+    source = f"x = '\x0c\u2028'\n{SOURCE}"
+
+    assert source_fingerprints(
+        source.encode(), "test_file.py", iter_problems(ast.parse(source))
+    ) == _fingerprints(SOURCE)
+
+
+def test_fingerprints_unknown_end_position():
+    """
+    given: module with problems whose nodes have no end position
+    when: fingerprints is called
+    then: the fingerprints of the problems only depend on their scopes
+    """
+    tree = ast.parse(SOURCE)
+    for node in ast.walk(tree):
+        node.end_lineno = None  # type: ignore[attr-defined]
+    lines = SOURCE.splitlines(keepends=True)
+
+    result = fingerprints(tree, lines, "test_file.py", iter_problems(tree))
+
+    assert result[0] == result[1]
+    assert result[0] != _fingerprints(SOURCE)[0]
+
+
+def test_fingerprints_unknown_position():
+    """
+    given: problem at a position without a node
+    when: fingerprints is called
+    then: the fingerprint only depends on the code and the path
+    """
+    tree = ast.parse(SOURCE)
+    code = MOCK_SPEC_MSG.split()[0]
+
+    result = fingerprints(tree, [], "./test_file.py", [Problem(99, 0, MOCK_SPEC_MSG)])
+
+    assert result == [fingerprint(code, "test_file.py", "", "")]
+
+
+def test_fingerprints_excluded():
+    """
+    given: only problems that can't be accepted
+    when: fingerprints is called
+    then: no fingerprints are returned
+    """
+    problem = Problem(1, 0, "E999 SyntaxError: invalid syntax")
+
+    assert not fingerprints(ast.parse(""), [], "test_file.py", [problem])
+
+
+def test_source_fingerprints_syntax_error():
+    """
+    given: problems in content of a file that can't be parsed
+    when: source_fingerprints is called
+    then: no fingerprints are returned
+    """
+    problem = Problem(1, 0, MOCK_SPEC_MSG)
+
+    assert not source_fingerprints(b"Mock(\n", "test_file.py", [problem])
+
+
+def test_suppress(tmp_path: Path):
+    """
+    given: baseline of a module
+    when: problems are added and lines are inserted before the accepted problems
+    then: only the added problems are reported, the last of the identical calls is reported
+    """
+    write(baseline_path := tmp_path / "baseline.txt", _fingerprints(SOURCE))
+    baseline = Baseline.load(baseline_path)
+    source = (
+        SOURCE.replace("def test_first():\n", "def test_first():\n    x = 1\n    mock.Mock()\n")
+        + "\n\nmock.MagicMock()\n"
+    )
+
+    assert _suppress(source, baseline) == [8, 17]
+
+
+def test_suppress_syntax_error():
+    """
+    given: baseline and a syntax error problem
+    when: suppress is called
+    then: the syntax error is reported
+    """
+    baseline = Baseline(Counter(_fingerprints(SOURCE)))
+    tree = ast.parse(SOURCE)
+    problem = Problem(1, 0, "E999 SyntaxError: invalid syntax")
+
+    assert list(baseline.suppress(tree, SOURCE.splitlines(), "test_file.py", [problem])) == [
+        problem
+    ]
+
+
+def test_suppress_source_syntax_error():
+    """
+    given: baseline and problems in content of a file that can't be parsed
+    when: suppress_source is called
+    then: all the problems are reported
+    """
+    baseline = Baseline(Counter(_fingerprints(SOURCE)))
+    problems = [Problem(1, 0, MOCK_SPEC_MSG)]
+
+    assert baseline.suppress_source(b"Mock(\n", "test_file.py", problems) is problems
+
+
+def test_write_load(tmp_path: Path):
+    """
+    given: fingerprints including duplicates
+    when: the baseline is written and loaded
+    then: the file is sorted with a header and the counts of the fingerprints are loaded
+    """
+    path = tmp_path / "baseline.txt"
+
+    count = write(path, ["b", "a", "b"])
+
+    assert count == 3
+    assert path.read_text(encoding="utf-8") == f"{HEADER}a\nb\nb\n"
+    assert Baseline.load(path).counts == {"a": 1, "b": 2}
+    assert get_baseline(path) is get_baseline(str(path))
+
+
+def test_plugin_baseline(tmp_path: Path, parse_plugin_options: Callable[..., None]):
+    """
+    given: flake8 options with a baseline
+    when: the options are parsed and linting is run
+    then: the accepted problems are only reported if the lines aren't passed to the plugin
+    """
+    baseline_path = tmp_path / "baseline.txt"
+    write(baseline_path, _fingerprints(SOURCE, "test_file.py")[:2])
+    parse_plugin_options(mock_spec_baseline=str(baseline_path))
+    tree = ast.parse(SOURCE)
+
+    results = Plugin(tree, SOURCE.splitlines(keepends=True), "./test_file.py").run()
+    without_lines = Plugin(tree, filename="test_file.py").run()
+
+    assert [(line, msg) for line, _, msg, _ in results] == [(7, PATCH_MSG), (12, MOCK_SPEC_MSG)]
+    assert len(list(without_lines)) == 4
+
+
+def test_main_baseline(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    """
+    given: directory with problems
+    when: the baseline is written, a problem is added and main is called with the baseline
+    then: only the added problem is reported
+    """
+    monkeypatch.chdir(tmp_path)
+    (file := Path("test_file.py")).write_text(SOURCE, encoding="utf-8")
+
+    returncode = main([".", "--write-baseline", "baseline.txt", "--jobs", "1"])
+
+    assert returncode == 0
+    assert "accepted 4 problems in baseline.txt" in capsys.readouterr().err
+    file.write_text(f"{SOURCE}mock.Mock()\n", encoding="utf-8")
+
+    returncode = main([".", "--baseline", "baseline.txt", "--jobs", "1"])
+
+    assert returncode == 1
+    assert capsys.readouterr().out.splitlines() == [f"./test_file.py:13:1: {MOCK_SPEC_MSG}"]
+
+
+def test_main_write_baseline_fix():
+    """
+    given: the write baseline and fix options
+    when: main is called
+    then: the options are rejected
+    """
+    with pytest.raises(SystemExit):
+        main([".", "--write-baseline", "baseline.txt", "--fix"])
+
+
+def test_main_write_baseline_plugin_options(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, parse_plugin_options: Callable[..., None]
+):
+    """
+    given: file with a call of a factory and a target that doesn't exist
+    when: the baseline is written by main with factories and target roots and the plugin is
+        run with the same options
+    then: the problems are only reported by the plugin without the baseline
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(targets.atexit, "register", lambda *_: None)
+    (Path("project") / "pkg").mkdir(parents=True)
+    (Path("project") / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    source = (
+        "from unittest import mock\nfrom tests import fakes\n"
+        "fakes.make_fake_client()\nmock.patch('pkg.missing')\n"
+    )
+    Path("test_file.py").write_text(source, encoding="utf-8")
+    factory = "tests.fakes.make_fake_client"
+    options = {
+        "mock_spec_factories": [factory],
+        "mock_spec_target_roots": ["project"],
+        "mock_spec_target_cache_dir": ".cache",
+    }
+
+    returncode = main(
+        [
+            "test_file.py",
+            "--write-baseline",
+            "baseline.txt",
+            "--jobs",
+            "1",
+            "--factories",
+            factory,
+            "--target-roots",
+            "project",
+            "--cache-dir",
+            ".cache",
+        ]
+    )
+
+    assert returncode == 0
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    parse_plugin_options(**options)
+    results = Plugin(tree, lines, "./test_file.py").run()
+    assert sorted((line, msg.split()[0]) for line, _, msg, _ in results) == [
+        (3, FACTORY_CODE),
+        (4, PATCH_CODE),
+        (4, TARGET_CODE),
+    ]
+    parse_plugin_options(**options, mock_spec_baseline="baseline.txt")
+    assert not list(Plugin(tree, lines, "./test_file.py").run())
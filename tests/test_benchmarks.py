@@ -0,0 +1,313 @@
+"""Tests for the benchmark suite."""
+
+from __future__ import annotations
+
+import ast
+import json
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks import corpus, executors, importtime, run
+
+
+@pytest.mark.parametrize(
+    "corpus_",
+    [
+        pytest.param(corpus_, id=corpus_.name)
+        for corpus_ in (*corpus.generate(scale=0.01), *corpus.generate_rules(scale=0.01))
+    ],
+)
+def test_corpus_valid(corpus_: corpus.Corpus):
+    """
+    given: generated corpus
+    when: the sources are parsed and measured
+    then: the sources are valid Python and the measurements are positive
+    """
+    for source in corpus_.sources:
+        ast.parse(source)
+
+    result = run.measure(corpus_, repeat=1)
+
+    assert result.files == len(corpus_.sources)
+    assert result.nodes > 0
+    assert result.seconds > 0
+    assert result.relative_cost > 0
+
+
+@pytest.mark.parametrize(
+    "relative_cost, peak_memory, expected_regressions",
+    [
+        pytest.param(1.0, 1000, 0, id="same as baseline"),
+        pytest.param(1.2, 1000, 0, id="slower within tolerance"),
+        pytest.param(1.5, 1000, 1, id="slower"),
+        pytest.param(1.0, 1000 + run.MEMORY_SLACK_BYTES, 0, id="more memory within slack"),
+        pytest.param(1.0, 2000 + run.MEMORY_SLACK_BYTES, 1, id="more memory"),
+        pytest.param(1.5, 2000 + run.MEMORY_SLACK_BYTES, 2, id="slower and more memory"),
+    ],
+)
+def test_compare(relative_cost: float, peak_memory: int, expected_regressions: int):
+    """
+    given: result and baseline
+    when: the result is compared against the baseline
+    then: the expected number of regressions are reported
+    """
+    result = run.Result(
+        name="corpus",
+        files=1,
+        nodes=1,
+        problems=0,
+        seconds=1.0,
+        relative_cost=relative_cost,
+        peak_memory=peak_memory,
+    )
+    baseline = {"corpus": {"relative_cost": 1.0, "peak_memory": 1000}}
+
+    assert len(run.compare((result,), baseline, tolerance=0.25)) == expected_regressions
+
+
+def test_compare_missing_baseline():
+    """
+    given: result for a corpus that is not in the baseline
+    when: the result is compared against the baseline
+    then: no regressions are reported
+    """
+    result = run.Result(
+        name="new", files=1, nodes=1, problems=0, seconds=1.0, relative_cost=9.0, peak_memory=9
+    )
+
+    assert not run.compare((result,), {}, tolerance=0.25)
+
+
+BENCHMARK_ARGS = ["--scale", "0.01", "--repeat", "1"]
+
+
+def test_main_save_baseline(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: the benchmarks
+    when: main is run with --save-baseline and then against the saved baseline
+    then: the cost of every corpus and of the import is written and the second run passes
+    """
+    baseline_path = tmp_path / "baseline.json"
+
+    returncode = run.main([*BENCHMARK_ARGS, "--baseline", str(baseline_path), "--save-baseline"])
+
+    assert returncode == 0
+    assert f"baseline written to {baseline_path}" in capsys.readouterr().out
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    assert set(baseline) == {
+        *(corpus_.name for corpus_ in corpus.generate(scale=0.01)),
+        *(f"rule/{rule.name}" for rule in corpus.generate_rules(scale=0.01)),
+        importtime.BASELINE_KEY,
+    }
+    assert all(
+        set(expected) == {"relative_cost", "peak_memory"}
+        for name, expected in baseline.items()
+        if name != importtime.BASELINE_KEY
+    )
+
+    # The timings of tiny corpora are noisy
+    assert run.main([*BENCHMARK_ARGS, "--baseline", str(baseline_path), "--tolerance", "9"]) == 0
+
+
+def test_main_missing_baseline(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: the benchmarks and no baseline
+    when: main is run
+    then: the results are displayed, creating the baseline is suggested and 0 is returned
+    """
+    returncode = run.main([*BENCHMARK_ARGS, "--baseline", str(tmp_path / "missing.json")])
+
+    assert returncode == 0
+    output = capsys.readouterr().out
+    assert "files/s" in output
+    assert f"import {importtime.PACKAGE}: " in output
+    assert "run with --save-baseline" in output
+
+
+@pytest.mark.parametrize(
+    "baseline, expected_regressions",
+    [
+        pytest.param(
+            {"mock_heavy": {"relative_cost": 0, "peak_memory": 0}},
+            ["REGRESSION mock_heavy"],
+            id="corpus",
+        ),
+        pytest.param(
+            {
+                "mock_heavy": {"relative_cost": 0, "peak_memory": 0},
+                importtime.BASELINE_KEY: {"modules": 0},
+            },
+            ["REGRESSION mock_heavy", f"REGRESSION {importtime.BASELINE_KEY}"],
+            id="corpus and import",
+        ),
+    ],
+)
+def test_main_regression(
+    baseline: dict[str, dict[str, float]],
+    expected_regressions: list[str],
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+):
+    """
+    given: the benchmarks and a baseline that the checker can't match
+    when: main is run
+    then: the regressions are reported and 1 is returned
+    """
+    (baseline_path := tmp_path / "baseline.json").write_text(
+        json.dumps(baseline), encoding="utf-8"
+    )
+
+    returncode = run.main([*BENCHMARK_ARGS, "--baseline", str(baseline_path)])
+
+    assert returncode == 1
+    regressions = capsys.readouterr().err.splitlines()
+    assert len(regressions) == len(expected_regressions)
+    assert all(
+        f"{expected}: " in regression
+        for regression, expected in zip(regressions, expected_regressions)
+    )
+
+
+def test_main_module(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    given: the benchmarks package
+    when: it is run as a module
+    then: the benchmarks are run and the interpreter exits with their return code
+    """
+    monkeypatch.setattr(
+        sys, "argv", ["benchmarks", *BENCHMARK_ARGS, "--baseline", str(tmp_path / "missing.json")]
+    )
+
+    with pytest.raises(SystemExit, match="^0$"):
+        runpy.run_module("benchmarks", run_name="__main__")
+
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:        10 |         10 |     _ast
+import time:        20 |         30 |   ast
+import time:        40 |         70 | flake8_mock_spec
+import time:        50 |         50 | other
+"""
+
+
+def test_importtime_parse():
+    """
+    given: output of python -X importtime
+    when: the output is parsed
+    then: the cumulative time and the modules nested under the package are returned
+    """
+    result = importtime.parse(IMPORTTIME_OUTPUT)
+
+    assert result.seconds == pytest.approx(70 / 1_000_000)
+    assert result.modules == ("_ast", "ast", importtime.PACKAGE)
+
+
+def test_importtime_parse_first():
+    """
+    given: output of python -X importtime in which the package is the first top level module
+    when: the output is parsed
+    then: all the modules before the package are nested under it
+    """
+    result = importtime.parse(IMPORTTIME_OUTPUT.replace("| site", "|   site"))
+
+    assert result.modules == ("site", "_ast", "ast", importtime.PACKAGE)
+
+
+def test_importtime_parse_missing():
+    """
+    given: output of python -X importtime that doesn't include the package
+    when: the output is parsed
+    then: ValueError is raised
+    """
+    with pytest.raises(ValueError):
+        importtime.parse(IMPORTTIME_OUTPUT, package="missing")
+
+
+def test_importtime_measure():
+    """
+    given: the package
+    when: the cost of importing it is measured
+    then: none of the forbidden modules are imported and the import is within the baseline
+    """
+    result = importtime.measure(repeat=1)
+
+    assert result.seconds > 0
+    assert result.modules[-1] == importtime.PACKAGE
+    baseline = json.loads(run.BASELINE_PATH.read_text(encoding="utf-8"))
+    assert not importtime.compare(
+        result, baseline[importtime.BASELINE_KEY], tolerance=run.DEFAULT_TOLERANCE
+    )
+
+
+@pytest.mark.parametrize(
+    "modules, expected_regressions",
+    [
+        pytest.param(("ast", importtime.PACKAGE), 0, id="within baseline"),
+        pytest.param(("ast", "typing", importtime.PACKAGE), 1, id="more modules"),
+        pytest.param(("asyncio.events", importtime.PACKAGE), 1, id="forbidden submodule"),
+        pytest.param(("unittest", importtime.PACKAGE), 0, id="parent of forbidden"),
+        pytest.param(("inspect", "unittest.mock", importtime.PACKAGE), 3, id="forbidden and more"),
+    ],
+)
+def test_importtime_compare(modules: tuple[str, ...], expected_regressions: int):
+    """
+    given: the modules imported by the package and a baseline
+    when: the result is compared against the baseline
+    then: the expected number of regressions are reported
+    """
+    result = importtime.ImportResult(seconds=1.0, modules=modules)
+
+    regressions = importtime.compare(result, {"modules": 2}, tolerance=0.25)
+
+    assert len(regressions) == expected_regressions
+
+
+def test_executors_main(capsys: pytest.CaptureFixture[str]):
+    """
+    given: the executors benchmark
+    when: main is run at a small scale
+    then: every executor is timed, they find the same problems and 0 is returned
+    """
+    returncode = executors.main(["--scale", "0.005", "--repeat", "1", "--jobs", "2"])
+
+    assert returncode == 0
+    output = capsys.readouterr().out
+    assert all(executor in output for executor in executors.EXECUTORS)
+
+
+def test_executors_main_mismatch(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    """
+    given: the executors benchmark with a pool of threads that finds different problems
+    when: main is run
+    then: the mismatch is reported and 1 is returned
+    """
+    monkeypatch.setattr(
+        executors, "check_files", lambda paths, jobs, threads: iter([threads] * len(paths))
+    )
+
+    returncode = executors.main(["--scale", "0.005", "--repeat", "1", "--jobs", "2"])
+
+    assert returncode == 1
+    assert f"MISMATCH {executors.EXECUTOR_THREADS}" in capsys.readouterr().err
+
+
+def test_executors_main_module(monkeypatch: pytest.MonkeyPatch):
+    """
+    given: the executors benchmark
+    when: it is run as a module
+    then: the interpreter exits with the return code of main
+    """
+    monkeypatch.setattr(
+        sys, "argv", ["executors", "--scale", "0.005", "--repeat", "1", "--jobs", "2"]
+    )
+    # Executed again as __main__ rather than reusing the imported module
+    monkeypatch.delitem(sys.modules, executors.__name__)
+
+    with pytest.raises(SystemExit, match="^0$"):
+        runpy.run_module("benchmarks.executors", run_name="__main__")
@@ -0,0 +1,183 @@
+"""Tests for the per-file budget of the traversal."""
+
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+from typing import Callable, Iterable
+
+import pytest
+
+from flake8_mock_spec import (
+    BUDGET_CODE,
+    MOCK_SPEC_MSG,
+    Budget,
+    Check,
+    MockSpecCheck,
+    Plugin,
+    Problem,
+    iter_problems,
+    traverse,
+)
+from flake8_mock_spec.baseline import fingerprints
+from flake8_mock_spec.cli import check_file, main
+
+CALLS = 20
+SOURCE = "from unittest import mock\n" + "mock.Mock()\n" * CALLS
+
+
+class FinishingCheck(Check):
+    """Reports a problem when it finishes.
+
+    Attrs:
+        finished: Whether finish was called.
+    """
+
+    def __init__(self) -> None:
+        """Construct."""
+        self.finished = False
+
+    def visit_Name(self, node: ast.Name) -> None:  # pylint: disable=invalid-name
+        """Visit a name, the traversal can't skip any nodes.
+
+        Args:
+            node: The name.
+        """
+
+    def finish(self) -> Iterable[Problem]:
+        """Record that the check finished.
+
+        Returns:
+            A problem.
+        """
+        self.finished = True
+        return (Problem(1, 0, "TST001 finished"),)
+
+
+@pytest.mark.parametrize(
+    "checks",
+    [
+        pytest.param(lambda: (MockSpecCheck(),), id="calls only"),
+        pytest.param(lambda: (MockSpecCheck(), FinishingCheck()), id="all nodes"),
+    ],
+)
+def test_traverse_max_nodes(checks):
+    """
+    given: module with many problems and a budget of fewer nodes than the module has
+    when: traverse is called
+    then: the problems before the budget ran out are yielded followed by the budget problem on
+        the line the traversal stopped at and the checks don't finish
+    """
+    tree = ast.parse(SOURCE)
+    checks = checks()
+
+    problems = list(traverse(tree, checks, budget=Budget(max_nodes=12)))
+
+    *found, budget_problem = problems
+    assert 0 < len(found) < CALLS
+    assert all(problem.msg == MOCK_SPEC_MSG for problem in found)
+    assert budget_problem.msg.startswith(f"{BUDGET_CODE} ")
+    assert "12 nodes" in budget_problem.msg
+    assert budget_problem.lineno >= found[-1].lineno
+    assert not any(getattr(check, "finished", False) for check in checks)
+
+
+@pytest.mark.parametrize(
+    "budget",
+    [
+        pytest.param(None, id="none"),
+        pytest.param(Budget(), id="unlimited"),
+        pytest.param(Budget(max_nodes=10_000, max_seconds=60), id="within"),
+    ],
+)
+def test_traverse_within_budget(budget: Budget | None):
+    """
+    given: module and a budget that isn't exceeded
+    when: traverse is called
+    then: all the problems are yielded and the checks finish
+    """
+    tree = ast.parse(SOURCE)
+    check = FinishingCheck()
+
+    problems = list(traverse(tree, (MockSpecCheck(), check), budget=budget))
+
+    assert len(problems) == CALLS + 1
+    assert check.finished
+
+
+def test_iter_problems_max_seconds():
+    """
+    given: module with more nodes than are visited between reading the clock and no time budget
+    when: iter_problems is called
+    then: the traversal stops when the clock is first read and the budget problem is yielded
+    """
+    tree = ast.parse("from unittest import mock\n" + "mock.Mock(spec=1)\n" * 1000)
+
+    problems = list(iter_problems(tree, budget=Budget(max_seconds=0)))
+
+    ((_, _, msg),) = problems
+    assert msg.startswith(f"{BUDGET_CODE} ")
+    assert "0 seconds" in msg
+
+
+def test_plugin_budget(parse_plugin_options: Callable[..., None]):
+    """
+    given: flake8 options with a node budget
+    when: the options are parsed and linting is run
+    then: the problems found before the budget ran out are reported followed by the budget problem
+    """
+    parse_plugin_options(mock_spec_max_nodes=12)
+
+    results = list(Plugin(ast.parse(SOURCE), SOURCE.splitlines(keepends=True)).run())
+
+    assert Plugin.budget == Budget(max_nodes=12)
+    assert 0 < len(results) < CALLS + 1
+    assert results[-1][2].startswith(f"{BUDGET_CODE} ")
+
+
+def test_baseline_excludes_budget():
+    """
+    given: problems including the budget problem
+    when: the fingerprints are calculated for a baseline
+    then: the budget problem is not accepted
+    """
+    tree = ast.parse(SOURCE)
+
+    problems = list(iter_problems(tree, budget=Budget(max_nodes=12)))
+
+    assert len(fingerprints(tree, SOURCE.splitlines(), "test.py", problems)) == len(problems) - 1
+
+
+def test_check_file_budget_not_cached(tmp_path: Path):
+    """
+    given: file that exceeds the budget and a cache
+    when: check_file is called with the budget and then without it
+    then: the partial problems are not cached so that all the problems are found without it
+    """
+    (path := tmp_path / "test_file.py").write_text(SOURCE, encoding="utf-8")
+    cache_directory = tmp_path / "cache"
+
+    partial = check_file(str(path), cache_directory, budget=Budget(max_nodes=12))
+    complete = check_file(str(path), cache_directory)
+
+    assert partial.problems[-1].msg.startswith(f"{BUDGET_CODE} ")
+    assert len(complete.problems) == CALLS
+
+
+def test_main_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    """
+    given: file that exceeds the node budget
+    when: main is called with the budget
+    then: the budget problem is reported after the problems found before the budget ran out
+    """
+    monkeypatch.chdir(tmp_path)
+    Path("test_file.py").write_text(SOURCE, encoding="utf-8")
+
+    returncode = main(["test_file.py", "--max-nodes", "12", "--no-cache", "--jobs", "1"])
+
+    assert returncode == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert 0 < len(lines) < CALLS + 1
+    assert f": {BUDGET_CODE} " in lines[-1]
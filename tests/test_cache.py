@@ -0,0 +1,175 @@
+"""Tests for the result cache."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from pathlib import Path
+
+import pytest
+
+from flake8_mock_spec import MOCK_SPEC_MSG, PATCH_MSG, Problem, cache
+from flake8_mock_spec.cache import Cache, get_cache
+
+
+def test_load_problems_missing(tmp_path: Path):
+    """
+    given: empty cache
+    when: a key is retrieved
+    then: None is returned
+    """
+    cache_ = Cache(tmp_path / "cache.sqlite3")
+
+    assert cache_.load_problems(cache_.key(b"Mock()")) is None
+
+
+@pytest.mark.parametrize(
+    "problems",
+    [
+        pytest.param([], id="empty"),
+        pytest.param([Problem(1, 2, MOCK_SPEC_MSG)], id="single"),
+        pytest.param([Problem(1, 2, MOCK_SPEC_MSG), Problem(3, 4, PATCH_MSG)], id="multiple"),
+    ],
+)
+def test_store_load_problems(problems: list[Problem], tmp_path: Path):
+    """
+    given: problems stored in the cache
+    when: the key is retrieved from a new connection to the cache
+    then: the problems are returned
+    """
+    path = tmp_path / "cache.sqlite3"
+    key = Cache(path).key(b"Mock()")
+    Cache(path).store_problems(key, problems)
+
+    assert Cache(path).load_problems(key) == problems
+
+
+def test_key(tmp_path: Path):
+    """
+    given: caches for different rules
+    when: keys are calculated
+    then: the keys depend on the content, the rules and the namespace
+    """
+    cache_ = Cache(tmp_path / "cache.sqlite3")
+    other_rules_cache = Cache(tmp_path / "cache.sqlite3", rules=("TMS010",))
+
+    assert cache_.key(b"Mock()") == cache_.key(b"Mock()")
+    assert cache_.key(b"Mock()") != cache_.key(b"Mock(spec=1)")
+    assert cache_.key(b"Mock()") != other_rules_cache.key(b"Mock()")
+    assert cache_.key(b"Mock()") != cache_.key(b"Mock()", namespace="symbols")
+
+
+def test_key_version_unknown(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    given: the package is not installed
+    when: keys are calculated
+    then: the key differs from the key of the installed package
+    """
+    key = Cache(tmp_path / "cache.sqlite3").key(b"Mock()")
+
+    def version(_: str) -> str:
+        """Simulate the package not being installed.
+
+        Raises:
+            PackageNotFoundError: Always.
+        """
+        raise metadata.PackageNotFoundError
+
+    monkeypatch.setattr(metadata, "version", version)
+
+    assert Cache(tmp_path / "cache.sqlite3").key(b"Mock()") != key
+
+
+def test_evict_least_recently_used(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    given: cache with more entries than the maximum where the oldest entry was used recently
+    when: evict is called
+    then: the least recently used entry is removed
+    """
+    now = 0.0
+    monkeypatch.setattr(cache.time, "time", lambda: now)
+    cache_ = Cache(tmp_path / "cache.sqlite3", max_entries=2)
+    for key in ("first", "second", "third"):
+        cache_.store_problems(key, [])
+        now += 1
+    now += cache.TOUCH_INTERVAL_SECONDS + 1
+    cache_.load_problems("first")
+
+    assert cache_.evict() == 1
+    assert len(cache_) == 2
+    assert cache_.load_problems("first") is not None
+    assert cache_.load_problems("second") is None
+    assert cache_.load_problems("third") is not None
+
+
+def test_load_recently_used_not_touched(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    given: entry that was stored within the touch interval
+    when: the entry is retrieved
+    then: the last used time is not updated
+    """
+    monkeypatch.setattr(cache.time, "time", lambda: 0.0)
+    cache_ = Cache(tmp_path / "cache.sqlite3", max_entries=1)
+    cache_.store_problems("first", [])
+    monkeypatch.setattr(cache.time, "time", lambda: 1.0)
+    cache_.store_problems("second", [])
+    monkeypatch.setattr(cache.time, "time", lambda: cache.TOUCH_INTERVAL_SECONDS / 2)
+    cache_.load_problems("first")
+
+    cache_.evict()
+
+    assert cache_.load_problems("first") is None
+    cache_.close()
+
+
+def test_get_cache(tmp_path: Path):
+    """
+    given: cache directory
+    when: get_cache is called multiple times
+    then: the same cache is returned with the latest maximum entries and the directory is ignored
+        by git
+    """
+    directory = tmp_path / "cache"
+
+    first = get_cache(directory)
+    second = get_cache(directory, max_entries=5)
+
+    assert first is second
+    assert second.max_entries == 5
+    assert (directory / ".gitignore").read_text(encoding="utf-8") == "*\n"
+
+
+def test_threads(tmp_path: Path):
+    """
+    given: cache shared by several threads
+    when: the threads store and retrieve problems at the same time, then the cache is closed
+    then: each thread finds the problems it stored and the connections of all threads are closed
+    """
+    cache_ = Cache(tmp_path / "cache.sqlite3")
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def store_and_get(index: int) -> list[Problem] | None:
+        """Store problems and retrieve them once all the threads are ready.
+
+        Args:
+            index: The index of the thread.
+
+        Returns:
+            The problems retrieved by the thread.
+        """
+        key = cache_.key(f"Mock({index})".encode())
+        barrier.wait()
+        cache_.store_problems(key, [Problem(index, 0, MOCK_SPEC_MSG)])
+        return cache_.load_problems(key)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(store_and_get, range(threads)))
+
+    assert results == [[Problem(index, 0, MOCK_SPEC_MSG)] for index in range(threads)]
+    assert len(cache_) == threads
+    cache_.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(cache_)
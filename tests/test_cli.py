@@ -0,0 +1,343 @@
+"""Tests for the standalone command line interface."""
+
+from __future__ import annotations
+
+import json
+import runpy
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from flake8_mock_spec import FACTORY_MSG_BASE, MOCK_SPEC_MSG, PATCH_MSG, Problem
+from flake8_mock_spec.cache import get_cache
+from flake8_mock_spec.cli import SYNTAX_ERROR_CODE, check_source, discover, main
+
+from .test_diff import git
+
+IMPORTS_TEXT = "from unittest.mock import *\n"
+IMPORTS = IMPORTS_TEXT.encode()
+
+
+def test_discover(tmp_path: Path):
+    """
+    given: directory with Python files, other files and excluded directories
+    when: discover is called
+    then: the Python files outside of the excluded directories are returned sorted
+    """
+    (tmp_path / "b.py").touch()
+    (tmp_path / "a.py").touch()
+    (tmp_path / "c.txt").touch()
+    (package := tmp_path / "package").mkdir()
+    (package / "d.py").touch()
+    (git_directory := tmp_path / ".git").mkdir()
+    (git_directory / "e.py").touch()
+    (build := tmp_path / "build").mkdir()
+    (build / "f.py").touch()
+
+    files = discover([str(tmp_path)], exclude=(".git", f"{tmp_path}/build"))
+
+    assert files == [str(tmp_path / "a.py"), str(tmp_path / "b.py"), str(package / "d.py")]
+
+
+def test_discover_explicit_file(tmp_path: Path):
+    """
+    given: explicitly passed file that does not end with .py
+    when: discover is called
+    then: the file is returned
+    """
+    (script := tmp_path / "script").touch()
+
+    assert discover([str(script)]) == [str(script)]
+
+
+@pytest.mark.parametrize(
+    "source, expected_msgs",
+    [
+        pytest.param(b"", [], id="empty"),
+        pytest.param(b"print(1)\n", [], id="no needle"),
+        pytest.param(IMPORTS + b"Mock()\n", [MOCK_SPEC_MSG], id="problem"),
+        pytest.param(IMPORTS + b"Mock(spec=1)\n", [], id="no problem"),
+        pytest.param(IMPORTS + b"Mock()  # noqa\n", [], id="noqa"),
+        pytest.param(IMPORTS + b"Mock()  # NOQA:TMS010\n", [], id="noqa code"),
+        pytest.param(IMPORTS + b"Mock()  # noqa: TMS020,TMS010\n", [], id="noqa codes"),
+        pytest.param(IMPORTS + b"Mock()  # noqa: TMS020\n", [MOCK_SPEC_MSG], id="noqa other code"),
+        pytest.param(
+            IMPORTS + b"Mock()  # noqa\npatch()\n", [PATCH_MSG], id="noqa applies to its line only"
+        ),
+        pytest.param(
+            IMPORTS + "x = '\x0c\u2028'\nMock()  # noqa\npatch()\n".encode(),
+            [PATCH_MSG],
+            id="noqa after characters str.splitlines splits on",
+        ),
+        pytest.param(
+            "# coding: latin-1\nfrom unittest.mock import *\nMock()  # é\n".encode("latin-1"),
+            [MOCK_SPEC_MSG],
+            id="encoding cookie",
+        ),
+    ],
+)
+def test_check_source(source: bytes, expected_msgs: list[str]):
+    """
+    given: source
+    when: check_source is called
+    then: the expected problems are returned
+    """
+    assert [problem.msg for problem in check_source(source)] == expected_msgs
+
+
+def test_check_source_syntax_error():
+    """
+    given: source that mentions a mock and has a syntax error
+    when: check_source is called
+    then: a syntax error problem is returned
+    """
+    (problem,) = check_source(b"Mock(\n")
+
+    assert problem.msg.startswith(f"{SYNTAX_ERROR_CODE} SyntaxError")
+
+
+def test_check_source_threads():
+    """
+    given: sources with a different number of problems each
+    when: check_source is called for all of them by several threads at the same time
+    then: each thread gets the same problems as checking the source on its own
+    """
+    sources = [
+        IMPORTS
+        + b"".join(b"Mock()\npatch()\n" if line % 2 else b"x = 1\n" for line in range(size))
+        for size in range(32)
+    ]
+    expected = [check_source(source) for source in sources]
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def check_all(_: int) -> list[list[Problem]]:
+        """Check all the sources once all the threads are ready.
+
+        Args:
+            _: The index of the thread.
+
+        Returns:
+            The problems found in each source.
+        """
+        barrier.wait()
+        return [check_source(source) for source in sources]
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(check_all, range(threads)))
+
+    assert results == [expected] * threads
+
+
+@pytest.mark.parametrize(
+    "pool_args",
+    [
+        pytest.param(["--jobs", "1"], id="serial"),
+        pytest.param(["--jobs", "2"], id="pool"),
+        pytest.param(["--jobs", "2", "--threads"], id="threads"),
+    ],
+)
+def test_main(pool_args: list[str], tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: directory with files with and without problems
+    when: main is called
+    then: the problems are printed in the flake8 format and 1 is returned
+    """
+    (first := tmp_path / "test_first.py").write_text(
+        f"{IMPORTS_TEXT}x = 1\nMock()\n", encoding="utf-8"
+    )
+    (tmp_path / "test_second.py").write_text(f"{IMPORTS_TEXT}Mock(spec=1)\n", encoding="utf-8")
+    (third := tmp_path / "test_third.py").write_text(
+        f"{IMPORTS_TEXT}def f():\n    patch()", encoding="utf-8"
+    )
+    cache_dir = tmp_path / ".cache"
+    expected_output = [f"{first}:3:1: {MOCK_SPEC_MSG}", f"{third}:3:5: {PATCH_MSG}"]
+
+    returncode = main([str(tmp_path), *pool_args, "--cache-dir", str(cache_dir)])
+
+    assert returncode == 1
+    assert capsys.readouterr().out.splitlines() == expected_output
+    assert len(get_cache(cache_dir)) == 3
+
+    cached_returncode = main([str(tmp_path), *pool_args, "--cache-dir", str(cache_dir)])
+
+    assert cached_returncode == 1
+    assert capsys.readouterr().out.splitlines() == expected_output
+
+
+def test_main_cache_eviction(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: directory with more files than the maximum number of cache entries
+    when: main is called
+    then: the cache is trimmed to the maximum number of entries
+    """
+    for index in range(3):
+        (tmp_path / f"test_{index}.py").write_text(
+            f"{IMPORTS_TEXT}Mock({index})\n", encoding="utf-8"
+        )
+    cache_dir = tmp_path / ".cache"
+
+    main([str(tmp_path), "--cache-dir", str(cache_dir), "--cache-max-entries", "2"])
+
+    assert len(capsys.readouterr().out.splitlines()) == 3
+    assert len(get_cache(cache_dir)) == 2
+
+
+def test_main_factories(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: file with a call of a factory
+    when: main is called with and without the factory, using the same cache
+    then: the call is only reported with the factory
+    """
+    (file := tmp_path / "test_file.py").write_text(
+        "from tests import fakes\nfakes.make_fake_client()\n", encoding="utf-8"
+    )
+    cache_args = ["--cache-dir", str(tmp_path / ".cache")]
+    factory_msg = FACTORY_MSG_BASE % ("tests.fakes.make_fake_client", "spec, spec_set")
+
+    returncode = main([str(file), *cache_args, "--factories", " tests.fakes.make_fake_client,"])
+
+    assert returncode == 1
+    assert capsys.readouterr().out.splitlines() == [f"{file}:2:1: {factory_msg}"]
+
+    returncode = main([str(file), *cache_args])
+
+    assert returncode == 0
+    assert not capsys.readouterr().out
+
+
+def test_main_factories_invalid():
+    """
+    given: invalid definition of a factory
+    when: main is called with the factory
+    then: the option is rejected
+    """
+    with pytest.raises(SystemExit):
+        main([".", "--factories", "make_fake_client"])
+
+
+def test_main_statistics_count(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: files with problems
+    when: main is called with statistics and count
+    then: the problems are followed by the number of problems of each code and the total
+    """
+    (tmp_path / "test_first.py").write_text(f"{IMPORTS_TEXT}Mock()\npatch()\n", encoding="utf-8")
+    (tmp_path / "test_second.py").write_text(f"{IMPORTS_TEXT}Mock()\n", encoding="utf-8")
+
+    returncode = main([str(tmp_path), "--no-cache", "--statistics", "--count"])
+
+    assert returncode == 1
+    assert capsys.readouterr().out.splitlines()[3:] == [
+        f"2     {MOCK_SPEC_MSG}",
+        f"1     {PATCH_MSG}",
+        "3",
+    ]
+
+
+@pytest.mark.parametrize("format_", ["jsonl", "sarif"])
+def test_main_format_output_file(format_: str, tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: files with problems
+    when: main is called with a machine readable format and an output file
+    then: the report with the summary is written to the file and nothing is printed
+    """
+    (tmp_path / "test_first.py").write_text(f"{IMPORTS_TEXT}Mock()\npatch()\n", encoding="utf-8")
+    (tmp_path / "test_second.py").write_text(f"{IMPORTS_TEXT}Mock(spec=1)\n", encoding="utf-8")
+    output_file = tmp_path / "report.out"
+
+    returncode = main(
+        [str(tmp_path), "--no-cache", "--format", format_, "--output-file", str(output_file)]
+    )
+
+    assert returncode == 1
+    assert not capsys.readouterr().out
+    content = output_file.read_text(encoding="utf-8")
+    if format_ == "jsonl":
+        *records, summary = (json.loads(line) for line in content.splitlines())
+        assert len(records) == 2
+        summary = summary["summary"]
+    else:
+        (run,) = json.loads(content)["runs"]
+        assert len(run["results"]) == 2
+        summary = run["properties"]["summary"]
+    assert summary["by_code"] == {"TMS010": 1, "TMS020": 1}
+    assert summary["by_file"] == {str(tmp_path / "test_first.py"): 2}
+
+
+def test_main_no_problems(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: directory with files without problems
+    when: main is called
+    then: nothing is printed and 0 is returned
+    """
+    (tmp_path / "test_first.py").write_text("Mock(spec=1)\n", encoding="utf-8")
+
+    assert main([str(tmp_path), "--jobs", "auto", "--no-cache"]) == 0
+    assert not capsys.readouterr().out
+    assert not (tmp_path / ".flake8_mock_spec_cache").exists()
+
+
+def test_module_entry_point(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    """
+    given: file with a problem
+    when: the package is run as a module
+    then: the problem is printed and the interpreter exits with a non-zero code
+    """
+    (code_file := tmp_path / "test_source.py").write_text(
+        f"{IMPORTS_TEXT}Mock()\n", encoding="utf-8"
+    )
+    monkeypatch.setattr(sys, "argv", ["flake8_mock_spec", str(code_file), "--no-cache"])
+
+    # Run in this process rather than a subprocess so that the coverage of the module is measured
+    with pytest.raises(SystemExit, match="^1$"):
+        runpy.run_module("flake8_mock_spec", run_name="__main__")
+
+    assert capsys.readouterr().out == f"{code_file}:2:1: {MOCK_SPEC_MSG}\n"
+
+
+def test_main_diff_base(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    """
+    given: repository with problems on lines that changed and did not change since a branch
+    when: main is called with the branch as the diff base
+    then: only the problems on the changed lines of the files in the paths are printed
+    """
+    git(tmp_path, "init", "--initial-branch=main")
+    (tests := tmp_path / "tests").mkdir()
+    (tests / "test_changed.py").write_text(f"{IMPORTS_TEXT}Mock()\n", encoding="utf-8")
+    (tmp_path / "test_outside.py").write_text("x = 1\n", encoding="utf-8")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-m", "initial")
+    (tests / "test_changed.py").write_text(f"{IMPORTS_TEXT}Mock()\nMock()\n", encoding="utf-8")
+    (tests / "test_new.py").write_text(f"{IMPORTS_TEXT}patch()\n", encoding="utf-8")
+    (tmp_path / "test_outside.py").write_text(f"{IMPORTS_TEXT}Mock()\n", encoding="utf-8")
+    git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+
+    returncode = main(["tests", "--diff-base", "main", "--no-cache"])
+
+    assert returncode == 1
+    assert capsys.readouterr().out.splitlines() == [
+        f"{Path('tests', 'test_changed.py')}:3:1: {MOCK_SPEC_MSG}",
+        f"{Path('tests', 'test_new.py')}:2:1: {PATCH_MSG}",
+    ]
+
+
+def test_main_diff_base_git_error(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    given: directory that is not a git repository
+    when: main is called with a diff base
+    then: the command exits with a usage error
+    """
+    monkeypatch.chdir(tmp_path)
+
+    # The exit code is the message of SystemExit
+    with pytest.raises(SystemExit, match="^2$"):
+        main(["--diff-base", "main", "--no-cache"])
@@ -0,0 +1,154 @@
+"""Tests for finding the changed lines using git."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from flake8_mock_spec.diff import ALL_LINES, GitError, changed_lines, in_ranges, parse_diff
+
+DIFF = """\
+diff --git a/added.py b/added.py
+new file mode 100644
+--- /dev/null
++++ b/added.py
+@@ -0,0 +1,3 @@
++a
++b
++c
+diff --git a/deleted.py b/deleted.py
+deleted file mode 100644
+--- a/deleted.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-a
+-b
+diff --git a/modified.py b/modified.py
+--- a/modified.py
++++ b/modified.py
+@@ -10,0 +11,2 @@ def function():
++a
++b
+@@ -2 +2 @@
+-a
++b
+@@ -20,3 +22,0 @@
+-a
+-b
+-c
+diff --git a/only_deleted_lines.py b/only_deleted_lines.py
+--- a/only_deleted_lines.py
++++ b/only_deleted_lines.py
+@@ -1 +0,0 @@
+-a
+"""
+
+
+def test_parse_diff():
+    """
+    given: git diff output with added, deleted and modified files
+    when: parse_diff is called
+    then: the sorted ranges of added lines are returned for files with added lines
+    """
+    assert parse_diff(DIFF) == {"added.py": [(1, 3)], "modified.py": [(2, 2), (11, 12)]}
+
+
+@pytest.mark.parametrize(
+    "lineno, expected",
+    [
+        pytest.param(1, False, id="before first range"),
+        pytest.param(2, True, id="single line range"),
+        pytest.param(3, False, id="between ranges"),
+        pytest.param(11, True, id="start of range"),
+        pytest.param(12, True, id="end of range"),
+        pytest.param(13, False, id="after last range"),
+    ],
+)
+def test_in_ranges(lineno: int, expected: bool):
+    """
+    given: sorted ranges
+    when: in_ranges is called
+    then: whether the line is in any of the ranges is returned
+    """
+    assert in_ranges(lineno, [(2, 2), (11, 12)]) == expected
+
+
+def git(repository: Path, *args: str) -> None:
+    """Run git in a repository.
+
+    Args:
+        repository: The directory of the repository.
+        args: The arguments to git.
+    """
+    subprocess.run(
+        ("git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args),
+        cwd=repository,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture(name="repository")
+def fixture_repository(tmp_path: Path) -> Path:
+    """Create a git repository with a committed Python file.
+
+    Args:
+        tmp_path: Temporary directory for the repository.
+
+    Returns:
+        The directory of the repository.
+    """
+    git(tmp_path, "init", "--initial-branch=main")
+    (tmp_path / "committed.py").write_text("a = 1\nb = 2\nc = 3\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("readme\n", encoding="utf-8")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-m", "initial")
+    return tmp_path
+
+
+def test_changed_lines(repository: Path):
+    """
+    given: repository with committed, uncommitted and untracked changes since a branch
+    when: changed_lines is called against the branch
+    then: the changed lines of Python files in both commits and the working tree are returned
+        and all the lines of untracked Python files that aren't ignored
+    """
+    git(repository, "checkout", "-b", "feature")
+    (repository / "committed.py").write_text("a = 1\nb = 20\nc = 3\n", encoding="utf-8")
+    (repository / "README.md").write_text("changed\n", encoding="utf-8")
+    git(repository, "commit", "-am", "change")
+    (repository / "new.py").write_text("x = 1\n", encoding="utf-8")
+    git(repository, "add", "new.py")
+    (repository / "untracked.py").write_text("y = 1\n", encoding="utf-8")
+    (repository / "ignored.py").write_text("z = 1\n", encoding="utf-8")
+    (repository / ".git" / "info" / "exclude").write_text("ignored.py\n", encoding="utf-8")
+
+    assert changed_lines("main", cwd=repository) == {
+        "committed.py": [(2, 2)],
+        "new.py": [(1, 1)],
+        "untracked.py": [ALL_LINES],
+    }
+
+
+def test_changed_lines_invalid_ref(repository: Path):
+    """
+    given: repository
+    when: changed_lines is called against a ref that doesn't exist
+    then: GitError is raised
+    """
+    with pytest.raises(GitError):
+        changed_lines("does-not-exist", cwd=repository)
+
+
+def test_changed_lines_git_not_installed(monkeypatch: pytest.MonkeyPatch, repository: Path):
+    """
+    given: git is not installed
+    when: changed_lines is called
+    then: GitError is raised
+    """
+    monkeypatch.setenv("PATH", "")
+
+    with pytest.raises(GitError):
+        changed_lines("main", cwd=repository)
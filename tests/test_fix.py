@@ -0,0 +1,179 @@
+"""Tests for the fixer of patch calls."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from flake8_mock_spec.cli import main
+from flake8_mock_spec.fix import fix_file, fix_source
+
+IMPORTS = b"from unittest import mock\nfrom unittest.mock import patch\n"
+
+
+@pytest.mark.parametrize(
+    "source, expected_source, expected_fixes",
+    [
+        pytest.param(b"patch('a')\n", b"patch('a')\n", 0, id="no import"),
+        pytest.param(b"from unittest.mock import Mock\nMock()\n", None, 0, id="no patch"),
+        pytest.param(
+            IMPORTS + b"patch('a')\n", IMPORTS + b"patch('a', autospec=True)\n", 1, id="patch"
+        ),
+        pytest.param(
+            IMPORTS + b"@mock.patch.object(a, 'b')\ndef f(): pass\n",
+            IMPORTS + b"@mock.patch.object(a, 'b', autospec=True)\ndef f(): pass\n",
+            1,
+            id="patch.object decorator",
+        ),
+        pytest.param(
+            IMPORTS + b"patch(\n    'a',\n    return_value=1,\n)\n",
+            IMPORTS + b"patch(\n    'a',\n    return_value=1, autospec=True,\n)\n",
+            1,
+            id="multi-line trailing comma",
+        ),
+        pytest.param(
+            IMPORTS + b"patch(('a'))\n",
+            IMPORTS + b"patch(('a'), autospec=True)\n",
+            1,
+            id="parenthesized argument",
+        ),
+        pytest.param(
+            IMPORTS + b"patch(('a'  # comment\n))\n",
+            IMPORTS + b"patch(('a'  # comment\n), autospec=True)\n",
+            1,
+            id="parenthesized argument comment",
+        ),
+        pytest.param(
+            IMPORTS + b"x = '\xc3\xa9'; patch('a'); patch('b')\r\n",
+            IMPORTS + b"x = '\xc3\xa9'; patch('a', autospec=True); patch('b', autospec=True)"
+            b"\r\n",
+            2,
+            id="multiple non-ascii crlf",
+        ),
+        pytest.param(
+            b"# coding: latin-1\n" + IMPORTS + b"x = '\xe9'; patch('a')\n",
+            b"# coding: latin-1\n" + IMPORTS + b"x = '\xe9'; patch('a', autospec=True)\n",
+            1,
+            id="encoding cookie",
+        ),
+        pytest.param(
+            IMPORTS + b"patch(patch('a'))\n",
+            IMPORTS + b"patch(patch('a', autospec=True), autospec=True)\n",
+            2,
+            id="nested",
+        ),
+        pytest.param(IMPORTS + b"patch('a', new=1)\n", None, 0, id="no problem"),
+        pytest.param(IMPORTS + b"patch('a', 1)\n", None, 0, id="new positional"),
+        pytest.param(IMPORTS + b"patch.object(a, 'b', 1)\n", None, 0, id="object new positional"),
+        pytest.param(IMPORTS + b"patch(*args)\n", None, 0, id="starred"),
+        pytest.param(IMPORTS + b"patch('a', **kwargs)\n", None, 0, id="double starred"),
+        pytest.param(IMPORTS + b"patch('a', create=True)\n", None, 0, id="create"),
+        pytest.param(
+            IMPORTS + b"patch.object(a, 'b', create=False)\n", None, 0, id="object create"
+        ),
+        pytest.param(IMPORTS + b"patch('a', spec=True)\n", None, 0, id="only fixed calls"),
+        pytest.param(IMPORTS + b"patch('a')  # noqa\n", None, 0, id="noqa"),
+        pytest.param(IMPORTS + b"patch.multiple('a')\n", None, 0, id="patch.multiple"),
+        pytest.param(IMPORTS + b"patch('a'\n", None, 0, id="syntax error"),
+    ],
+)
+def test_fix_source(source: bytes, expected_source: bytes | None, expected_fixes: int):
+    """
+    given: source
+    when: fix_source is called
+    then: autospec=True is inserted into the fixable calls and the rest is unchanged
+    """
+    fixed, fixes = fix_source(source)
+
+    assert fixed == (source if expected_source is None else expected_source)
+    assert fixes == expected_fixes
+
+
+def test_fix_file_diff(tmp_path: Path):
+    """
+    given: file with a fixable call
+    when: fix_file is called without writing
+    then: the file is unchanged and the diff of the fix is returned
+    """
+    (file := tmp_path / "test_file.py").write_bytes(IMPORTS + b"patch('a')\n")
+
+    file_fix = fix_file(str(file), write=False)
+
+    assert file.read_bytes() == IMPORTS + b"patch('a')\n"
+    assert file_fix.fixes == 1
+    assert "-patch('a')\n+patch('a', autospec=True)\n" in file_fix.diff
+
+
+def test_fix_file_diff_line_breaks(tmp_path: Path):
+    """
+    given: file with a fixable call after a line with characters python treats as line breaks
+    when: fix_file is called without writing
+    then: the diff only breaks lines on the line endings of the file
+    """
+    (file := tmp_path / "test_file.py").write_bytes(
+        IMPORTS + "x = '\x0c\u2028'\npatch('a')\n".encode()
+    )
+
+    file_fix = fix_file(str(file), write=False)
+
+    assert "-patch('a')\n+patch('a', autospec=True)\n" in file_fix.diff
+    assert " x = '\x0c\u2028'\n" in file_fix.diff
+
+
+@pytest.mark.parametrize(
+    "pool_args",
+    [
+        pytest.param(["--jobs", "1"], id="serial"),
+        pytest.param(["--jobs", "2"], id="pool"),
+        pytest.param(["--jobs", "2", "--threads"], id="threads"),
+    ],
+)
+def test_main_fix(pool_args: list[str], tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: files with fixable calls
+    when: main is called with --fix
+    then: the files are fixed and a summary is printed
+    """
+    (first := tmp_path / "test_first.py").write_bytes(IMPORTS + b"patch('a')\npatch('b')\n")
+    (second := tmp_path / "test_second.py").write_bytes(IMPORTS + b"patch('a', new=1)\n")
+    (third := tmp_path / "test_third.py").write_bytes(IMPORTS + b"patch.object(a, 'b')\n")
+
+    returncode = main([str(tmp_path), "--fix", *pool_args])
+
+    assert returncode == 0
+    assert first.read_bytes() == (
+        IMPORTS + b"patch('a', autospec=True)\npatch('b', autospec=True)\n"
+    )
+    assert second.read_bytes() == IMPORTS + b"patch('a', new=1)\n"
+    assert third.read_bytes() == IMPORTS + b"patch.object(a, 'b', autospec=True)\n"
+    assert capsys.readouterr().err == "fixed 3 calls in 2 files\n"
+    assert main([str(tmp_path), "--no-cache"]) == 0
+
+
+def test_main_fix_diff(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """
+    given: file with a fixable call
+    when: main is called with --fix --diff
+    then: the diff is printed, the file is unchanged and 1 is returned
+    """
+    (file := tmp_path / "test_file.py").write_bytes(IMPORTS + b"patch('a')\n")
+
+    returncode = main([str(tmp_path), "--fix", "--diff"])
+
+    assert returncode == 1
+    assert file.read_bytes() == IMPORTS + b"patch('a')\n"
+    output = capsys.readouterr()
+    assert f"+++ {file}" in output.out
+    assert "+patch('a', autospec=True)" in output.out
+    assert output.err == "would fix 1 calls in 1 files\n"
+
+
+def test_main_diff_without_fix(tmp_path: Path):
+    """
+    given: no --fix argument
+    when: main is called with --diff
+    then: the usage error exits
+    """
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), "--diff"])
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import subprocess
 import sys
 from pathlib import Path
@@ -10,13 +11,16 @@ import pytest
 
 from flake8_mock_spec import (
     ASYNC_MOCK_SPEC_CODE,
+    FACTORY_CODE,
     MAGIC_MOCK_SPEC_CODE,
+    MAGIC_MOCK_SPEC_MSG,
     MOCK_SPEC_CODE,
     MOCK_SPEC_MSG,
     NON_CALLABLE_MOCK_SPEC_CODE,
     PATCH_CODE,
     PATCH_MULTIPLE_CODE,
     PATCH_OBJECT_CODE,
+    TARGET_CODE,
 )
 
 
@@ -69,6 +73,129 @@ def test_fail(tmp_path: Path):
         assert proc.returncode
 
 
+def test_max_problems(tmp_path: Path):
+    """
+    given: file with more problems than the maximum number of problems
+    when: flake8 is run against the code with the maximum number of problems
+    then: only the maximum number of problems are reported
+    """
+    code_file = create_code_file(
+        "from unittest import mock\n\nmock.Mock()\nmock.Mock()\nmock.Mock()\n", tmp_path
+    )
+
+    with subprocess.Popen(
+        f"{sys.executable} -m flake8 --mock-spec-max-problems 2 {code_file}",
+        stdout=subprocess.PIPE,
+        shell=True,
+    ) as proc:
+        stdout = proc.communicate()[0].decode(encoding="utf-8")
+
+        assert stdout.count(MOCK_SPEC_MSG) == 2
+        assert proc.returncode
+
+
+def test_factories_config(tmp_path: Path):
+    """
+    given: file calling factories registered in the flake8 configuration
+    when: flake8 is run against the code
+    then: the calls without any of the configured arguments are reported
+    """
+    code_file = create_code_file(
+        "from fakes import make_client, make_server\n\nmake_client()\nmake_server(wraps=1)\n",
+        tmp_path,
+    )
+    (config_file := tmp_path / ".flake8").write_text(
+        "[flake8]\nmock-spec-factories =\n    fakes.make_client\n    fakes.make_server:wraps\n",
+        encoding="utf-8",
+    )
+
+    with subprocess.Popen(
+        f"{sys.executable} -m flake8 {code_file} --config {config_file}",
+        stdout=subprocess.PIPE,
+        shell=True,
+    ) as proc:
+        stdout = proc.communicate()[0].decode(encoding="utf-8")
+
+        assert stdout.count(FACTORY_CODE) == 1
+        assert "fakes.make_client" in stdout
+        assert proc.returncode
+
+
+def test_target_roots(tmp_path: Path):
+    """
+    given: file patching a target that doesn't exist in the project
+    when: flake8 is run against the code with the project as the target root
+    then: the target is reported
+    """
+    (tmp_path / "models.py").write_text("class Model:\n    def save(self): ...\n")
+    code_file = create_code_file(
+        "from unittest import mock\n\nmock.patch('models.Model.saved', autospec=True)\n", tmp_path
+    )
+
+    with subprocess.Popen(
+        f"{sys.executable} -m flake8 --mock-spec-target-roots {tmp_path} "
+        f"--mock-spec-target-cache-dir {tmp_path / 'cache'} {code_file}",
+        stdout=subprocess.PIPE,
+        shell=True,
+    ) as proc:
+        stdout = proc.communicate()[0].decode(encoding="utf-8")
+
+        assert stdout.count(TARGET_CODE) == 1
+        assert "models.Model.saved" in stdout
+        assert proc.returncode
+
+
+def test_baseline(tmp_path: Path):
+    """
+    given: baseline of a file written by the standalone command
+    when: a problem is added and flake8 is run against the code with the baseline
+    then: only the added problem is reported
+    """
+    code_file = create_code_file("from unittest import mock\n\nmock.Mock()\n", tmp_path)
+    subprocess.run(
+        [sys.executable, "-m", "flake8_mock_spec", ".", "--write-baseline", "baseline.txt"],
+        cwd=tmp_path,
+        check=True,
+    )
+    code_file.write_text(f"{code_file.read_text()}\nmock.MagicMock()\n")
+
+    with subprocess.Popen(
+        f"{sys.executable} -m flake8 --select TMS --mock-spec-baseline baseline.txt "
+        f"{code_file.name}",
+        stdout=subprocess.PIPE,
+        shell=True,
+        cwd=tmp_path,
+    ) as proc:
+        stdout = proc.communicate()[0].decode(encoding="utf-8")
+
+        assert stdout.splitlines() == [f"{code_file.name}:7:1: {MAGIC_MOCK_SPEC_MSG}"]
+        assert proc.returncode
+
+
+def test_stats(tmp_path: Path):
+    """
+    given: file with problems
+    when: flake8 is run against the code with the statistics enabled
+    then: the statistics of the file are written followed by the summary
+    """
+    code_file = create_code_file("from unittest import mock\n\nmock.Mock()\n", tmp_path)
+    stats_file = tmp_path / "stats.jsonl"
+
+    with subprocess.Popen(
+        f"{sys.executable} -m flake8 --mock-spec-stats {stats_file} {code_file}",
+        stdout=subprocess.PIPE,
+        shell=True,
+    ) as proc:
+        proc.communicate()
+
+    record, summary = (
+        json.loads(line) for line in stats_file.read_text(encoding="utf-8").splitlines()
+    )
+    assert record["path"] == str(code_file)
+    assert record["problems"] == 1
+    assert summary["summary"]["files"] == 1
+
+
 @pytest.mark.parametrize(
     "code",
     [
@@ -2,36 +2,64 @@
 
 from __future__ import annotations
 
+import argparse
 import ast
+import subprocess
+import sys
+from typing import Any, Callable
 from unittest import mock
 
 import pytest
 
 from flake8_mock_spec import (
+    ASYNC_MOCK_CLASS,
     ASYNC_MOCK_SPEC_MSG,
+    MAGIC_MOCK_CLASS,
     MAGIC_MOCK_SPEC_MSG,
+    MOCK_CLASS,
     MOCK_MSG_LOOKUP,
     MOCK_SPEC_MSG,
+    NON_CALLABLE_MOCK_CLASS,
     NON_CALLABLE_MOCK_SPEC_MSG,
+    PATCH_FUNCTION,
     PATCH_MSG,
+    PATCH_MULTIPLE_FUNCTION,
     PATCH_MULTIPLE_MSG,
+    PATCH_OBJECT_FUNCTION,
     PATCH_OBJECT_MSG,
+    PREFILTER_NEEDLES,
+    STATS_ENV_VAR,
     Plugin,
+    Visitor,
+    iter_problems,
 )
 
+from .conftest import DEFAULT_OPTIONS
 
-def _result(code: str) -> tuple[str, ...]:
+# Imports all the names the mock classes and patch are used with in the tests on the first line so
+# that the line numbers of the code are unchanged
+MOCK_IMPORTS = "import unittest.mock; from unittest import mock; from unittest.mock import *"
+
+
+def _result(code: str, imports: str = MOCK_IMPORTS) -> tuple[str, ...]:
     """Generate linting results.
 
+    Checks that the results are the same whether or not the lines are passed to the plugin.
+
     Args:
         code: The code to check.
+        imports: Added to the start of the first line of the code.
 
     Returns:
         The linting result.
     """
+    code = f"{imports}{code}"
     tree = ast.parse(code)
     plugin = Plugin(tree)
-    return tuple(f"{line}:{col} {msg}" for line, col, msg, _ in plugin.run())
+    result = tuple(f"{line}:{col} {msg}" for line, col, msg, _ in plugin.run())
+    lines_plugin = Plugin(tree, lines=code.splitlines(keepends=True))
+    assert result == tuple(f"{line}:{col} {msg}" for line, col, msg, _ in lines_plugin.run())
+    return result
 
 
 @pytest.mark.parametrize(
@@ -193,6 +221,27 @@ module.Other()
             (),
             id="nested call not mock",
         ),
+        pytest.param(
+            """
+get_mock()()
+""",
+            (),
+            id="call on call result",
+        ),
+        pytest.param(
+            """
+mocks[0].Mock()
+""",
+            (),
+            id="Mock on subscript",
+        ),
+        pytest.param(
+            """
+other.object()
+""",
+            (),
+            id="leaf name match not patch",
+        ),
     ],
 )
 def test_plugin_mock(code: str, expected_result: tuple[str, ...]):
@@ -491,3 +540,295 @@ def test_mock_classes_exist(class_: str):
     """
     assert hasattr(mock, class_)
     getattr(mock, class_)()
+
+
+@pytest.mark.parametrize(
+    "name, expected_name",
+    [
+        pytest.param(MOCK_CLASS, mock.Mock.__name__, id="Mock"),
+        pytest.param(MAGIC_MOCK_CLASS, mock.MagicMock.__name__, id="MagicMock"),
+        pytest.param(NON_CALLABLE_MOCK_CLASS, mock.NonCallableMock.__name__, id="NonCallableMock"),
+        pytest.param(ASYNC_MOCK_CLASS, mock.AsyncMock.__name__, id="AsyncMock"),
+        pytest.param(PATCH_FUNCTION, mock.patch.__name__, id="patch"),  # type: ignore
+        pytest.param(".".join(PATCH_OBJECT_FUNCTION), "patch.object", id="patch.object"),
+        pytest.param(".".join(PATCH_MULTIPLE_FUNCTION), "patch.multiple", id="patch.multiple"),
+    ],
+)
+def test_names_match_mock(name: str, expected_name: str):
+    """
+    given: name of a mock class or patch function that is defined without importing mock
+    when: the name is compared with unittest.mock
+    then: the name matches and refers to an attribute of unittest.mock
+    """
+    assert name == expected_name
+    target = mock
+    for attribute in name.split("."):
+        target = getattr(target, attribute)
+
+
+def test_import_does_not_import_mock():
+    """
+    given: fresh interpreter
+    when: the plugin is imported
+    then: unittest.mock is not imported
+    """
+    code = "import sys, flake8_mock_spec; print('unittest.mock' in sys.modules)"
+
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+
+    assert output.strip() == "False"
+
+
+def test_prefilter_needles():
+    """
+    given: the names that problems are reported for
+    when: the prefilter needles are checked
+    then: every name contains a needle
+    """
+    assert PREFILTER_NEEDLES == {"Mock", "patch"}
+
+
+@pytest.mark.parametrize(
+    "lines, expected_count",
+    [
+        pytest.param(["Other()\n"], 0, id="no needle"),
+        pytest.param([], 0, id="empty"),
+        pytest.param(["from unittest import mock\n", "Other()\n"], 0, id="lower case mock"),
+        pytest.param(["Mock()\n"], 1, id="Mock"),
+        pytest.param(["MagicMock()\n"], 1, id="MagicMock contains Mock"),
+        pytest.param(["x = 1\n", "patch()\n"], 1, id="patch on second line"),
+    ],
+)
+def test_plugin_prefilter(lines: list[str], expected_count: int):
+    """
+    given: tree with a problem and the lines of the file
+    when: linting is run
+    then: the traversal is skipped if the lines don't include any names problems are reported for
+    """
+    plugin = Plugin(ast.parse("from unittest.mock import Mock\nMock()"), lines=lines)
+
+    assert len(tuple(plugin.run())) == expected_count
+
+
+@pytest.mark.parametrize(
+    "max_problems, expected_lines",
+    [
+        pytest.param(None, [2, 3, 4], id="no limit"),
+        pytest.param(0, [], id="zero"),
+        pytest.param(2, [2, 3], id="less than problems"),
+        pytest.param(3, [2, 3, 4], id="equal to problems"),
+        pytest.param(4, [2, 3, 4], id="more than problems"),
+    ],
+)
+def test_iter_problems_max_problems(max_problems: int | None, expected_lines: list[int]):
+    """
+    given: tree with problems and a maximum number of problems
+    when: iter_problems is called
+    then: at most the maximum number of problems are yielded in the order of the calls
+    """
+    tree = ast.parse("from unittest.mock import Mock\nMock()\nMock()\nMock()\n")
+
+    problems = list(iter_problems(tree, max_problems=max_problems))
+
+    assert [problem.lineno for problem in problems] == expected_lines
+
+
+def test_iter_problems_lazy():
+    """
+    given: tree with problems
+    when: the second call is given a spec after the first problem is taken from iter_problems
+    then: the first problem is yielded before the second call is checked
+    """
+    tree = ast.parse("from unittest.mock import Mock\nMock()\nMock()\n")
+
+    problems = iter_problems(tree)
+    first = next(problems)
+    tree.body[-1].value.keywords.append(  # type: ignore[attr-defined]
+        ast.keyword(arg="spec", value=ast.Constant(value=1))
+    )
+
+    assert first.lineno == 2
+    assert not list(problems)
+
+
+def test_plugin_max_problems(parse_plugin_options: Callable[..., None]):
+    """
+    given: flake8 options with a maximum number of problems
+    when: the options are parsed and linting is run
+    then: only the maximum number of problems are reported
+    """
+    parse_plugin_options(mock_spec_max_problems=1)
+
+    results = tuple(Plugin(ast.parse("from unittest.mock import Mock\nMock()\nMock()\n")).run())
+
+    assert [line for line, *_ in results] == [2]
+
+
+def test_plugin_add_options(monkeypatch: pytest.MonkeyPatch):
+    """
+    given: parser that the options of the plugin are registered with
+    when: no arguments are parsed
+    then: the options default to the options the tests use when none are passed
+    """
+    monkeypatch.delenv(STATS_ENV_VAR, raising=False)
+    parser = argparse.ArgumentParser()
+
+    class OptionManager:  # pylint: disable=too-few-public-methods
+        """Registers the options with the parser like flake8 does."""
+
+        def add_option(self, *args: Any, **kwargs: Any) -> None:
+            """Register an option.
+
+            Args:
+                args: The names of the option.
+                kwargs: The arguments of the option including the flake8 specific ones.
+            """
+            kwargs.pop("parse_from_config", None)
+            if kwargs.pop("comma_separated_list", False):
+                kwargs["type"] = lambda value: [item for item in value.split(",") if item]
+            parser.add_argument(*args, **kwargs)
+
+    Plugin.add_options(OptionManager())  # type: ignore[arg-type]
+
+    assert vars(parser.parse_args([])) == DEFAULT_OPTIONS
+    assert parser.parse_args(["--mock-spec-factories", "a.b,c.d"]).mock_spec_factories == [
+        "a.b",
+        "c.d",
+    ]
+
+
+def test_plugin_deep_nesting():
+    """
+    given: tree with calls and attributes nested deeper than the recursion limit
+    when: linting is run
+    then: all the problems are found without a RecursionError and the long name doesn't resolve to
+        a mock class
+    """
+    depth = sys.getrecursionlimit() * 2
+    location = {"lineno": 1, "col_offset": 0, "end_lineno": 1, "end_col_offset": 0}
+    attribute: ast.expr = ast.Name(id="unittest", ctx=ast.Load(), **location)
+    for _ in range(depth):
+        attribute = ast.Attribute(value=attribute, attr="mock", ctx=ast.Load(), **location)
+    call = ast.Call(
+        func=ast.Attribute(value=attribute, attr="Mock", ctx=ast.Load(), **location),
+        args=[],
+        keywords=[],
+        **location,
+    )
+    for _ in range(depth):
+        call = ast.Call(
+            func=ast.Name(id="Mock", ctx=ast.Load(), **location),
+            args=[call],
+            keywords=[],
+            **location,
+        )
+    imports = ast.parse("import unittest\nfrom unittest.mock import Mock").body
+    tree = ast.Module(body=[*imports, ast.Expr(value=call, **location)], type_ignores=[])
+
+    results = tuple(Plugin(tree).run())
+
+    assert len(results) == depth
+
+
+def test_visitor_call_order():
+    """
+    given: code with calls in many different locations
+    when: the calls are checked by Visitor
+    then: the problems are in the same order as a recursive ast.NodeVisitor visits the calls
+    """
+    code = """
+from unittest.mock import *
+@patch.object(Mock())
+class Test(MagicMock(), metaclass=AsyncMock()):
+    attr: Mock() = Mock(Mock())
+
+    @patch(Mock())
+    async def test_(self, arg=Mock(), *, kwarg: Mock() = None) -> Mock():
+        with patch() as patched, patch.multiple():
+            [Mock() for _ in Mock() if Mock()]
+        lambda: f"{Mock()!r:{Mock()}}"
+        try:
+            pass
+        except Mock() as exc:
+            raise Mock() from Mock()
+        return await Mock()(Mock(), key=Mock(), **Mock())
+"""
+    tree = ast.parse(code)
+
+    class RecursiveVisitor(ast.NodeVisitor):
+        """Reference visitor that records calls in visit order."""
+
+        def __init__(self):
+            """Construct."""
+            self.calls: list[ast.Call] = []
+
+        def visit_Call(self, node: ast.Call):  # pylint: disable=invalid-name
+            """Record the call.
+
+            Args:
+                node: The call.
+            """
+            self.calls.append(node)
+            self.generic_visit(node)
+
+    recursive_visitor = RecursiveVisitor()
+    recursive_visitor.visit(tree)
+    visitor = Visitor()
+    visitor.visit(tree)
+
+    assert [(problem.lineno, problem.col_offset) for problem in visitor.problems] == [
+        (call.lineno, call.col_offset)
+        for call in recursive_visitor.calls
+        if not (isinstance(call.func, ast.Call))
+    ]
+
+
+@pytest.mark.parametrize(
+    "code, expected_msgs",
+    [
+        pytest.param("Mock()", [MOCK_SPEC_MSG], id="mock class"),
+        pytest.param("mock.MagicMock()", [MAGIC_MOCK_SPEC_MSG], id="mock class attribute"),
+        pytest.param("Mock(spec=1)", [], id="mock class spec"),
+        pytest.param("unittest.mock.patch()", [PATCH_MSG], id="patch"),
+        pytest.param("mock.patch.object()", [PATCH_OBJECT_MSG], id="patch object"),
+        pytest.param("mocker.patch.multiple()", [PATCH_MULTIPLE_MSG], id="patch multiple"),
+        pytest.param("patch(new=1)", [], id="patch new"),
+        pytest.param("other()", [], id="other"),
+        pytest.param("object()", [], id="patch leaf only"),
+        pytest.param("get()()", [], id="call of call"),
+    ],
+)
+def test_visitor_visit_call(code: str, expected_msgs: list[str]):
+    """
+    given: call that is passed to visit_Call of a visitor that hasn't visited a tree
+    when: visit_Call is called twice
+    then: the call is matched on its name each time since the imports aren't known
+    """
+    (statement,) = ast.parse(code).body
+    assert isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call)
+    visitor = Visitor()
+
+    visitor.visit_Call(statement.value)
+    visitor.visit_Call(statement.value)
+
+    assert [problem.msg for problem in visitor.problems] == expected_msgs * 2
+
+
+def test_visitor_visit_call_after_visit():
+    """
+    given: visitor that has visited a tree
+    when: visit_Call is called with the calls of the tree
+    then: the calls are checked using the imports of the tree
+    """
+    tree = ast.parse("from unittest import mock\nmock.Mock()\nother.Mock()\n")
+    calls = [node for node in ast.walk(tree) if isinstance(node, ast.Call)]
+    visitor = Visitor()
+    visitor.visit(tree)
+    visitor.problems.clear()
+
+    for call in calls:
+        visitor.visit_Call(call)
+
+    assert [(problem.lineno, problem.msg) for problem in visitor.problems] == [(2, MOCK_SPEC_MSG)]
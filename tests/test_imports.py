@@ -0,0 +1,239 @@
+"""Tests for resolving the mock classes and patch through the imports of a module."""
+
+from __future__ import annotations
+
+import pytest
+
+from flake8_mock_spec import (
+    ASYNC_MOCK_SPEC_MSG,
+    MAGIC_MOCK_SPEC_MSG,
+    MOCK_SPEC_MSG,
+    NON_CALLABLE_MOCK_SPEC_MSG,
+    PATCH_MSG,
+    PATCH_MULTIPLE_MSG,
+    PATCH_OBJECT_MSG,
+)
+
+from .test_flake8_mock_spec_unit import _result
+
+
+@pytest.mark.parametrize(
+    "code, expected_result",
+    [
+        pytest.param(
+            """
+Mock()
+""",
+            (),
+            id="not imported",
+        ),
+        pytest.param(
+            """
+from other import Mock
+Mock()
+""",
+            (),
+            id="imported from other module",
+        ),
+        pytest.param(
+            """
+from os import *
+Mock()
+""",
+            (),
+            id="star imported from other module",
+        ),
+        pytest.param(
+            """
+from mock import *
+from unittest.mock import *
+mock.Mock()
+""",
+            (),
+            id="later star import wins",
+        ),
+        pytest.param(
+            """
+from unittest.mock import *
+from mock import *
+mock.Mock()
+""",
+            (f"4:0 {MOCK_SPEC_MSG}",),
+            id="later star import wins mock",
+        ),
+        pytest.param(
+            """
+from . import mock
+mock.Mock()
+""",
+            (),
+            id="relative import",
+        ),
+        pytest.param(
+            """
+import os
+os.Mock()
+""",
+            (),
+            id="attribute of other module",
+        ),
+        pytest.param(
+            """
+from unittest.mock import patch
+other.patch()
+""",
+            (),
+            id="attribute of name not imported",
+        ),
+        pytest.param(
+            """
+from unittest.mock import Mock
+Mock.other()
+""",
+            (),
+            id="attribute of mock class",
+        ),
+        pytest.param(
+            """
+from unittest.mock import MagicMock as MM
+MM()
+""",
+            (f"3:0 {MAGIC_MOCK_SPEC_MSG}",),
+            id="class alias",
+        ),
+        pytest.param(
+            """
+from unittest.mock import MagicMock as MM
+MM(spec=1)
+""",
+            (),
+            id="class alias spec",
+        ),
+        pytest.param(
+            """
+import unittest.mock as um
+um.Mock()
+""",
+            (f"3:0 {MOCK_SPEC_MSG}",),
+            id="module alias",
+        ),
+        pytest.param(
+            """
+import unittest
+unittest.mock.Mock()
+""",
+            (f"3:0 {MOCK_SPEC_MSG}",),
+            id="parent module",
+        ),
+        pytest.param(
+            """
+from unittest import mock as m
+m.patch.object()
+""",
+            (f"3:0 {PATCH_OBJECT_MSG}",),
+            id="from module alias patch object",
+        ),
+        pytest.param(
+            """
+from unittest.mock import patch as p
+p.multiple()
+""",
+            (f"3:0 {PATCH_MULTIPLE_MSG}",),
+            id="patch alias multiple",
+        ),
+        pytest.param(
+            """
+import mock
+mock.NonCallableMock()
+""",
+            (f"3:0 {NON_CALLABLE_MOCK_SPEC_MSG}",),
+            id="backport module",
+        ),
+        pytest.param(
+            """
+from mock import patch
+patch()
+""",
+            (f"3:0 {PATCH_MSG}",),
+            id="backport patch",
+        ),
+        pytest.param(
+            """
+from mock.mock import AsyncMock
+AsyncMock()
+""",
+            (f"3:0 {ASYNC_MOCK_SPEC_MSG}",),
+            id="backport submodule",
+        ),
+        pytest.param(
+            """
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+mock.Mock()
+""",
+            (f"6:0 {MOCK_SPEC_MSG}",),
+            id="import in try",
+        ),
+        pytest.param(
+            """
+def test_():
+    from unittest import mock
+    mock.Mock()
+""",
+            (f"4:4 {MOCK_SPEC_MSG}",),
+            id="import in function",
+        ),
+        pytest.param(
+            """
+class Test:
+    from unittest import mock
+    mock.Mock()
+""",
+            (f"4:4 {MOCK_SPEC_MSG}",),
+            id="import in class",
+        ),
+        pytest.param(
+            """
+def test_(mocker):
+    mocker.patch("x")
+""",
+            (f"3:4 {PATCH_MSG}",),
+            id="mocker patch",
+        ),
+        pytest.param(
+            """
+def test_(mocker):
+    mocker.patch("x", autospec=True)
+""",
+            (),
+            id="mocker patch autospec",
+        ),
+        pytest.param(
+            """
+class TestClass:
+    async def test_(self, *, mocker):
+        mocker.patch.object(Class, "x")
+        mocker.MagicMock()
+""",
+            (f"4:8 {PATCH_OBJECT_MSG}", f"5:8 {MAGIC_MOCK_SPEC_MSG}"),
+            id="mocker keyword only argument in async method",
+        ),
+        pytest.param(
+            """
+def test_():
+    mocker.patch("x")
+""",
+            (),
+            id="mocker not argument",
+        ),
+    ],
+)
+def test_plugin_imports(code: str, expected_result: tuple[str, ...]):
+    """
+    given: code that imports the mock classes and patch in different ways
+    when: linting is run on the code
+    then: the expected result is returned
+    """
+    assert _result(code, imports="") == expected_result
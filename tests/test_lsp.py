@@ -0,0 +1,349 @@
+"""Tests for the language server."""
+
+from __future__ import annotations
+
+import io
+import sys
+from typing import Any
+
+import pytest
+
+from flake8_mock_spec import MAGIC_MOCK_SPEC_MSG, MOCK_SPEC_MSG, PATCH_MSG
+from flake8_mock_spec.lsp import (
+    METHOD_NOT_FOUND,
+    SEVERITY_WARNING,
+    SOURCE,
+    Document,
+    Server,
+    main,
+    read_message,
+    to_diagnostic,
+    write_message,
+)
+
+SOURCE_TEXT = """from unittest.mock import Mock, patch
+
+
+def test_first():
+    Mock()
+
+
+@patch("a")
+def test_second():
+    Mock(spec=1)
+"""
+
+
+def _lines(document: Document) -> list[tuple[int, int, str]]:
+    """Summarize the problems of a document.
+
+    Args:
+        document: The document.
+
+    Returns:
+        The line, column and message of each problem.
+    """
+    return [(problem.lineno, problem.col_offset, problem.msg) for problem in document.problems]
+
+
+def test_document_update():
+    """
+    given: document
+    when: it is updated with source
+    then: all the statements are checked
+    """
+    document = Document()
+
+    assert document.update(SOURCE_TEXT)
+
+    assert document.checked == 3
+    assert _lines(document) == [(5, 4, MOCK_SPEC_MSG), (8, 1, PATCH_MSG)]
+
+
+def test_document_update_changed_definition():
+    """
+    given: checked document
+    when: lines are added to the first function
+    then: only the first function is checked and the problems of the second are moved
+    """
+    document = Document()
+    document.update(SOURCE_TEXT)
+
+    document.update(SOURCE_TEXT.replace("    Mock()\n", "    Mock()\n    Mock()\n\n\n"))
+
+    assert document.checked == 1
+    assert _lines(document) == [(5, 4, MOCK_SPEC_MSG), (6, 4, MOCK_SPEC_MSG), (11, 1, PATCH_MSG)]
+
+
+def test_document_update_unchanged():
+    """
+    given: checked document
+    when: it is updated with the same source
+    then: no statements are checked and the problems are the same
+    """
+    document = Document()
+    document.update(SOURCE_TEXT)
+    problems = document.problems
+
+    document.update(SOURCE_TEXT)
+
+    assert document.checked == 0
+    assert document.problems == problems
+
+
+def test_document_update_imports_changed():
+    """
+    given: checked document
+    when: the imports are changed
+    then: all the statements are checked again using the new imports
+    """
+    document = Document()
+    document.update(SOURCE_TEXT)
+
+    document.update(SOURCE_TEXT.replace("Mock, patch", "MagicMock as Mock, patch"))
+
+    assert document.checked == 3
+    assert _lines(document) == [(5, 4, MAGIC_MOCK_SPEC_MSG), (8, 1, PATCH_MSG)]
+
+
+def test_document_update_same_line():
+    """
+    given: document with statements on the same line
+    when: it is updated
+    then: the problems of each statement are found
+    """
+    document = Document()
+
+    document.update("from unittest.mock import Mock\nMock(); Mock(spec=1); Mock()\n")
+
+    assert _lines(document) == [(2, 0, MOCK_SPEC_MSG), (2, 22, MOCK_SPEC_MSG)]
+
+
+def test_document_update_noqa():
+    """
+    given: document with a suppressed problem
+    when: it is updated
+    then: the suppressed problem is not included
+    """
+    document = Document()
+
+    document.update("from unittest.mock import Mock\nMock()  # noqa: TMS010\nMock()\n")
+
+    assert _lines(document) == [(3, 0, MOCK_SPEC_MSG)]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("x = '\x0c\u2028'\nMock()  # noqa\nMock()\n", id="str.splitlines breaks"),
+        pytest.param("x = 1\r\nMock()  # noqa\rMock()\r\n", id="carriage returns"),
+        pytest.param("x = 1\nMock()  # noqa\nMock()", id="no line break at the end"),
+    ],
+)
+def test_document_update_noqa_line_breaks(source: str):
+    """
+    given: document with characters that only some ways of splitting lines break lines on
+    when: it is updated
+    then: the suppressed problem is matched to the line the parser numbers
+    """
+    document = Document()
+
+    document.update(f"from unittest.mock import Mock\n{source}")
+
+    assert _lines(document) == [(4, 0, MOCK_SPEC_MSG)]
+
+
+def test_document_update_syntax_error():
+    """
+    given: checked document
+    when: it is updated with source that can't be parsed
+    then: the update is rejected and the problems are unchanged
+    """
+    document = Document()
+    document.update(SOURCE_TEXT)
+    problems = document.problems
+
+    assert not document.update(f"{SOURCE_TEXT}def")
+
+    assert document.problems == problems
+    assert document.source == SOURCE_TEXT
+
+
+def test_to_diagnostic():
+    """
+    given: problem after characters that are longer in UTF-16 than in UTF-8 code units
+    when: it is converted to a diagnostic
+    then: the range is in UTF-16 code units from the problem to the end of the line
+    """
+    document = Document()
+    document.update("from unittest.mock import Mock\nx = ('𝔸', Mock())\n")
+    (problem,) = document.problems
+
+    diagnostic = to_diagnostic(problem, document.lines)
+
+    code, message = MOCK_SPEC_MSG.split(maxsplit=1)
+    assert diagnostic == {
+        "range": {"start": {"line": 1, "character": 11}, "end": {"line": 1, "character": 18}},
+        "severity": SEVERITY_WARNING,
+        "code": code,
+        "source": SOURCE,
+        "message": message,
+    }
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"Content-Type: x\r\n", id="ends in headers"),
+        pytest.param(b"Content-Type: x\r\n\r\n{}", id="no length"),
+    ],
+)
+def test_read_message_end(data: bytes):
+    """
+    given: stream without a complete message
+    when: a message is read
+    then: None is returned
+    """
+    assert read_message(io.BytesIO(data)) is None
+
+
+def test_write_read_message():
+    """
+    given: message with non ASCII characters
+    when: it is written and read back
+    then: the same message is returned
+    """
+    stream = io.BytesIO()
+    message = {"jsonrpc": "2.0", "method": "test", "params": {"text": "𝔸"}}
+
+    write_message(stream, message)
+    stream.seek(0)
+
+    assert read_message(stream) == message
+
+
+def _session(*messages: dict[str, Any]) -> tuple[int, list[dict[str, Any]]]:
+    """Send messages to a server.
+
+    Args:
+        messages: The messages sent by the client.
+
+    Returns:
+        The exit code and the messages sent by the server.
+    """
+    reader = io.BytesIO()
+    for message in messages:
+        write_message(reader, {"jsonrpc": "2.0", **message})
+    reader.seek(0)
+    writer = io.BytesIO()
+
+    returncode = Server(reader, writer).serve()
+
+    writer.seek(0)
+    return returncode, list(iter(lambda: read_message(writer), None))
+
+
+def test_server_session():
+    """
+    given: server
+    when: a client opens, changes and closes a document
+    then: the diagnostics are published after each change that can be parsed and cleared when
+        it is closed
+    """
+    uri = "file:///test_source.py"
+
+    returncode, responses = _session(
+        {"id": 1, "method": "initialize", "params": {}},
+        {"method": "initialized", "params": {}},
+        {
+            "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": uri, "version": 1, "text": SOURCE_TEXT}},
+        },
+        {
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": uri, "version": 2},
+                "contentChanges": [{"text": SOURCE_TEXT.replace('@patch("a")\n', "")}],
+            },
+        },
+        {
+            "method": "textDocument/didChange",
+            "params": {"textDocument": {"uri": uri, "version": 3}, "contentChanges": []},
+        },
+        {
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": uri, "version": 4},
+                "contentChanges": [{"text": f"{SOURCE_TEXT}def"}],
+            },
+        },
+        {
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": "file:///unknown.py", "version": 1},
+                "contentChanges": [{"text": ""}],
+            },
+        },
+        {"method": "textDocument/didClose", "params": {"textDocument": {"uri": uri}}},
+        {"id": 2, "method": "unknown"},
+        {"id": 3, "method": "shutdown"},
+        {"method": "exit"},
+    )
+
+    assert returncode == 0
+    initialize, opened, changed, closed, unknown, shutdown = responses
+    assert initialize["id"] == 1
+    assert initialize["result"]["capabilities"]["textDocumentSync"]["change"] == 1
+    assert [diagnostic["code"] for diagnostic in opened["params"]["diagnostics"]] == [
+        "TMS010",
+        "TMS020",
+    ]
+    assert opened["params"]["version"] == 1
+    assert [diagnostic["code"] for diagnostic in changed["params"]["diagnostics"]] == ["TMS010"]
+    assert changed["params"]["version"] == 2
+    assert closed["params"] == {"uri": uri, "diagnostics": []}
+    assert unknown["error"]["code"] == METHOD_NOT_FOUND
+    assert shutdown == {"jsonrpc": "2.0", "id": 3, "result": None}
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        pytest.param(({"method": "exit"},), id="exit"),
+        pytest.param((), id="end of input"),
+    ],
+)
+def test_server_exit_without_shutdown(messages: tuple[dict[str, Any], ...]):
+    """
+    given: server
+    when: the client exits or closes the input without requesting a shutdown
+    then: the exit code is non-zero
+    """
+    returncode, responses = _session(*messages)
+
+    assert returncode == 1
+    assert not responses
+
+
+def test_main(monkeypatch: pytest.MonkeyPatch):
+    """
+    given: language server on the standard input and output
+    when: a client initializes it, requests a shutdown and exits
+    then: the server responds and exits with a zero code
+    """
+    stdin = io.BytesIO()
+    write_message(stdin, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+    write_message(stdin, {"jsonrpc": "2.0", "id": 2, "method": "shutdown"})
+    write_message(stdin, {"jsonrpc": "2.0", "method": "exit"})
+    stdin.seek(0)
+    stdout = io.BytesIO()
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(stdin))
+    monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(stdout))
+
+    returncode = main()
+
+    assert returncode == 0
+    stdout.seek(0)
+    assert read_message(stdout)["result"]["serverInfo"]["name"] == SOURCE  # type: ignore
+    assert read_message(stdout) == {"jsonrpc": "2.0", "id": 2, "result": None}
@@ -0,0 +1,92 @@
+"""Tests for the compact storage of problems."""
+
+from __future__ import annotations
+
+import sys
+
+from flake8_mock_spec import MAGIC_MOCK_SPEC_MSG, MOCK_SPEC_MSG, PATCH_MSG, Problem
+from flake8_mock_spec.problems import RULE_MESSAGES, ProblemTable
+
+
+def test_empty():
+    """
+    given: empty table
+    when: the table is read
+    then: there are no problems
+    """
+    table = ProblemTable()
+
+    assert not table
+    assert not list(table)
+    assert not table.count_by_message()
+
+
+def test_round_trip():
+    """
+    given: problems for multiple files including a message that is not a rule
+    when: the problems are added to the table and read back
+    then: the same problems are returned in the same order and messages and paths are stored once
+    """
+    syntax_error = "E999 SyntaxError: invalid syntax"
+    problems = [
+        ("first.py", Problem(1, 0, MOCK_SPEC_MSG)),
+        ("first.py", Problem(2, 4, PATCH_MSG)),
+        ("second.py", Problem(3, 8, syntax_error)),
+        ("first.py", Problem(4, 0, MOCK_SPEC_MSG)),
+    ]
+    table = ProblemTable()
+
+    table.extend("first.py", [problems[0][1], problems[1][1]])
+    table.extend("empty.py", [])
+    table.append("second.py", problems[2][1])
+    table.append("first.py", problems[3][1])
+
+    assert list(table) == problems
+    assert len(table) == 4
+    assert table.paths == ["first.py", "second.py"]
+    assert table.messages == [*RULE_MESSAGES, syntax_error]
+
+
+def test_count_by_message():
+    """
+    given: table with problems
+    when: count_by_message is called
+    then: the number of problems for each message is returned
+    """
+    table = ProblemTable()
+    table.extend("first.py", [Problem(1, 0, MOCK_SPEC_MSG), Problem(2, 0, MAGIC_MOCK_SPEC_MSG)])
+    table.extend("second.py", [Problem(1, 0, MOCK_SPEC_MSG)])
+
+    assert table.count_by_message() == {MOCK_SPEC_MSG: 2, MAGIC_MOCK_SPEC_MSG: 1}
+
+
+def test_count_by_code_path_directory():
+    """
+    given: table with problems in nested directories including a message that is not a rule
+    when: the problems are counted by code, path and directory
+    then: directories include the problems of their subdirectories
+    """
+    table = ProblemTable()
+    table.extend("a/b/first.py", [Problem(1, 0, MOCK_SPEC_MSG), Problem(2, 0, PATCH_MSG)])
+    table.extend("a/second.py", [Problem(1, 0, "E999 SyntaxError: invalid syntax")])
+    table.extend("third.py", [Problem(1, 0, MOCK_SPEC_MSG)])
+
+    assert table.count_by_code() == {"TMS010": 2, "TMS020": 1, "E999": 1}
+    assert table.count_by_path() == {"a/b/first.py": 2, "a/second.py": 1, "third.py": 1}
+    assert table.count_by_directory() == {"a/b": 2, "a": 3, ".": 1}
+
+
+def test_memory():
+    """
+    given: many problems
+    when: they are added to the table
+    then: the columns use 16 bytes per problem, far less than a list of problems
+    """
+    count = 10_000
+    problems = [Problem(index, index % 80, MOCK_SPEC_MSG) for index in range(count)]
+    table = ProblemTable()
+
+    table.extend("file.py", problems)
+
+    assert table.nbytes == count * 16
+    assert table.nbytes < sum(sys.getsizeof(problem) for problem in problems)
@@ -0,0 +1,162 @@
+"""Tests for the pytest plugin."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from flake8_mock_spec import MOCK_SPEC_CODE, PATCH_CODE
+
+pytest_plugins = ["pytester"]
+
+# The plugin is loaded by module so that the tests don't depend on the package being installed,
+# when it is installed the module is already imported and can't be rewritten for assertions
+PLUGIN_ARGS = (
+    "-p",
+    "no:flake8_mock_spec",
+    "-p",
+    "flake8_mock_spec.pytest_plugin",
+    "-W",
+    "ignore::pytest.PytestAssertRewriteWarning",
+)
+TEST_MODULE = """
+from unittest import mock
+
+
+def test_mock():
+    mock.Mock()
+
+
+def test_patch():
+    with mock.patch("os.getcwd"):
+        pass
+"""
+
+
+def test_off(pytester: pytest.Pytester):
+    """
+    given: test module with problems
+    when: pytest is run without enabling the plugin
+    then: the tests pass without warnings
+    """
+    pytester.makepyfile(test_module=TEST_MODULE)
+
+    result = pytester.runpytest(*PLUGIN_ARGS)
+
+    result.assert_outcomes(passed=2)
+    assert MOCK_SPEC_CODE not in result.stdout.str()
+
+
+def test_warn(pytester: pytest.Pytester):
+    """
+    given: test module with problems
+    when: pytest is run with the plugin in warn mode
+    then: the tests pass and the problems are reported as warnings
+    """
+    pytester.makepyfile(test_module=TEST_MODULE)
+
+    result = pytester.runpytest(*PLUGIN_ARGS, "--mock-spec=warn")
+
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [f"*test_module.py:5: MockSpecWarning: {MOCK_SPEC_CODE}*", f"*:9: *{PATCH_CODE}*"]
+    )
+    assert result.stdout.str().count("MockSpecWarning: ") == 2
+
+
+def test_error_ini(pytester: pytest.Pytester):
+    """
+    given: test module with problems and one without and the plugin in error mode in the ini
+    when: pytest is run
+    then: the module with problems fails to be collected and the problems are reported
+    """
+    pytester.makeini("[pytest]\nmock_spec = error\n")
+    pytester.makepyfile(
+        test_module=TEST_MODULE,
+        test_other="from unittest import mock\n\ndef test_():\n    mock.Mock(spec=1)\n",
+    )
+
+    result = pytester.runpytest(*PLUGIN_ARGS, "--continue-on-collection-errors")
+
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.fnmatch_lines(
+        [f"*test_module.py:5:5: {MOCK_SPEC_CODE}*", f"*test_module.py:9:10: {PATCH_CODE}*"]
+    )
+
+
+def test_error_option_overrides_ini(pytester: pytest.Pytester):
+    """
+    given: test module with problems and the plugin in error mode in the ini
+    when: pytest is run with the plugin turned off on the command line
+    then: the tests pass
+    """
+    pytester.makeini("[pytest]\nmock_spec = error\n")
+    pytester.makepyfile(test_module=TEST_MODULE)
+
+    result = pytester.runpytest(*PLUGIN_ARGS, "--mock-spec=off")
+
+    result.assert_outcomes(passed=2)
+
+
+def test_error_collection_failed(pytester: pytest.Pytester):
+    """
+    given: test module with problems that fails when it is imported
+    when: pytest is run with the plugin in error mode
+    then: the error of pytest is reported rather than the problems
+    """
+    pytester.makepyfile(test_module=f"{TEST_MODULE}\nraise RuntimeError('import failed')\n")
+
+    result = pytester.runpytest(*PLUGIN_ARGS, "--mock-spec=error")
+
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*RuntimeError: import failed*"])
+    assert MOCK_SPEC_CODE not in result.stdout.str()
+
+
+def test_syntax_error(pytester: pytest.Pytester):
+    """
+    given: test module that can't be parsed
+    when: pytest is run with the plugin in error mode
+    then: only the error of pytest is reported
+    """
+    pytester.makepyfile(test_module="from unittest import mock\nmock.Mock(\n")
+
+    result = pytester.runpytest(*PLUGIN_ARGS, "--mock-spec=error")
+
+    result.assert_outcomes(errors=1)
+    assert "E999" not in result.stdout.str()
+
+
+def test_invalid_ini(pytester: pytest.Pytester):
+    """
+    given: ini option that isn't a mode
+    when: pytest is run
+    then: a usage error is reported
+    """
+    pytester.makeini("[pytest]\nmock_spec = other\n")
+    pytester.makepyfile(test_module=TEST_MODULE)
+
+    result = pytester.runpytest(*PLUGIN_ARGS)
+
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*mock_spec must be one of*"])
+
+
+def test_import():
+    """
+    given: pytest
+    when: the plugin is imported
+    then: only the package and the plugin are imported, not the standalone command
+    """
+    code = (
+        "import sys, pytest; modules = set(sys.modules); import flake8_mock_spec.pytest_plugin; "
+        "print(*sorted(set(sys.modules) - modules))"
+    )
+
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+
+    assert process.stdout.split() == ["flake8_mock_spec", "flake8_mock_spec.pytest_plugin"]
@@ -0,0 +1,201 @@
+"""Tests for the registry of the factories that problems are reported for."""
+
+from __future__ import annotations
+
+import ast
+from typing import Callable
+
+import pytest
+
+from flake8_mock_spec import (
+    DEFAULT_REGISTRY,
+    FACTORY_MSG_BASE,
+    MOCK_CLASS,
+    MOCK_SPEC_MSG,
+    PATCH_OBJECT_MSG,
+    PREFILTER_NEEDLES,
+    Plugin,
+    compile_registry,
+    parse_factory,
+)
+
+FACTORIES = (
+    "tests.fakes.make_fake_client",
+    "tests.fakes.Factory.create:spec_set|wraps",
+    "mocker.create_fake",
+    "unittest.mock.create_autospec:spec|0",
+)
+FAKE_CLIENT_MSG = FACTORY_MSG_BASE % ("tests.fakes.make_fake_client", "spec, spec_set")
+CREATE_MSG = FACTORY_MSG_BASE % ("tests.fakes.Factory.create", "spec_set, wraps")
+CREATE_FAKE_MSG = FACTORY_MSG_BASE % ("pytest_mock.MockerFixture.create_fake", "spec, spec_set")
+AUTOSPEC_MSG = FACTORY_MSG_BASE % ("unittest.mock.create_autospec", "spec, positional 0")
+
+
+@pytest.mark.parametrize(
+    "definition, expected",
+    [
+        pytest.param(
+            "tests.fakes.make_fake_client",
+            (("tests", "fakes", "make_fake_client"), frozenset(("spec", "spec_set")), frozenset()),
+            id="default arguments",
+        ),
+        pytest.param(
+            " fakes.make:wraps|spec ",
+            (("fakes", "make"), frozenset(("spec", "wraps")), frozenset()),
+            id="arguments",
+        ),
+        pytest.param(
+            "fakes.make:spec|0|2",
+            (("fakes", "make"), frozenset(("spec",)), frozenset((0, 2))),
+            id="positions",
+        ),
+        pytest.param(
+            "fakes.make:1", (("fakes", "make"), frozenset(), frozenset((1,))), id="only position"
+        ),
+        pytest.param(
+            "mocker.create_fake",
+            (
+                ("pytest_mock", "MockerFixture", "create_fake"),
+                frozenset(("spec", "spec_set")),
+                frozenset(),
+            ),
+            id="mocker",
+        ),
+    ],
+)
+def test_parse_factory(
+    definition: str, expected: tuple[tuple[str, ...], frozenset[str], frozenset[int]]
+):
+    """
+    given: definition of a factory
+    when: parse_factory is called
+    then: the fully qualified name, the keyword arguments and the positions are returned
+    """
+    assert parse_factory(definition) == expected
+
+
+@pytest.mark.parametrize(
+    "definition",
+    [
+        pytest.param("make_fake_client", id="no module"),
+        pytest.param("tests..make", id="empty element"),
+        pytest.param("tests.fakes.make:", id="empty arguments"),
+        pytest.param("tests.fakes.make:spec|", id="empty argument"),
+        pytest.param("tests.fakes.make:-1", id="negative position"),
+        pytest.param("tests.fakes.make-client", id="not an identifier"),
+    ],
+)
+def test_parse_factory_invalid(definition: str):
+    """
+    given: invalid definition of a factory
+    when: parse_factory is called
+    then: ValueError is raised
+    """
+    with pytest.raises(ValueError):
+        parse_factory(definition)
+
+
+def test_compile_registry_default():
+    """
+    given: no additional factories
+    when: compile_registry is called
+    then: the built in factories are registered for every provider
+    """
+    registry = compile_registry()
+
+    assert registry == DEFAULT_REGISTRY
+    assert registry.rules[("unittest", "mock", "patch", "object")].msg == PATCH_OBJECT_MSG
+    assert registry.rules[("pytest_mock", "MockerFixture", MOCK_CLASS)].msg == MOCK_SPEC_MSG
+    assert registry.needles == PREFILTER_NEEDLES
+
+
+def test_compile_registry_factories():
+    """
+    given: additional factories
+    when: compile_registry is called
+    then: the factories, their modules and their names are added to the lookup tables
+    """
+    registry = compile_registry(FACTORIES)
+
+    assert registry.rules[("tests", "fakes", "make_fake_client")].msg == FAKE_CLIENT_MSG
+    assert ("tests", "fakes", "Factory") in registry.providers
+    assert ("tests",) in registry.provider_parents
+    assert registry.rules[("unittest", "mock", "create_autospec")].positions == {0}
+    assert {"make_fake_client", "create", "create_fake"} <= registry.leaf_names
+    assert registry.needles == {"Mock", "patch", "make_fake_client", "create"}
+
+
+@pytest.mark.parametrize(
+    "code, expected_result",
+    [
+        pytest.param(
+            "from tests.fakes import make_fake_client\nmake_fake_client()",
+            (f"2:0 {FAKE_CLIENT_MSG}",),
+            id="from import",
+        ),
+        pytest.param(
+            "from tests.fakes import make_fake_client\nmake_fake_client(spec=Client)",
+            (),
+            id="from import spec",
+        ),
+        pytest.param(
+            "import tests.fakes\ntests.fakes.make_fake_client()",
+            (f"2:0 {FAKE_CLIENT_MSG}",),
+            id="import",
+        ),
+        pytest.param(
+            "from tests import fakes as f\nf.make_fake_client()",
+            (f"2:0 {FAKE_CLIENT_MSG}",),
+            id="alias",
+        ),
+        pytest.param(
+            "from tests.fakes import *\nmake_fake_client()\nFactory.create(spec=Client)",
+            (f"2:0 {FAKE_CLIENT_MSG}", f"3:0 {CREATE_MSG}"),
+            id="star import",
+        ),
+        pytest.param(
+            "from tests.fakes import Factory\nFactory.create(wraps=client)",
+            (),
+            id="configured argument",
+        ),
+        pytest.param(
+            "def test_(mocker):\n    mocker.create_fake()\n    mocker.Mock()",
+            (f"2:4 {CREATE_FAKE_MSG}", f"3:4 {MOCK_SPEC_MSG}"),
+            id="mocker",
+        ),
+        pytest.param(
+            "from other.fakes import make_fake_client\nmake_fake_client()",
+            (),
+            id="other module",
+        ),
+        pytest.param(
+            "from unittest import mock\nmock.Mock()",
+            (f"2:0 {MOCK_SPEC_MSG}",),
+            id="built in",
+        ),
+        pytest.param(
+            "from unittest import mock\nmock.create_autospec(Client)\n"
+            "mock.create_autospec(spec=Client)\nmock.create_autospec(*specs)\n"
+            "mock.create_autospec(instance=True)",
+            (f"5:0 {AUTOSPEC_MSG}",),
+            id="positional argument",
+        ),
+    ],
+)
+def test_plugin_factories(
+    code: str, expected_result: tuple[str, ...], parse_plugin_options: Callable[..., None]
+):
+    """
+    given: code and flake8 options with additional factories
+    when: the options are parsed and linting is run
+    then: the expected problems are reported
+    """
+    parse_plugin_options(mock_spec_factories=FACTORIES)
+
+    lines = code.splitlines(keepends=True)
+    result = tuple(f"{line}:{col} {msg}" for line, col, msg, _ in Plugin(ast.parse(code)).run())
+    lines_result = tuple(
+        f"{line}:{col} {msg}" for line, col, msg, _ in Plugin(ast.parse(code), lines).run()
+    )
+
+    assert result == lines_result == expected_result
@@ -0,0 +1,140 @@
+"""Tests for the machine readable reports."""
+
+from __future__ import annotations
+
+import io
+import json
+
+from flake8_mock_spec import MOCK_SPEC_CODE, MOCK_SPEC_MSG, PATCH_CODE, PATCH_MSG, Problem
+from flake8_mock_spec.problems import RULE_MESSAGES, ProblemTable
+from flake8_mock_spec.report import (
+    SARIF_VERSION,
+    SUMMARY_KEY,
+    JsonLinesReport,
+    SarifReport,
+    summarize,
+)
+
+FILES: tuple[tuple[str, list[Problem]], ...] = (
+    ("tests/unit/test_a.py", [Problem(1, 0, MOCK_SPEC_MSG), Problem(2, 4, PATCH_MSG)]),
+    ("tests/test_b.py", []),
+    ("test_c.py", [Problem(3, 8, MOCK_SPEC_MSG)]),
+)
+EXPECTED_SUMMARY = {
+    "total": 3,
+    "by_code": {MOCK_SPEC_CODE: 2, PATCH_CODE: 1},
+    "by_directory": {".": 1, "tests": 2, "tests/unit": 2},
+    "by_file": {"test_c.py": 1, "tests/unit/test_a.py": 2},
+}
+
+
+def _run(report_class: type[JsonLinesReport] | type[SarifReport]) -> str:
+    """Write the problems of FILES using a report.
+
+    Args:
+        report_class: The report to write.
+
+    Returns:
+        The content of the report.
+    """
+    stream = io.StringIO()
+    report = report_class(stream)
+    table = ProblemTable()
+    report.start()
+    for path, problems in FILES:
+        report.write(path, problems)
+        table.extend(path, problems)
+    report.finish(table)
+    return stream.getvalue()
+
+
+def test_summarize():
+    """
+    given: problems in files in nested directories
+    when: summarize is called
+    then: the problems are counted by code, directory including subdirectories and file
+    """
+    table = ProblemTable()
+    for path, problems in FILES:
+        table.extend(path, problems)
+
+    assert summarize(table) == EXPECTED_SUMMARY
+
+
+def test_json_lines_report():
+    """
+    given: problems in files
+    when: the problems are written using the JSON lines report
+    then: there is an object per problem followed by the summary
+    """
+    records = [json.loads(line) for line in _run(JsonLinesReport).splitlines()]
+
+    assert records == [
+        {
+            "path": "tests/unit/test_a.py",
+            "lineno": 1,
+            "col_offset": 0,
+            "code": MOCK_SPEC_CODE,
+            "message": MOCK_SPEC_MSG.split(maxsplit=1)[1],
+        },
+        {
+            "path": "tests/unit/test_a.py",
+            "lineno": 2,
+            "col_offset": 4,
+            "code": PATCH_CODE,
+            "message": PATCH_MSG.split(maxsplit=1)[1],
+        },
+        {
+            "path": "test_c.py",
+            "lineno": 3,
+            "col_offset": 8,
+            "code": MOCK_SPEC_CODE,
+            "message": MOCK_SPEC_MSG.split(maxsplit=1)[1],
+        },
+        {SUMMARY_KEY: EXPECTED_SUMMARY},
+    ]
+
+
+def test_sarif_report():
+    """
+    given: problems in files
+    when: the problems are written using the SARIF report
+    then: the log is valid JSON with the rules, a result per problem and the summary
+    """
+    log = json.loads(_run(SarifReport))
+
+    assert log["version"] == SARIF_VERSION
+    (run,) = log["runs"]
+    rules = run["tool"]["driver"]["rules"]
+    assert [rule["id"] for rule in rules] == [msg.split()[0] for msg in RULE_MESSAGES]
+    assert rules[0]["helpUri"].endswith(f"#fix-{rules[0]['id'].lower()}")
+    assert [
+        (
+            result["ruleId"],
+            result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"],
+            result["locations"][0]["physicalLocation"]["region"]["startLine"],
+        )
+        for result in run["results"]
+    ] == [
+        (MOCK_SPEC_CODE, "tests/unit/test_a.py", 1),
+        (PATCH_CODE, "tests/unit/test_a.py", 2),
+        (MOCK_SPEC_CODE, "test_c.py", 3),
+    ]
+    assert run["properties"][SUMMARY_KEY] == EXPECTED_SUMMARY
+
+
+def test_sarif_report_empty():
+    """
+    given: no problems
+    when: the SARIF report is written
+    then: the log is valid JSON without results
+    """
+    stream = io.StringIO()
+    report = SarifReport(stream)
+
+    report.start()
+    report.finish(ProblemTable())
+
+    (run,) = json.loads(stream.getvalue())["runs"]
+    assert run["results"] == []
+    assert run["properties"][SUMMARY_KEY]["total"] == 0
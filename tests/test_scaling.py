@@ -0,0 +1,349 @@
+"""Property based tests that the cost of the checks grows linearly with the size of the input.
+
+The inputs are pathological shapes that generated code can take, e.g., very long attribute chains,
+thousands of keywords on one call and calls nested far deeper than the recursion limit. The trees
+are built directly since the parser itself can't parse some of them.
+"""
+
+from __future__ import annotations
+
+import ast
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+import pytest
+from hypothesis import HealthCheck, example, given, settings
+from hypothesis import strategies as st
+
+from flake8_mock_spec import MOCK_SPEC_CODE, PATCH_CODE, Plugin, iter_problems
+from flake8_mock_spec.cli import SYNTAX_ERROR_CODE, check_source
+from flake8_mock_spec.stats import FileStats
+
+# Sizes beyond the recursion limit so that any recursion would fail
+RECURSION_SIZE = sys.getrecursionlimit() * 4
+# The larger input is this many times the size of the smaller one, a quadratic cost would grow by
+# the square of the factor
+GROWTH_FACTOR = 8
+# Allowance for noise in the measurements on top of linear growth
+GROWTH_SLACK = 2.5
+# Measurements below this are dominated by fixed costs and noise
+MIN_BYTES = 64 * 1024
+MAX_SIZE = 10_000
+
+_LOCATION = {"lineno": 2, "col_offset": 0, "end_lineno": 2, "end_col_offset": 0}
+_SCALING_SETTINGS = settings(
+    max_examples=10, deadline=None, suppress_health_check=[HealthCheck.too_slow]
+)
+
+
+def _name(id_: str) -> ast.Name:
+    """Create a name node.
+
+    Args:
+        id_: The name.
+
+    Returns:
+        The node.
+    """
+    return ast.Name(id=id_, ctx=ast.Load(), **_LOCATION)
+
+
+def _attribute(value: ast.expr, attr: str) -> ast.Attribute:
+    """Create an attribute node.
+
+    Args:
+        value: The node the attribute is accessed on.
+        attr: The name of the attribute.
+
+    Returns:
+        The node.
+    """
+    return ast.Attribute(value=value, attr=attr, ctx=ast.Load(), **_LOCATION)
+
+
+def _call(
+    func: ast.expr, args: List[ast.expr] | None = None, keywords: List[ast.keyword] | None = None
+) -> ast.Call:
+    """Create a call node.
+
+    Args:
+        func: The called node.
+        args: The positional arguments.
+        keywords: The keyword arguments.
+
+    Returns:
+        The node.
+    """
+    return ast.Call(func=func, args=args or [], keywords=keywords or [], **_LOCATION)
+
+
+def _mock() -> ast.Call:
+    """Create a call of mock.Mock without a spec.
+
+    Returns:
+        The node.
+    """
+    return _call(_attribute(_name("mock"), "Mock"))
+
+
+def _module(body: List[ast.stmt]) -> ast.Module:
+    """Create a module that imports mock.
+
+    Args:
+        body: The statements after the import.
+
+    Returns:
+        The module.
+    """
+    import_ = ast.ImportFrom(
+        module="unittest",
+        names=[ast.alias(name="mock", asname=None)],
+        level=0,
+        lineno=1,
+        col_offset=0,
+        end_lineno=1,
+        end_col_offset=0,
+    )
+    return ast.Module(body=[import_, *body], type_ignores=[])
+
+
+def _expression(value: ast.expr) -> ast.Expr:
+    """Create an expression statement.
+
+    Args:
+        value: The expression.
+
+    Returns:
+        The statement.
+    """
+    return ast.Expr(value=value, **_LOCATION)
+
+
+def attribute_chain(size: int) -> ast.Module:
+    """Create a module with mock.a.a.(...).Mock(), the name doesn't refer to a mock class.
+
+    Args:
+        size: The number of attributes between mock and Mock.
+
+    Returns:
+        The module.
+    """
+    node: ast.expr = _name("mock")
+    for _ in range(size):
+        node = _attribute(node, "a")
+    return _module([_expression(_call(_attribute(node, "Mock")))])
+
+
+def keyword_arguments(size: int) -> ast.Module:
+    """Create a module with mock.patch("a", k0=0, k1=1, ...) without any of the patch arguments.
+
+    Args:
+        size: The number of keyword arguments.
+
+    Returns:
+        The module.
+    """
+    keywords = [
+        ast.keyword(arg=f"k{index}", value=ast.Constant(value=index, **_LOCATION))
+        for index in range(size)
+    ]
+    call = _call(
+        _attribute(_name("mock"), "patch"), [ast.Constant(value="a", **_LOCATION)], keywords
+    )
+    return _module([_expression(call)])
+
+
+def nested_calls(size: int) -> ast.Module:
+    """Create a module with mock.Mock(mock.Mock(...)), every call is a problem.
+
+    Args:
+        size: The number of calls.
+
+    Returns:
+        The module.
+    """
+    node = _mock()
+    for _ in range(size - 1):
+        node = _call(_attribute(_name("mock"), "Mock"), [node])
+    return _module([_expression(node)])
+
+
+def call_chain(size: int) -> ast.Module:
+    """Create a module with mock.Mock().Mock().(...).Mock(), only the first call is a mock class.
+
+    Args:
+        size: The number of calls.
+
+    Returns:
+        The module.
+    """
+    node = _mock()
+    for _ in range(size - 1):
+        node = _call(_attribute(node, "Mock"))
+    return _module([_expression(node)])
+
+
+def binary_operations(size: int) -> ast.Module:
+    """Create a module with mock.Mock() + mock.Mock() + ..., nested on the left.
+
+    Args:
+        size: The number of calls.
+
+    Returns:
+        The module.
+    """
+    node: ast.expr = _mock()
+    for _ in range(size - 1):
+        node = ast.BinOp(left=node, op=ast.Add(), right=_mock(), **_LOCATION)
+    return _module([_expression(node)])
+
+
+def nested_blocks(size: int) -> ast.Module:
+    """Create a module with if x: mock.Mock(); if x: ..., each block nested in the previous one.
+
+    Args:
+        size: The number of calls, one per block.
+
+    Returns:
+        The module.
+    """
+    body: List[ast.stmt] = [_expression(_mock())]
+    for _ in range(size - 1):
+        body = [_expression(_mock()), ast.If(test=_name("x"), body=body, orelse=[], **_LOCATION)]
+    return _module(body)
+
+
+def wide_module(size: int) -> ast.Module:
+    """Create a module with mock.Mock() repeated as top level statements.
+
+    Args:
+        size: The number of statements.
+
+    Returns:
+        The module.
+    """
+    return _module([_expression(_mock()) for _ in range(size)])
+
+
+# The shapes and the number of problems they have by their size
+SHAPES: Dict[str, tuple[Callable[[int], ast.Module], Callable[[int], int]]] = {
+    "attribute chain": (attribute_chain, lambda size: 0),
+    "keywords": (keyword_arguments, lambda size: 1),
+    "nested calls": (nested_calls, lambda size: size),
+    "call chain": (call_chain, lambda size: 1),
+    "binary operations": (binary_operations, lambda size: size),
+    "nested blocks": (nested_blocks, lambda size: size),
+    "wide module": (wide_module, lambda size: size),
+}
+shapes = st.sampled_from(sorted(SHAPES))
+base_sizes = st.integers(
+    min_value=MAX_SIZE // GROWTH_FACTOR // 2, max_value=MAX_SIZE // GROWTH_FACTOR
+)
+
+
+def _work(tree: ast.Module) -> tuple[int, int, int]:
+    """Check a tree and count the work done.
+
+    Args:
+        tree: The tree to check.
+
+    Returns:
+        The number of nodes visited, calls examined and problems found.
+    """
+    stats = FileStats(path="file.py")
+    list(iter_problems(tree, stats=stats))
+    return stats.nodes, stats.calls, stats.problems
+
+
+def _peak_bytes(tree: ast.Module) -> int:
+    """Measure the memory allocated while checking a tree.
+
+    Args:
+        tree: The tree to check.
+
+    Returns:
+        The peak of the memory allocated in bytes.
+    """
+    tracemalloc.start()
+    try:
+        list(iter_problems(tree))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _assert_linear(small: float, large: float, minimum: float) -> None:
+    """Check that a cost grew at most linearly with the size of the input.
+
+    Args:
+        small: The cost for the smaller input.
+        large: The cost for the input GROWTH_FACTOR times larger.
+        minimum: The cost below which the measurement is dominated by fixed costs.
+    """
+    assert large <= max(small, minimum) * GROWTH_FACTOR * GROWTH_SLACK, (small, large)
+
+
+@_SCALING_SETTINGS
+@given(shape=shapes, size=st.integers(min_value=1, max_value=MAX_SIZE))
+@example(shape="nested calls", size=RECURSION_SIZE)
+@example(shape="attribute chain", size=RECURSION_SIZE)
+@example(shape="nested blocks", size=RECURSION_SIZE)
+def test_no_recursion_limit(shape: str, size: int):
+    """
+    given: tree with a pathological shape of any size, including deeper than the recursion limit
+    when: the plugin is run
+    then: the expected problems are found without a RecursionError
+    """
+    build, expected_problems = SHAPES[shape]
+
+    results = list(Plugin(build(size)).run())
+
+    assert len(results) == expected_problems(size)
+    codes = {msg.split()[0] for _, _, msg, _ in results}
+    assert codes <= {MOCK_SPEC_CODE, PATCH_CODE}
+
+
+@_SCALING_SETTINGS
+@given(shape=shapes, size=st.integers(min_value=1, max_value=MAX_SIZE // 3))
+def test_work_grows_linearly(shape: str, size: int):
+    """
+    given: trees with a pathological shape at 1, 2 and 3 times a size
+    when: the trees are checked
+    then: the nodes visited, calls examined and problems found grow by the same amount for each
+        step, i.e., exactly linearly
+    """
+    build, _ = SHAPES[shape]
+
+    first, second, third = (_work(build(size * multiple)) for multiple in (1, 2, 3))
+
+    for first_count, second_count, third_count in zip(first, second, third):
+        assert second_count - first_count == third_count - second_count
+
+
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+@settings(max_examples=2, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+@given(size=base_sizes)
+def test_memory_grows_linearly(shape: str, size: int):
+    """
+    given: trees with a pathological shape at a size and GROWTH_FACTOR times the size
+    when: the peak memory allocated while checking the trees is measured
+    then: the memory grows at most linearly with the size
+    """
+    build, _ = SHAPES[shape]
+    small, large = build(size), build(size * GROWTH_FACTOR)
+
+    _assert_linear(_peak_bytes(small), _peak_bytes(large), MIN_BYTES)
+
+
+def test_check_source_too_deep_to_parse():
+    """
+    given: source with an attribute chain too long for the parser
+    when: check_source is called
+    then: the file is reported as an error rather than crashing the worker
+    """
+    source = f"from unittest import mock\nmock.{'a.' * MAX_SIZE}Mock()\nmock.Mock()\n".encode()
+
+    problems = check_source(source)
+
+    assert [problem.msg.split()[0] for problem in problems] == [SYNTAX_ERROR_CODE]
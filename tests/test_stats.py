@@ -0,0 +1,183 @@
+"""Tests for the per file statistics."""
+
+from __future__ import annotations
+
+import ast
+import json
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+
+from flake8_mock_spec import Plugin, stats
+
+
+def _check(file_stats: stats.FileStats) -> Iterator[int]:
+    """Stand in for a check that records its work.
+
+    Args:
+        file_stats: Records the work.
+
+    Yields:
+        Numbers standing in for problems.
+    """
+    file_stats.nodes += 3
+    file_stats.calls += 2
+    file_stats.problems += 1
+    yield 1
+
+
+def test_profile(tmp_path: Path):
+    """
+    given: check that records work
+    when: the check is profiled
+    then: the results are yielded and the statistics are appended to the file
+    """
+    stats_path = tmp_path / "stats.jsonl"
+    stats_path.write_text('{"path": "previous.py"}\n', encoding="utf-8")
+
+    results = list(stats.profile("file.py", _check, stats_path))
+
+    assert results == [1]
+    lines = stats_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[-1])
+    assert record["seconds"] >= 0
+    assert record == {
+        "path": "file.py",
+        "seconds": record["seconds"],
+        "nodes": 3,
+        "calls": 2,
+        "problems": 1,
+    }
+
+
+def test_profile_stopped_early(tmp_path: Path):
+    """
+    given: check that yields results
+    when: the consumer stops before the check is done
+    then: the statistics are still written
+    """
+    stats_path = tmp_path / "stats.jsonl"
+
+    results = stats.profile("file.py", _check, stats_path)
+    next(results)
+    results.close()
+
+    assert len(stats.read_records(stats_path)) == 1
+
+
+def test_summarize():
+    """
+    given: statistics of more files than the number of slowest files
+    when: the statistics are summarized
+    then: the totals and the slowest files are returned
+    """
+    records = [
+        {"path": f"{index}.py", "seconds": float(index), "nodes": 2, "calls": 1, "problems": index}
+        for index in range(stats.SLOWEST_FILES + 2)
+    ]
+
+    summary = stats.summarize(records)
+
+    assert summary["files"] == stats.SLOWEST_FILES + 2
+    assert summary["nodes"] == 2 * (stats.SLOWEST_FILES + 2)
+    assert summary["calls"] == stats.SLOWEST_FILES + 2
+    assert summary["problems"] == summary["seconds"] == sum(range(stats.SLOWEST_FILES + 2))
+    assert len(summary["slowest"]) == stats.SLOWEST_FILES
+    assert summary["slowest"][0] == {
+        "path": f"{stats.SLOWEST_FILES + 1}.py",
+        "seconds": float(stats.SLOWEST_FILES + 1),
+    }
+
+
+def test_start_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    given: statistics file from a previous run
+    when: a run is started and the summary is written at exit
+    then: the previous statistics are removed and the summary of the run is appended
+    """
+    stats_path = tmp_path / "stats.jsonl"
+    stats_path.write_text('{"path": "previous.py"}\n', encoding="utf-8")
+    registered: list[Callable[[], None]] = []
+    monkeypatch.setattr(
+        stats.atexit,
+        "register",
+        lambda function, *args: registered.append(lambda: function(*args)),
+    )
+
+    stats.start_run(str(stats_path))
+    list(stats.profile("file.py", _check, stats_path))
+    for function in registered:
+        function()
+
+    lines = [json.loads(line) for line in stats_path.read_text(encoding="utf-8").splitlines()]
+    assert [line.get("path") for line in lines] == ["file.py", None]
+    assert lines[-1][stats.SUMMARY_KEY]["files"] == 1
+    assert stats.read_records(stats_path) == lines[:1]
+
+
+def test_start_run_worker(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    given: worker process
+    when: a run is started
+    then: the statistics file is not changed
+    """
+    stats_path = tmp_path / "stats.jsonl"
+    monkeypatch.setattr(stats.multiprocessing, "parent_process", object)
+
+    stats.start_run(stats_path)
+
+    assert not stats_path.exists()
+
+
+def test_write_summary_missing(tmp_path: Path):
+    """
+    given: statistics file that doesn't exist
+    when: the summary is written
+    then: no file is created
+    """
+    stats_path = tmp_path / "stats.jsonl"
+
+    stats.write_summary(stats_path)
+
+    assert not stats_path.exists()
+
+
+@pytest.mark.parametrize(
+    "code, lines, expected_record",
+    [
+        pytest.param(
+            "from unittest.mock import Mock\nMock()\nMock(spec=1)\n",
+            None,
+            {"nodes": 6, "calls": 2, "problems": 1},
+            id="problems",
+        ),
+        pytest.param(
+            "other()\n", ["other()\n"], {"nodes": 0, "calls": 0, "problems": 0}, id="skipped"
+        ),
+    ],
+)
+def test_plugin_stats(  # pylint: disable=too-many-arguments
+    code: str,
+    lines: list[str] | None,
+    expected_record: dict[str, int],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    parse_plugin_options: Callable[..., None],
+):
+    """
+    given: plugin with the statistics enabled
+    when: linting is run
+    then: the statistics of the file are written
+    """
+    stats_path = tmp_path / "stats.jsonl"
+    monkeypatch.setattr(stats.atexit, "register", lambda *_: None)
+    parse_plugin_options(mock_spec_stats=str(stats_path))
+
+    results = list(Plugin(ast.parse(code), lines=lines, filename="file.py").run())
+
+    assert len(results) == expected_record["problems"]
+    (record,) = stats.read_records(stats_path)
+    assert record["path"] == "file.py"
+    assert {name: record[name] for name in expected_record} == expected_record
@@ -0,0 +1,497 @@
+"""Tests for the check that spec and patch targets exist."""
+
+from __future__ import annotations
+
+import ast
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from flake8_mock_spec import TARGET_CODE, TARGET_MSG_BASE, Plugin, compile_registry, targets
+from flake8_mock_spec.cache import Cache
+from flake8_mock_spec.targets import SymbolIndex, check_targets, collect_symbols, get_index
+
+PROJECT = {
+    "pkg/__init__.py": "from .models import Model\nVERSION = 1\n",
+    "pkg/base.py": "class Base:\n    def load(self): ...\n",
+    "pkg/models.py": """\
+import typing
+from abc import ABC
+from .base import Base
+
+
+class Model(Base):
+    kind = "model"
+    __slots__ = ("slot",)
+
+    def __init__(self):
+        self.value = 1
+
+    def save(self): ...
+
+
+class Plain(ABC):
+    def run(self): ...
+
+
+class Dynamic:
+    def __getattr__(self, name): ...
+
+
+class External(typing.NamedTuple):
+    x: int
+
+
+def helper(): ...
+
+
+try:
+    import json as serializer
+except ImportError:
+    serializer = None
+""",
+    "pkg/shapes.py": """\
+from typing import Generic, TypeVar
+
+try:
+    from json import JSONEncoder as Encoder
+except ImportError as error:
+    Encoder = object
+
+T = TypeVar("T")
+SLOTS = ("slot",)
+
+
+class Typed(Generic[T]):
+    __slots__ = SLOTS
+
+    def static(): ...
+
+
+class Child(Typed): ...
+
+
+class Made(type("Base", (), {})): ...
+
+
+class Custom(Encoder): ...
+
+
+class Error(ValueError): ...
+
+
+class Configured:
+    def __init__(self, **options):
+        for name, value in options.items():
+            setattr(self, name, value)
+
+
+class Registered: ...
+
+
+class Patched: ...
+
+
+Registered.extra = 1
+setattr(Patched, "name", 1)
+
+
+def configure():
+    global SETTINGS
+    SETTINGS = {}
+""",
+    "pkg/star.py": "from os.path import *\n",
+    "pkg/cycle.py": "from .cycle import name\n",
+    "not-a-package/module.py": "",
+    "pkg/lazy.py": "def __getattr__(name): ...\n",
+    "pkg/broken.py": "def (\n",
+    "namespace/sub.py": "def function(): ...\n",
+    "pkg/compiled.cpython-311-x86_64-linux-gnu.so": "",
+    "pkg/native.pyd": "",
+}
+
+
+@pytest.fixture(name="project")
+def fixture_project(tmp_path: Path) -> Path:
+    """Create the modules of a project.
+
+    Args:
+        tmp_path: Temporary directory.
+
+    Returns:
+        The root of the project.
+    """
+    root = tmp_path / "project"
+    for name, source in PROJECT.items():
+        (path := root / name).parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+    return root
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        pytest.param("pkg", True, id="package"),
+        pytest.param("pkg.models", True, id="module"),
+        pytest.param("pkg.models.Model", True, id="class"),
+        pytest.param("pkg.models.Model.save", True, id="method"),
+        pytest.param("pkg.models.Model.kind", True, id="class attribute"),
+        pytest.param("pkg.models.Model.value", True, id="instance attribute"),
+        pytest.param("pkg.models.Model.slot", True, id="slot"),
+        pytest.param("pkg.models.Model.load", True, id="inherited"),
+        pytest.param("pkg.models.Model.__init__", True, id="special defined"),
+        pytest.param("pkg.models.Model.__eq__", None, id="special not defined"),
+        pytest.param("pkg.models.Model.missing", False, id="missing attribute"),
+        pytest.param("pkg.models.Missing", False, id="missing name"),
+        pytest.param("pkg.missing", False, id="missing module"),
+        pytest.param("pkg.Model.save", True, id="re-exported"),
+        pytest.param("pkg.Model.missing", False, id="re-exported missing"),
+        pytest.param("pkg.models.Plain.run", True, id="attribute free base"),
+        pytest.param("pkg.models.Plain.missing", False, id="attribute free base missing"),
+        pytest.param("pkg.models.Dynamic.missing", None, id="dynamic class"),
+        pytest.param("pkg.models.External.missing", None, id="base outside project"),
+        pytest.param("pkg.models.typing", True, id="imported module"),
+        pytest.param("pkg.models.typing.missing", None, id="outside project"),
+        pytest.param("pkg.models.helper.missing", None, id="attribute of function"),
+        pytest.param("pkg.models.serializer", True, id="rebound"),
+        pytest.param("pkg.models.serializer.dumps", None, id="attribute of rebound"),
+        pytest.param("pkg.shapes.Typed.static", True, id="method without arguments"),
+        pytest.param("pkg.shapes.Typed.missing", False, id="subscripted base"),
+        pytest.param("pkg.shapes.Child.static", True, id="base in module"),
+        pytest.param("pkg.shapes.Child.missing", False, id="base in module missing"),
+        pytest.param("pkg.shapes.Made.missing", None, id="base not a name"),
+        pytest.param("pkg.shapes.Custom.missing", None, id="rebound base"),
+        pytest.param("pkg.shapes.Error.missing", None, id="builtin base"),
+        pytest.param("pkg.shapes.Configured.missing", None, id="setattr of self"),
+        pytest.param("pkg.shapes.Registered.extra", True, id="assigned in module"),
+        pytest.param("pkg.shapes.Registered.missing", False, id="assigned in module missing"),
+        pytest.param("pkg.shapes.Patched.missing", None, id="setattr in module"),
+        pytest.param("pkg.shapes.SETTINGS", True, id="declared global"),
+        pytest.param("pkg.shapes.error", True, id="exception name"),
+        pytest.param("pkg.star.missing", None, id="star import"),
+        pytest.param("pkg.cycle.name.missing", None, id="circular import"),
+        pytest.param("pkg.lazy.missing", None, id="module __getattr__"),
+        pytest.param("pkg.broken.missing", None, id="syntax error"),
+        pytest.param("namespace.sub.function", True, id="namespace package"),
+        pytest.param("namespace.missing", None, id="namespace package missing"),
+        pytest.param("pkg.compiled", True, id="extension module"),
+        pytest.param("pkg.compiled.function", None, id="name in extension module"),
+        pytest.param("pkg.native.function", None, id="name in windows extension module"),
+        pytest.param("os.path.missing", None, id="not in project"),
+    ],
+)
+def test_resolve(name: str, expected: bool | None, project: Path):
+    """
+    given: project with modules
+    when: resolve is called with a name
+    then: whether the name exists is returned, None if it can't be known statically
+    """
+    index = SymbolIndex([project])
+
+    assert index.resolve(tuple(name.split("."))) is expected
+
+
+def test_collect_symbols_relative_imports():
+    """
+    given: module of a package with relative imports
+    when: collect_symbols is called
+    then: the imports are resolved relative to the package
+    """
+    tree = ast.parse("from . import a\nfrom .b import c\nfrom .. import d\nfrom ... import e\n")
+
+    symbols = collect_symbols(tree, "pkg.sub.module")
+
+    assert symbols.imports == {"a": "pkg.sub.a", "c": "pkg.sub.b.c", "d": "pkg.d"}
+    assert symbols.names == {"a", "c", "d", "e"}
+
+
+def test_collect_symbols_global_statement():
+    """
+    given: module with a global statement at the top level
+    when: collect_symbols is called
+    then: the declared name is bound
+    """
+    symbols = collect_symbols(ast.parse("global VALUE\n"), "module")
+
+    assert symbols.names == {"VALUE"}
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="match statements need Python 3.10")
+def test_collect_symbols_match():
+    """
+    given: module with a match statement whose patterns bind names
+    when: collect_symbols is called
+    then: the names bound by the patterns are recorded
+    """
+    tree = ast.parse(
+        "match value:\n    case [first, *rest]: ...\n    case {'key': 1, **others}: ...\n"
+    )
+
+    symbols = collect_symbols(tree, "module")
+
+    assert symbols.names == {"first", "rest", "others"}
+
+
+def test_symbol_index_cache(project: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    given: cache of the names defined by the modules of a project
+    when: the modules are resolved again, then a module is changed
+    then: the unchanged modules are not parsed again and the changed module is
+    """
+    cache = Cache(tmp_path / "cache.sqlite3")
+    assert SymbolIndex([project], cache).resolve(("pkg", "models", "Model", "save"))
+    entries = len(cache)
+
+    monkeypatch.setattr(targets.ast, "parse", None)
+    assert SymbolIndex([project], cache).resolve(("pkg", "models", "Model", "save"))
+    assert len(cache) == entries
+
+    monkeypatch.undo()
+    (project / "pkg" / "base.py").write_text("class Base:\n    def dump(self): ...\n")
+    index = SymbolIndex([project], cache)
+    assert index.resolve(("pkg", "models", "Model", "dump"))
+    assert index.resolve(("pkg", "models", "Model", "load")) is False
+    assert len(cache) == entries + 1
+
+
+def test_module_name(project: Path):
+    """
+    given: index of a project
+    when: module_name is called with files
+    then: the name of the module and whether it is a package are returned
+    """
+    index = SymbolIndex([project])
+
+    assert index.module_name(project / "pkg" / "models.py") == ("pkg.models", False)
+    assert index.module_name(project / "pkg" / "__init__.py") == ("pkg", True)
+    assert index.module_name(project.parent / "other.py") is None
+    assert index.module_name(project / "not-a-package" / "module.py") is None
+
+
+def _names(source: str, index: SymbolIndex, path: Path | None = None) -> list[tuple[int, str]]:
+    """Check the targets in source.
+
+    Args:
+        source: The source to check.
+        index: The index of the project.
+        path: The path to the file of the source, if any.
+
+    Returns:
+        The line and name of each target that doesn't exist.
+    """
+    return [
+        (problem.lineno, problem.msg.split()[1])
+        for problem in check_targets(ast.parse(source), index, None if path is None else str(path))
+    ]
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        pytest.param("mock.patch('pkg.models.Model.save')", [], id="patch"),
+        pytest.param(
+            "mock.patch('pkg.models.Model.saved')",
+            [(4, "pkg.models.Model.saved")],
+            id="patch missing",
+        ),
+        pytest.param(
+            "mock.patch(target='pkg.model.Model')",
+            [(4, "pkg.model.Model")],
+            id="patch keyword missing",
+        ),
+        pytest.param("mock.patch('pkg.models.Model.saved', create=True)", [], id="patch create"),
+        pytest.param("mock.patch('os.path.jion')", [], id="patch outside project"),
+        pytest.param("mock.patch(name)", [], id="patch not a string"),
+        pytest.param("mock.patch.object(models.Plain, 'run')", [], id="patch.object"),
+        pytest.param(
+            "mock.patch.object(Model, 'saved')",
+            [(4, "pkg.models.Model.saved")],
+            id="patch.object missing",
+        ),
+        pytest.param("mock.patch.object(Local, 'saved')", [], id="patch.object not imported"),
+        pytest.param(
+            "mock.patch.multiple('pkg.models.Model', saved=1, save=2, autospec=True)",
+            [(4, "pkg.models.Model.saved")],
+            id="patch.multiple",
+        ),
+        pytest.param(
+            "mock.patch.multiple(Model, saved=1)",
+            [(4, "pkg.models.Model.saved")],
+            id="patch.multiple object",
+        ),
+        pytest.param("mock.Mock(spec_set=Model)", [], id="spec"),
+        pytest.param(
+            "mock.Mock(spec=models.Missing)", [(4, "pkg.models.Missing")], id="spec missing"
+        ),
+        pytest.param(
+            "mock.patch('pkg.models.helper', spec=models.helpr)",
+            [(4, "pkg.models.helpr")],
+            id="patch spec missing",
+        ),
+        pytest.param("Other('pkg.missing', spec=models.Missing)", [], id="not a factory"),
+        pytest.param("mock.patch.multiple(make(), missing=1)", [], id="patch.multiple unknown"),
+    ],
+)
+def test_check_targets(code: str, expected: list[tuple[int, str]], project: Path):
+    """
+    given: module with calls of factories
+    when: check_targets is called
+    then: the targets that don't exist are reported
+    """
+    imports = "from unittest import mock\nfrom pkg.models import Model\nfrom pkg import models\n"
+
+    assert _names(f"{imports}{code}\n", SymbolIndex([project])) == expected
+
+
+def test_check_targets_no_providers(project: Path):
+    """
+    given: module that doesn't import any providers of the factories
+    when: check_targets is called
+    then: nothing is reported
+    """
+    assert not _names(
+        "from pkg import models\nmodels.patch('pkg.missing')\n", SymbolIndex([project])
+    )
+
+
+def test_check_targets_positional_spec(project: Path):
+    """
+    given: module with calls of a factory that takes the spec as a positional argument
+    when: check_targets is called with the factory registered with the position of the spec
+    then: the positional specs that don't exist are reported
+    """
+    registry = compile_registry(["unittest.mock.create_autospec:spec|0"])
+    source = (
+        "from unittest import mock\nfrom pkg import models\nmock.create_autospec(models.Model)\n"
+        "mock.create_autospec(models.Missing)\nmock.create_autospec(*models.Missing)\n"
+    )
+
+    problems = check_targets(ast.parse(source), SymbolIndex([project]), registry=registry)
+
+    assert [(problem.lineno, problem.msg.split()[1]) for problem in problems] == [
+        (4, "pkg.models.Missing")
+    ]
+
+
+def test_check_targets_relative_import(project: Path):
+    """
+    given: module within the project with a relative import
+    when: check_targets is called with the path to the module
+    then: the targets are resolved relative to the package of the module
+    """
+    source = (
+        "from unittest import mock\nfrom .models import Model\nmock.patch.object(Model, 'x')\n"
+    )
+
+    names = _names(source, SymbolIndex([project]), project / "pkg" / "test_module.py")
+
+    assert names == [(3, "pkg.models.Model.x")]
+
+
+def test_check_targets_message(project: Path):
+    """
+    given: module with a patch target that doesn't exist
+    when: check_targets is called
+    then: the message includes the code and the target
+    """
+    tree = ast.parse("from unittest import mock\nmock.patch('pkg.missing')\n")
+
+    (problem,) = check_targets(tree, SymbolIndex([project]))
+
+    assert problem.msg == TARGET_MSG_BASE % "pkg.missing"
+    assert problem.col_offset == 11
+
+
+def test_get_index(project: Path, tmp_path: Path):
+    """
+    given: roots and a cache directory
+    when: get_index is called twice
+    then: the same index is returned and the cache is created in the directory
+    """
+    cache_dir = str(tmp_path / "cache")
+
+    index = get_index([str(project)], cache_dir)
+
+    assert get_index([str(project)], cache_dir) is index
+    assert index.resolve(("pkg", "VERSION"))
+    assert (tmp_path / "cache").is_dir()
+
+
+def test_plugin_targets(
+    project: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    parse_plugin_options: Callable[..., None],
+):
+    """
+    given: plugin with target roots
+    when: the options are parsed and linting is run
+    then: the targets that don't exist are reported along with the other problems of each call
+    """
+    monkeypatch.setattr(targets.atexit, "register", lambda *_: None)
+    parse_plugin_options(
+        mock_spec_target_roots=[str(project)], mock_spec_target_cache_dir=str(tmp_path / "cache")
+    )
+    code = "from unittest import mock\nmock.patch('pkg.missing')\nmock.Mock()\n"
+
+    results = list(Plugin(ast.parse(code), filename=str(tmp_path / "test_file.py")).run())
+
+    assert [(line, msg.split()[0]) for line, _, msg, _ in results] == [
+        (2, "TMS020"),
+        (2, TARGET_CODE),
+        (3, "TMS010"),
+    ]
+
+
+def test_start_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    given: cache directory
+    when: a run is started twice and the functions registered to run at exit are called
+    then: the cache in the directory is evicted once
+    """
+    registered: list[Callable[[], None]] = []
+    monkeypatch.setattr(
+        targets.atexit,
+        "register",
+        lambda function, *args: registered.append(lambda: function(*args)),
+    )
+    monkeypatch.setattr(targets.atexit, "unregister", lambda _: registered.clear())
+    evicted: list[Path] = []
+
+    def evict(cache: Cache) -> int:
+        """Record the eviction.
+
+        Args:
+            cache: The cache.
+
+        Returns:
+            No entries were removed.
+        """
+        evicted.append(cache.path)
+        return 0
+
+    monkeypatch.setattr(Cache, "evict", evict)
+
+    targets.start_run(str(tmp_path / "cache"))
+    targets.start_run(str(tmp_path / "cache"))
+    for function in registered:
+        function()
+
+    assert [path.parent for path in evicted] == [tmp_path / "cache"]
+
+
+def test_start_run_worker(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    given: worker process
+    when: a run is started
+    then: no eviction is registered
+    """
+    registered: list[object] = []
+    monkeypatch.setattr(targets.atexit, "register", registered.append)
+    monkeypatch.setattr(targets.multiprocessing, "parent_process", object)
+
+    targets.start_run(str(tmp_path / "cache"))
+
+    assert not registered
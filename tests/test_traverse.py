@@ -0,0 +1,228 @@
+"""Tests for the single traversal shared by several checks."""
+
+from __future__ import annotations
+
+import ast
+from typing import Iterable
+
+from flake8_mock_spec import MOCK_SPEC_MSG, Check, MockSpecCheck, Problem, traverse
+from flake8_mock_spec.stats import FileStats
+
+CODE = """
+from unittest.mock import Mock
+@decorator(Mock())
+class Test(Base, metaclass=Meta):
+    attr: int = Mock(name)
+
+    async def test_(self, arg=Mock(), *, kwarg: int = None) -> None:
+        with context() as value, other():
+            [Mock() for _ in items if check(_)]
+        lambda: f"{Mock()!r:{width}}"
+        return await Mock()(Mock(spec=value), key=call(), **kwargs)
+"""
+
+
+class RecordingCheck(Check):
+    """Records the nodes passed to it and reports a problem for each call of record.
+
+    Attrs:
+        nodes: The nodes in the order they were passed to the check.
+    """
+
+    def __init__(self, active: bool = True) -> None:
+        """Construct.
+
+        Args:
+            active: Returned by start.
+        """
+        self.nodes: list[ast.AST] = []
+        self._active = active
+
+    def start(self, tree: ast.AST) -> bool:
+        """Report whether the check is active.
+
+        Args:
+            tree: The root of the tree.
+
+        Returns:
+            Whether the check is active.
+        """
+        return self._active
+
+    # The methods must be called the same as the name of the node
+    # pylint: disable=invalid-name
+
+    def visit_Call(self, node: ast.Call) -> Iterable[Problem]:
+        """Record a call.
+
+        Args:
+            node: The call.
+
+        Returns:
+            A problem for calls of record.
+        """
+        self.nodes.append(node)
+        if isinstance(node.func, ast.Name) and node.func.id == "record":
+            return (Problem(node.lineno, node.col_offset, "TST001 record"),)
+        return ()
+
+    def visit_Name(self, node: ast.Name) -> None:
+        """Record a name.
+
+        Args:
+            node: The name.
+        """
+        self.nodes.append(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        """Record a function.
+
+        Args:
+            node: The function.
+        """
+        self.nodes.append(node)
+
+    def visit_unknown(self, node: ast.AST) -> None:  # pragma: no cover
+        """Not a node type, never called.
+
+        Args:
+            node: The node.
+
+        Raises:
+            AssertionError: Always, the traversal only calls the visitors of node types.
+        """
+        raise AssertionError(node)
+
+
+def test_traverse_order():
+    """
+    given: check with hooks for several node types
+    when: traverse is called
+    then: the nodes are passed to the check in the same order as ast.NodeVisitor visits them
+    """
+    tree = ast.parse(CODE)
+    node_types = (ast.Call, ast.Name, ast.AsyncFunctionDef)
+
+    class RecursiveVisitor(ast.NodeVisitor):
+        """Reference visitor that records the nodes in visit order."""
+
+        def __init__(self):
+            """Construct."""
+            self.nodes: list[ast.AST] = []
+
+        def visit(self, node: ast.AST):
+            """Record the node if it is of one of the types.
+
+            Args:
+                node: The node.
+            """
+            if isinstance(node, node_types):
+                self.nodes.append(node)
+            self.generic_visit(node)
+
+    recursive_visitor = RecursiveVisitor()
+    recursive_visitor.visit(tree)
+    check = RecordingCheck()
+
+    assert not list(traverse(tree, (check,)))
+    assert check.nodes == recursive_visitor.nodes
+
+
+def test_traverse_shared():
+    """
+    given: the mock spec check and another check
+    when: traverse is called
+    then: the problems of both checks are yielded in the order of the calls from a single walk
+    """
+    tree = ast.parse("from unittest.mock import Mock\nMock()\nrecord()\nMock(record())\n")
+    stats = FileStats("test.py")
+
+    problems = list(traverse(tree, (MockSpecCheck(), RecordingCheck()), stats))
+
+    assert [(problem.lineno, problem.msg) for problem in problems] == [
+        (2, MOCK_SPEC_MSG),
+        (3, "TST001 record"),
+        (4, MOCK_SPEC_MSG),
+        (4, "TST001 record"),
+    ]
+    assert stats.nodes == sum(1 for _ in ast.walk(tree))
+    assert (stats.calls, stats.problems) == (4, 4)
+
+
+def test_traverse_calls_only():
+    """
+    given: checks that only have hooks for calls
+    when: traverse is called
+    then: the nodes that can't contain calls are skipped
+    """
+    tree = ast.parse(CODE)
+    stats = FileStats("test.py")
+
+    problems = list(traverse(tree, (MockSpecCheck(),), stats))
+
+    assert len(problems) == 6
+    assert stats.nodes < sum(1 for _ in ast.walk(tree))
+    assert stats.calls == sum(isinstance(node, ast.Call) for node in ast.walk(tree))
+
+
+def test_traverse_inactive():
+    """
+    given: check whose start returns False and a module that doesn't import any mock classes
+    when: traverse is called
+    then: the tree is not walked and the check isn't called
+    """
+    tree = ast.parse("Mock()\nrecord()\n")
+    stats = FileStats("test.py")
+    check = RecordingCheck(active=False)
+
+    problems = list(traverse(tree, (MockSpecCheck(), check), stats))
+
+    assert not problems
+    assert not check.nodes
+    assert stats.nodes == 0
+
+
+def test_traverse_finish_and_hooks():
+    """
+    given: check that registers a function using hooks and reports a problem when it finishes
+    when: traverse is called
+    then: the function is called with the nodes and the problem of finish is yielded last
+    """
+
+    class CountingCheck(Check):
+        """Counts the constants."""
+
+        def __init__(self) -> None:
+            """Construct."""
+            self.constants = 0
+
+        def hooks(self):
+            """Register the counting function.
+
+            Returns:
+                The function for constants.
+            """
+            return {ast.Constant: self._count}
+
+        def _count(self, node: ast.Constant) -> None:
+            """Count a constant.
+
+            Args:
+                node: The constant.
+            """
+            assert isinstance(node, ast.Constant)
+            self.constants += 1
+
+        def finish(self) -> Iterable[Problem]:
+            """Report the number of constants.
+
+            Returns:
+                The count as a problem.
+            """
+            return (Problem(1, 0, f"TST002 {self.constants} constants"),)
+
+    tree = ast.parse("record(1)\nx = 2\n")
+
+    problems = list(traverse(tree, (CountingCheck(), RecordingCheck())))
+
+    assert [problem.msg for problem in problems] == ["TST001 record", "TST002 2 constants"]